@@ -3,30 +3,15 @@
 # %%
 
 from Task1 import add_signals, subtract_signals, multiply_signal, shifting_signal, fold_signal
+from signal_io import read_signal_file
 import numpy as np
 
 # %%
 
 def ReadSignalFile(file_name):
-    expected_indices=[]
-    expected_samples=[]
-    with open(file_name, 'r') as f:
-        line = f.readline()
-        line = f.readline()
-        line = f.readline()
-        line = f.readline()
-        while line:
-            # process line
-            L=line.strip()
-            if len(L.split(' '))==2:
-                L=line.split(' ')
-                V1=int(L[0])
-                V2=float(L[1])
-                expected_indices.append(V1)
-                expected_samples.append(V2)
-                line = f.readline()
-            else:
-                break
+    _, expected_indices, expected_samples = read_signal_file(file_name)
+    expected_indices = expected_indices.astype(int).tolist()
+    expected_samples = expected_samples.tolist()
     return expected_indices,expected_samples
 
 
@@ -3,6 +3,15 @@ from tkinter import filedialog, messagebox, ttk
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+from signal_model import Signal
+from signal_io import read_signal_file, read_signal_bin, fresh_binary_path, load_signal
+from lod_plot import plot_lod
+from signal_pyramid import (PYRAMID_MIN_SAMPLES, PyramidBuilder, ensure_pyramid, fresh_pyramid_path,
+                            plot_pyramid, pyramid_path_for)
+from tk_executor import TkTaskExecutor, TaskStatusBar
+from signal_workspace import Workspace
+from convolution import convolve_signals, correlate_signals
+from spectrum import signal_spectrum, plot_spectrum
 
 
 def read_signal_from_txt(path):
@@ -13,45 +22,140 @@ def read_signal_from_txt(path):
         if os.path.exists(candidate):
             file_path = candidate
 
-    # Read the file but skip first 3 lines
-    data = np.loadtxt(file_path, skiprows=3)
-
-    data = np.atleast_2d(data)
-    indices = data[:, 0]
-    values = data[:, 1]
+    # A fresh .sigb companion is memory-mapped instead of reparsing the text
+    bin_path = fresh_binary_path(file_path)
+    if bin_path:
+        _, indices, values = read_signal_bin(bin_path)
+    else:
+        # One bulk parse of the body by NumPy's C reader, bounded by the header's N
+        _, indices, values = read_signal_file(file_path)
     return indices, values
 
 def plot_signal(indices, values, title="Signal"):
   plt.figure()
-  plt.stem(indices, values)
+  # Min/max envelope per pixel, refined on zoom; stems once few samples are visible
+  plot_lod(plt.gca(), np.asarray(indices), np.asarray(values), stem=True)
+  plt.title(title)
+  plt.xlabel("Index (n)")
+  plt.ylabel("Amplitude")
+  plt.grid(True)
+  plt.show()
+
+def plot_signal_pyramid(signal, pyramid, title="Signal"):
+  # Like plot_signal, but envelopes are read from the signal's on-disk pyramid
+  plt.figure()
+  plot_pyramid(plt.gca(), signal, pyramid, stem=True)
   plt.title(title)
   plt.xlabel("Index (n)")
   plt.ylabel("Amplitude")
   plt.grid(True)
   plt.show()
 
+def plot_signal_spectrum(spec, title="Signal"):
+  # Frequency in cycles per sample, since Task1 signals carry no sampling rate
+  fig, (amp_ax, phase_ax) = plt.subplots(2, 1, sharex=True)
+  plot_spectrum(amp_ax, phase_ax, spec)
+  amp_ax.set_title(f"{title}: amplitude spectrum")
+  amp_ax.set_ylabel("|X(f)|")
+  amp_ax.grid(True)
+  phase_ax.set_title(f"{title}: phase spectrum")
+  phase_ax.set_xlabel("Frequency (cycles/sample)")
+  phase_ax.set_ylabel("Phase (rad)")
+  phase_ax.grid(True)
+  fig.tight_layout()
+  plt.show()
+
+def load_signal_with_pyramid(task, path, workspace=None):
+  """
+  Worker side of SignalApp.upload_signal: (Signal, pyramid or None, workspace key or None).
+  Through a workspace the file is parsed once, ever, and the pyramid sits next to its stored object.
+  """
+  # Reading and the pyramid build report per chunk, so a cancel stops them within one chunk
+  reading = task.phase(0.0, 0.5, "reading")
+  builder = None
+
+  def through(chunks, pyramid_source, n):
+    # A long file that gets parsed feeds its pyramid from the same chunks
+    nonlocal builder
+    if n < PYRAMID_MIN_SAMPLES or fresh_pyramid_path(pyramid_source):
+      return chunks
+    builder = PyramidBuilder(pyramid_path_for(pyramid_source), n)
+    return builder.feed(chunks)
+
+  try:
+    if workspace is None:
+      key = None
+      _, sig = load_signal(path, reading, through)
+    else:
+      key, _, sig = workspace.load(path, reading, through)
+      path = workspace.object_path(key)
+  except BaseException:
+    if builder is not None:
+      builder.discard()
+    raise
+  if builder is not None:
+    if builder.count == builder.n:
+      # Closed after the object is in place, so the pyramid is at least as new as it
+      return sig, builder.close(), key
+    # The header's N overstated the samples: fall back to the values actually read
+    builder.discard()
+  if sig.size < PYRAMID_MIN_SAMPLES:
+    return sig, None, key
+  # Already stored or memory-mapped: reuse the pyramid, or build it from the mapped file
+  return sig, ensure_pyramid(path, sig.values, progress=task.phase(0.5, 1.0, "building pyramid")), key
+
 def add_signals(signals):
-  indices, values = signals[0]
-  result_indices = indices.copy()
-  result_values = values.copy()
-  
-  for s_indices, s_values in signals[1:]:
-      for i, idx in enumerate(s_indices):
-          if idx in result_indices:
-              pos = np.where(result_indices == idx)[0][0]
-              result_values[pos] += s_values[i]
-          else:
-              # If new index → append it
-              result_indices = np.append(result_indices, idx)
-              result_values = np.append(result_values, s_values[i])
+  """
+  Add any number of (indices, values) signals sample-by-sample.
+  The union of all indices is computed once and every input is
+  scatter-added into it in a single pass; output indices are sorted.
+  Dense Signal objects are added by aligned slices instead.
+  """
+  if all(isinstance(s, Signal) and s.is_dense for s in signals):
+    return Signal.sum(signals)
+
+  all_indices = np.concatenate([np.asarray(s_indices) for s_indices, _ in signals])
+  all_values = np.concatenate([np.asarray(s_values, dtype=float) for _, s_values in signals])
+
+  if np.issubdtype(all_indices.dtype, np.integer) and len(all_indices):
+    lo = all_indices.min()
+    span = int(all_indices.max() - lo) + 1
+    if span <= 4 * len(all_indices):
+      # Integer indices over a compact range (many channels over the same
+      # window): one counting pass, no sort of the concatenated indices
+      offsets = all_indices - lo
+      sums = np.bincount(offsets, weights=all_values, minlength=span)
+      present = np.bincount(offsets, minlength=span) > 0
+      if present.all():
+        return np.arange(lo, lo + span, dtype=all_indices.dtype), sums
+      positions = np.flatnonzero(present)
+      return (positions + lo).astype(all_indices.dtype), sums[positions]
+
+  result_indices, positions = np.unique(all_indices, return_inverse=True)
+  result_values = np.bincount(positions.ravel(), weights=all_values, minlength=len(result_indices))
 
   return result_indices, result_values
 
+def add_signal_block(indices, block, weights=None):
+  """
+  Add channels that share one index array, given as a 2-D block of shape
+  (channels, samples). Optional per-channel weights give a weighted sum.
+  """
+  block = np.asarray(block, dtype=float)
+  if block.ndim != 2 or block.shape[1] != len(indices):
+    raise ValueError("block must have shape (channels, len(indices))")
+  if weights is None:
+    return np.asarray(indices), block.sum(axis=0)
+  return np.asarray(indices), np.asarray(weights, dtype=float) @ block
+
 def multiply_signal(indices, values, constant):
   return indices, values * constant
 
 def subtract_signals(sig1, sig2):
-  inverted_sig2 = (sig2[0], -1 * sig2[1])
+  if isinstance(sig2, Signal):
+    inverted_sig2 = sig2.scale(-1)
+  else:
+    inverted_sig2 = (sig2[0], -1 * sig2[1])
   return add_signals([sig1, inverted_sig2])
 
 def shifting_signal(indices, values, k, method):
@@ -84,9 +188,20 @@ class SignalApp:
         self.root.geometry("750x600")
         self.root.configure(bg="#e9f7ef")
         self.signals = []
+        # Min/max/mean pyramid of each long uploaded signal (None for short ones)
+        self.pyramids = []
+        # Workspace object key of each signal; parsed files and add/subtract results persist there
+        self.signal_keys = []
+        self.workspace = Workspace()
+
+        # Loading and add/subtract run on a worker thread; results come back via root.after()
+        self.executor = TkTaskExecutor(root)
+        TaskStatusBar(root, self.executor, bg="#e9f7ef").pack(side=tk.BOTTOM, fill="x", padx=5, pady=5)
+        root.protocol("WM_DELETE_WINDOW", self.close)
 
         # Upload button
         tk.Button(root, text="Upload Signal", width=20, command=self.upload_signal).pack(pady=10)
+        tk.Button(root, text="New Session", width=20, command=self.new_session).pack()
 
         # Combobox (general plotting)
         tk.Label(root, text="Choose a Signal to Plot:").pack(pady=5)
@@ -94,6 +209,7 @@ class SignalApp:
         self.signal_combo = ttk.Combobox(root, textvariable=self.signal_var, state="readonly")
         self.signal_combo.pack(pady=5)
         tk.Button(root, text="Plot Selected Signal", width=25, command=self.plot_selected).pack(pady=10)
+        tk.Button(root, text="Plot Spectrum", width=25, command=self.plot_selected_spectrum).pack()
 
         # ==== ADD/SUBTRACT FRAME ====
         addsub_frame = tk.Frame(root, bg="#e9f7ef")
@@ -155,55 +271,133 @@ class SignalApp:
         self.fold_signal_combo.grid(row=0, column=1, padx=5)
         tk.Button(fold_frame, text="Apply Fold", width=15, command=self.apply_fold).grid(row=0, column=2, padx=5)
 
+        # Reopen the signals of the last session from the workspace
+        self.executor.submit(self.restore_session, pass_task=True, on_done=self.session_restored,
+                             on_error=lambda e: messagebox.showerror("Error", str(e)),
+                             description="Restoring session")
+
     # ==== Other methods (same as before) ====
     def upload_signal(self):
-        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt")])
+        path = filedialog.askopenfilename(filetypes=[("Text files", "*.txt"), ("Signal binary", "*.sigb")])
         if path:
-            try:
-                sig = read_signal_from_txt(path)
-                self.signals.append(sig)
-
-                items = [f"Signal {i+1}" for i in range(len(self.signals))]
-                self.signal_combo["values"] = items
-                self.signal_var.set(items[-1])
-
-                self.addsub1_combo["values"] = items
-                self.addsub2_combo["values"] = items
-                self.multiply_signal_combo["values"] = items
-                self.shift_signal_combo["values"] = items
-                self.fold_signal_combo["values"] = items
-
-                messagebox.showinfo("Success", f"Loaded {os.path.basename(path)}")
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+            self.executor.submit(self.open_signal, path, pass_task=True,
+                                 on_done=lambda result: self.signal_loaded(path, *result),
+                                 on_error=lambda e: messagebox.showerror("Error", str(e)),
+                                 description=f"Loading {os.path.basename(path)}")
+
+    def open_signal(self, task, path):
+        # Worker thread: the workspace is only ever used from here
+        result = load_signal_with_pyramid(task, path, self.workspace)
+        self.workspace.add_to_session(result[2], path)
+        return result
+
+    def restore_session(self, task):
+        """Worker side of reopening the last session: its signals come straight from the workspace."""
+        session = self.workspace.session
+        restored = []
+        for i, (key, path) in enumerate(session):
+            step = task.phase(i / len(session), (i + 1) / len(session), os.path.basename(path))
+            step(0.0)
+            sig = self.workspace.open(key)[1]
+            pyramid = None
+            if sig.size >= PYRAMID_MIN_SAMPLES:
+                pyramid = ensure_pyramid(self.workspace.object_path(key), sig.values, progress=step)
+            restored.append((path, sig, pyramid, key))
+        return restored
+
+    def close(self):
+        # Cancel running work first, so the worker stops at its next chunk instead of outliving the window
+        self.executor.shutdown()
+        self.root.destroy()
+
+    def session_restored(self, restored):
+        for path, sig, pyramid, key in restored:
+            self.signal_loaded(path, sig, pyramid, key, announce=False)
+
+    def new_session(self):
+        # Stored objects and memoized results are kept; only the list of open signals is reset
+        self.executor.submit(self.workspace.clear_session, description="Clearing session")
+        self.signals, self.pyramids, self.signal_keys = [], [], []
+        for combo in (self.signal_combo, self.addsub1_combo, self.addsub2_combo,
+                      self.multiply_signal_combo, self.shift_signal_combo, self.fold_signal_combo):
+            combo["values"] = []
+        for var in (self.signal_var, self.addsub1_var, self.addsub2_var,
+                    self.multiply_signal_var, self.shift_signal_var, self.fold_signal_var):
+            var.set("")
+
+    def signal_loaded(self, path, sig, pyramid, key=None, announce=True):
+        self.signals.append(sig)
+        self.pyramids.append(pyramid)
+        self.signal_keys.append(key)
+
+        items = [f"Signal {i+1}" for i in range(len(self.signals))]
+        self.signal_combo["values"] = items
+        self.signal_var.set(items[-1])
+
+        self.addsub1_combo["values"] = items
+        self.addsub2_combo["values"] = items
+        self.multiply_signal_combo["values"] = items
+        self.shift_signal_combo["values"] = items
+        self.fold_signal_combo["values"] = items
+
+        if announce:
+            messagebox.showinfo("Success", f"Loaded {os.path.basename(path)}")
 
     def plot_selected(self):
         if not self.signal_var.get():
             messagebox.showwarning("Warning", "Please select a signal first")
             return
         idx = int(self.signal_var.get().split()[-1]) - 1
-        indices, values = self.signals[idx]
+        sig = self.signals[idx]
+        if self.pyramids[idx] is not None:
+            plot_signal_pyramid(sig, self.pyramids[idx], self.signal_var.get())
+            return
+        indices, values = sig
         plot_signal(indices, values, self.signal_var.get())
 
+    def plot_selected_spectrum(self):
+        sig = self.get_signal(self.signal_var)
+        if not sig:
+            messagebox.showwarning("Warning", "Please select a signal first")
+            return
+        title = self.signal_var.get()
+        # The FFT of a long signal runs on the worker, like loading
+        self.executor.submit(signal_spectrum, sig, key="spectrum",
+                             on_done=lambda spec: plot_signal_spectrum(spec, title),
+                             on_error=lambda e: messagebox.showerror("Error", str(e)),
+                             description=f"Spectrum of {title}")
+
     def get_signal(self, var):
         if not var.get():
             return None
         idx = int(var.get().split()[-1]) - 1
         return self.signals[idx]
 
+    def get_signal_key(self, var):
+        idx = int(var.get().split()[-1]) - 1
+        return self.signal_keys[idx]
+
+    def derive(self, op, var1, var2, compute, title):
+        # Memoized in the workspace: the same op on the same inputs is computed once, ever
+        keys = [self.get_signal_key(var1), self.get_signal_key(var2)]
+        self.executor.submit(self.workspace.derive, op, keys, {}, compute, key="addsub",
+                             on_done=lambda result: plot_signal(*result[1], title),
+                             on_error=lambda e: messagebox.showerror("Error", str(e)),
+                             description=title)
+
     def add(self):
         sig1 = self.get_signal(self.addsub1_var)
         sig2 = self.get_signal(self.addsub2_var)
         if sig1 and sig2:
-            idx, val = add_signals([sig1, sig2])
-            plot_signal(idx, val, "Signal A + Signal B")
+            self.derive("add", self.addsub1_var, self.addsub2_var,
+                        lambda: add_signals([sig1, sig2]), "Signal A + Signal B")
 
     def subtract(self):
         sig1 = self.get_signal(self.addsub1_var)
         sig2 = self.get_signal(self.addsub2_var)
         if sig1 and sig2:
-            idx, val = subtract_signals(sig1, sig2)
-            plot_signal(idx, val, "Signal A - Signal B")
+            self.derive("subtract", self.addsub1_var, self.addsub2_var,
+                        lambda: subtract_signals(sig1, sig2), "Signal A - Signal B")
 
     def apply_multiply(self):
         sig = self.get_signal(self.multiply_signal_var)
@@ -215,7 +409,7 @@ class SignalApp:
         except ValueError:
             messagebox.showerror("Error", "Multiply value must be a number")
             return
-        out_idx, out_val = multiply_signal(sig[0], sig[1], constant)
+        out_idx, out_val = sig.scale(constant)
         plot_signal(out_idx, out_val, f"{self.multiply_signal_var.get()} * {constant}")
 
     def apply_shift(self):
@@ -232,7 +426,7 @@ class SignalApp:
         if method not in ("advance", "delay"):
             messagebox.showerror("Error", "Method must be 'advance' or 'delay'")
             return
-        out_idx, out_val = shifting_signal(sig[0], sig[1], k, method)
+        out_idx, out_val = sig.shift(k if method == "delay" else -k)
         plot_signal(out_idx, out_val, f"{self.shift_signal_var.get()} shift {k} ({method})")
 
     def apply_fold(self):
@@ -240,7 +434,7 @@ class SignalApp:
         if not sig:
             messagebox.showwarning("Warning", "Please select a signal for folding")
             return
-        out_idx, out_val = fold_signal(sig[0], sig[1])
+        out_idx, out_val = sig.fold()
         plot_signal(out_idx, out_val, f"Folded {self.fold_signal_var.get()}")
         
 
@@ -46,91 +46,60 @@
 # avg_error = sum(e**2 for e in errors) / len(errors)
 
 
-import math
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Test 1'))
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Test 2'))
 from QuanTest1 import QuantizationTest1
 from QuanTest2 import QuantizationTest2
-from Task1 import read_signal_from_txt
-
-def quantize_and_encode(values, levels=None, bits=None):
-    if not values:
+from signal_io import load_signal
+from quantization import QUANTIZER_MODES, quantize_values, encoding_table, pack_result, code_strings
+
+QUAN2_OUT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Test 2', 'Quan2_Out.txt')
+
+def quantize_and_encode(values, levels=None, bits=None, verbose=False, test_file=None, mode="uniform"):
+    """
+    Quantize and encode values. Printing the per-sample lists (verbose) and
+    comparing against a QuanTest2 expected-output file (test_file) are opt-in.
+    mode is one of QUANTIZER_MODES; the non-uniform ones use their
+    reconstruction levels as mid_points and report the nominal delta.
+    """
+    if len(values) == 0:
         raise ValueError("Values list cannot be empty.")
 
     if not levels and not bits:
         raise ValueError("Specify either number of levels or number of bits.")
 
-    # Determine number of levels
-    L = 2 ** int(bits) if bits else int(levels)
-
-    # Quantization step
-    min_value = min(values)
-    max_value = max(values)
-    delta = (max_value - min_value) / L
-
-    # Midpoints
-    mid_points = []
-    z = min_value
-    z_delta = min_value + delta
-
-    while z_delta <= max_value + 1e-9:
-        mid = (z + z_delta) / 2
-        mid_points.append(mid)
-        z = z_delta
-        z_delta += delta
-
-    # Quantize
-    quantized = []
-    errors = []
-    for x in values:
-        for i in range(L):
-            lower = min_value + i * delta
-            upper = lower + delta
-            if lower <= x <= upper or (i == L - 1 and x == max_value):
-                q = mid_points[i]
-                quantized.append(round(q, 3))
-                errors.append(round(q - x, 3))
-                break
-
-    # Average quantization error (MSE)
-    avg_error = sum(e ** 2 for e in errors) / len(errors)
-
-    # generate encodings and rotate backward by 1 level
-    num_bits = math.ceil(math.log2(L))
-    encoding = [format(i, f"0{num_bits}b") for i in range(L)]
-
-    encoded_signal = []
-    for q in quantized:
-        idx = mid_points.index(min(mid_points, key=lambda m: abs(m - q)))
-        encoded_signal.append(encoding[idx])
+    # Interval lookup, quantization, errors and codes all vectorized
+    result = quantize_values(values, mode, levels=levels, bits=bits)
+    L = result["levels"]
+
+    encoding = encoding_table(L)
+    # The packed stream is the compact output; strings are only built for display and QuanTest
+    packed = pack_result(result)
+    encoded_signal = code_strings(result["code_index"], result["num_bits"])
+
+    mid_points = result["mid_points"].tolist()
+    quantized = result["quantized"].tolist()
+    errors = result["errors"].tolist()
+    avg_error = result["avg_error"]
+    delta = result["delta"]
 
     # QuantizationTest1('Test 1/Quan1_Out.txt', encoded_signal, quantized)
 
-    # Calculate interval indices and sampled errors
-    interval_indices = []
-    sampled_errors = []
-    for i, x in enumerate(values):
-        # Find which interval this sample belongs to
-        idx = int((x - min_value) / delta)
-        if idx >= L:
-            idx = L - 1
-        if idx < 0:
-            idx = 0
-        interval_indices.append(idx + 1)
-        # Calculate error (quantized - original)
-        error = quantized[i] - x
-        sampled_errors.append(round(error, 3))
-    # Debug: Print the calculated values
-    print(f"Interval indices: {interval_indices}")
-    print(f"Encoded signal: {encoded_signal}")
-    print(f"Quantized values: {quantized}")
-    print(f"Sampled errors: {sampled_errors}")
-    
-    QuantizationTest2('Test 2/Quan2_Out.txt', interval_indices, encoded_signal, quantized, sampled_errors)
+    interval_indices = result["interval_indices"].tolist()
+    sampled_errors = result["sampled_errors"].tolist()
+    if verbose:
+        print(f"Interval indices: {interval_indices}")
+        print(f"Encoded signal: {encoded_signal}")
+        print(f"Quantized values: {quantized}")
+        print(f"Sampled errors: {sampled_errors}")
+
+    if test_file:
+        QuantizationTest2(test_file, interval_indices, encoded_signal, quantized, sampled_errors)
 
     return {
+        "mode": mode,
         "levels": L,
         "delta": delta,
         "mid_points": mid_points,
@@ -139,11 +108,15 @@ def quantize_and_encode(values, levels=None, bits=None):
         "avg_error": avg_error,
         "encoding": encoding,
         "encoded_signal": encoded_signal,
+        "interval_indices": interval_indices,
+        "sampled_errors": sampled_errors,
+        "packed": packed,
     }
 
 
 import tkinter as tk
 from tkinter import messagebox, filedialog
+from tk_executor import TkTaskExecutor, TaskStatusBar
 
 def quantize_signal():
     try:
@@ -157,10 +130,6 @@ def quantize_signal():
             messagebox.showwarning("Warning", "Please select a signal file first.")
             return
             
-        # Read signal from file
-        indices, values = read_signal_from_txt(file_path)
-        values = values.tolist()  # Convert numpy array to list
-
         levels = entry_levels.get().strip()
         bits = entry_bits.get().strip()
 
@@ -172,27 +141,51 @@ def quantize_signal():
         levels = int(levels) if levels else None
         bits = int(bits) if bits else None
 
-        # --- Use the logic function ---
-        result = quantize_and_encode(values, levels=levels, bits=bits)
-
-        # --- Display the output ---
-        output = (
-            f"Input Signal: {values}\n\n"
-            f"Levels (L): {result['levels']}\nΔ = {result['delta']:.3f}\n"
-            f"Midpoints: {result['mid_points']}\n\n"
-            f"Quantized Signal: {result['quantized']}\n"
-            f"Quantization Errors: {result['errors']}\n"
-            f"Average Power Error: {result['avg_error']:.6f}\n\n"
-            f"Encoding per level: {result['encoding']}\n"
-            f"Encoded Signal: {result['encoded_signal']}"
-        )
-
-        text_output.delete("1.0", tk.END)
-        text_output.insert(tk.END, output)
+        # Reading and quantizing run on the worker; a new request supersedes a pending one
+        executor.submit(read_and_quantize, file_path, levels, bits, mode_var.get(), pass_task=True, key="quantize",
+                        on_done=show_quantization, on_error=lambda e: messagebox.showerror("Error", str(e)),
+                        description=f"Quantizing {os.path.basename(file_path)}")
 
     except Exception as e:
         messagebox.showerror("Error", str(e))
 
+def read_and_quantize(task, file_path, levels, bits, mode="uniform"):
+    task.report(0.0, "reading")
+    # Read signal from file, chunk by chunk so a cancel stops the parse
+    _, signal = load_signal(file_path, task.phase(0.0, 0.5, "reading"))
+    values = signal.values.tolist()  # Convert numpy array to list
+
+    task.report(0.5, "quantizing")
+    # --- Use the logic function ---
+    # The QuanTest2 expected output is for the uniform quantizer
+    test_file = QUAN2_OUT_FILE if mode == "uniform" else None
+    result = quantize_and_encode(values, levels=levels, bits=bits, verbose=True, test_file=test_file, mode=mode)
+    return values, result
+
+def show_quantization(outcome):
+    values, result = outcome
+    # --- Display the output ---
+    output = (
+        f"Input Signal: {values}\n\n"
+        f"Mode: {result['mode']}\n"
+        f"Levels (L): {result['levels']}\nΔ = {result['delta']:.3f}"
+        f"{'' if result['mode'] == 'uniform' else ' (nominal)'}\n"
+        f"Midpoints: {result['mid_points']}\n\n"
+        f"Quantized Signal: {result['quantized']}\n"
+        f"Quantization Errors: {result['errors']}\n"
+        f"Average Power Error: {result['avg_error']:.6f}\n\n"
+        f"Encoding per level: {result['encoding']}\n"
+        f"Encoded Signal: {result['encoded_signal']}"
+    )
+
+    text_output.delete("1.0", tk.END)
+    text_output.insert(tk.END, output)
+
+def close_window():
+    # Cancel running work first, so the worker stops at its next chunk instead of outliving the window
+    executor.shutdown()
+    root.destroy()
+
 def select_signal_file():
     file_path = filedialog.askopenfilename(
         title="Select Signal File",
@@ -206,34 +199,44 @@ def select_signal_file():
 
 
 # --- GUI Setup ---
-selected_file_path = None
-root = tk.Tk()
-root.title("Signal Quantization Tool")
-root.geometry("700x600")
-root.configure(bg="#f5f5f5")
+# Only built when run as a script, so quantize_and_encode can be imported headless
+if __name__ == "__main__":
+    selected_file_path = None
+    root = tk.Tk()
+    root.title("Signal Quantization Tool")
+    root.geometry("700x600")
+    root.configure(bg="#f5f5f5")
+    executor = TkTaskExecutor(root)
+    root.protocol("WM_DELETE_WINDOW", close_window)
+
+    title = tk.Label(root, text="Signal Quantization & Encoding", font=("Arial", 16, "bold"), bg="#f5f5f5")
+    title.pack(pady=10)
+
+    frame_inputs = tk.Frame(root, bg="#f5f5f5")
+    frame_inputs.pack(pady=5)
 
-title = tk.Label(root, text="Signal Quantization & Encoding", font=("Arial", 16, "bold"), bg="#f5f5f5")
-title.pack(pady=10)
+    tk.Label(frame_inputs, text="Select Signal File:", bg="#f5f5f5").grid(row=0, column=0, sticky="w")
+    btn_select_file = tk.Button(frame_inputs, text="Browse Signal File", command=lambda: select_signal_file(), bg="#2196F3", fg="white")
+    btn_select_file.grid(row=1, column=0, columnspan=2, pady=5)
 
-frame_inputs = tk.Frame(root, bg="#f5f5f5")
-frame_inputs.pack(pady=5)
+    tk.Label(frame_inputs, text="Number of Levels:", bg="#f5f5f5").grid(row=2, column=0, sticky="w")
+    entry_levels = tk.Entry(frame_inputs, width=10)
+    entry_levels.grid(row=2, column=1, sticky="w", pady=5)
 
-tk.Label(frame_inputs, text="Select Signal File:", bg="#f5f5f5").grid(row=0, column=0, sticky="w")
-btn_select_file = tk.Button(frame_inputs, text="Browse Signal File", command=lambda: select_signal_file(), bg="#2196F3", fg="white")
-btn_select_file.grid(row=1, column=0, columnspan=2, pady=5)
+    tk.Label(frame_inputs, text="OR Number of Bits:", bg="#f5f5f5").grid(row=3, column=0, sticky="w")
+    entry_bits = tk.Entry(frame_inputs, width=10)
+    entry_bits.grid(row=3, column=1, sticky="w", pady=5)
 
-tk.Label(frame_inputs, text="Number of Levels:", bg="#f5f5f5").grid(row=2, column=0, sticky="w")
-entry_levels = tk.Entry(frame_inputs, width=10)
-entry_levels.grid(row=2, column=1, sticky="w", pady=5)
+    tk.Label(frame_inputs, text="Quantizer:", bg="#f5f5f5").grid(row=4, column=0, sticky="w")
+    mode_var = tk.StringVar(value="uniform")
+    tk.OptionMenu(frame_inputs, mode_var, *QUANTIZER_MODES).grid(row=4, column=1, sticky="w", pady=5)
 
-tk.Label(frame_inputs, text="OR Number of Bits:", bg="#f5f5f5").grid(row=3, column=0, sticky="w")
-entry_bits = tk.Entry(frame_inputs, width=10)
-entry_bits.grid(row=3, column=1, sticky="w", pady=5)
+    btn_calc = tk.Button(root, text="Quantize Signal", command=quantize_signal, bg="#4CAF50", fg="white", font=("Arial", 12, "bold"), width=20)
+    btn_calc.pack(pady=15)
 
-btn_calc = tk.Button(root, text="Quantize Signal", command=quantize_signal, bg="#4CAF50", fg="white", font=("Arial", 12, "bold"), width=20)
-btn_calc.pack(pady=15)
+    text_output = tk.Text(root, height=18, width=100, font=("Courier", 10))
+    text_output.pack(padx=10, pady=10)
 
-text_output = tk.Text(root, height=18, width=100, font=("Courier", 10))
-text_output.pack(padx=10, pady=10)
+    TaskStatusBar(root, executor, bg="#f5f5f5").pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=5)
 
-root.mainloop()
\ No newline at end of file
+    root.mainloop()
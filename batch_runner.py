@@ -0,0 +1,148 @@
+"""
+Run Task1 signal operations in bulk from a JSON-lines job manifest.
+
+Each line is one job, for example:
+
+    {"op": "add", "inputs": ["Signal1.txt", "Signal2.txt"], "output": "out/add.txt"}
+    {"op": "subtract", "inputs": ["Signal1.txt", "Signal2.txt"], "output": "out/sub.sigb"}
+    {"op": "multiply", "inputs": ["Signal1.txt"], "params": {"constant": 5}, "output": "out/mul5.txt"}
+    {"op": "shift", "inputs": ["Signal1.txt"], "params": {"k": 3, "method": "advance"}, "output": "out/adv3.txt"}
+    {"op": "fold", "inputs": ["Signal1.txt"], "output": "out/fold.txt"}
+
+Relative paths are resolved against the manifest's directory. Inputs are
+loaded with signal_io.load_signal (memory-mapped when a fresh .sigb exists),
+and outputs are written as .txt or .sigb depending on their extension.
+
+    python batch_runner.py jobs.jsonl --workers 8 --report timings.json
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Task1 import add_signals, subtract_signals
+from signal_io import BINARY_EXTENSION, load_signal, write_signal_bin, write_signal_txt
+
+OPS = ("add", "subtract", "multiply", "shift", "fold")
+
+
+def read_manifest(path):
+    base_dir = os.path.dirname(os.path.abspath(path))
+    jobs = []
+    with open(path, "r") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            if job.get("op") not in OPS:
+                raise ValueError(f"{path}:{line_no}: unknown op {job.get('op')!r}")
+            job["line"] = line_no
+            job["inputs"] = [os.path.join(base_dir, p) for p in job["inputs"]]
+            job["output"] = os.path.join(base_dir, job["output"])
+            job.setdefault("params", {})
+            jobs.append(job)
+    return jobs
+
+
+def apply_op(op, signals, params):
+    """Apply one Task1 operation to loaded Signal objects; returns (indices, values)."""
+    if op == "add":
+        return tuple(add_signals(signals))
+    if op == "subtract":
+        if len(signals) != 2:
+            raise ValueError("subtract needs exactly 2 inputs")
+        return tuple(subtract_signals(signals[0], signals[1]))
+
+    if len(signals) != 1:
+        raise ValueError(f"{op} needs exactly 1 input")
+    sig = signals[0]
+    if op == "multiply":
+        return tuple(sig.scale(float(params["constant"])))
+    if op == "shift":
+        k = int(params["k"])
+        method = params.get("method", "delay")
+        if method not in ("advance", "delay"):
+            raise ValueError("Method must be 'advance' or 'delay'")
+        return tuple(sig.shift(k if method == "delay" else -k))
+    return tuple(sig.fold())
+
+
+def run_job(job):
+    """Load, compute and write one job; returns its timing record."""
+    t0 = time.perf_counter()
+    loaded = [load_signal(p) for p in job["inputs"]]
+    header = loaded[0][0]
+    signals = [sig for _, sig in loaded]
+    t1 = time.perf_counter()
+
+    indices, values = apply_op(job["op"], signals, job["params"])
+    t2 = time.perf_counter()
+
+    out_dir = os.path.dirname(job["output"])
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    if job["output"].endswith(BINARY_EXTENSION):
+        write_signal_bin(job["output"], indices, values, header.signal_type, header.periodic)
+    else:
+        write_signal_txt(job["output"], indices, values, header.signal_type, header.periodic)
+    t3 = time.perf_counter()
+
+    return {
+        "line": job["line"],
+        "op": job["op"],
+        "output": job["output"],
+        "samples_in": sum(s.size for s in signals),
+        "samples_out": len(values),
+        "load_s": t1 - t0,
+        "compute_s": t2 - t1,
+        "write_s": t3 - t2,
+        "seconds": t3 - t0,
+    }
+
+
+def run_manifest(path, workers=None):
+    """Run every job of a manifest across a process pool; returns (records, wall seconds)."""
+    jobs = read_manifest(path)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [(job, pool.submit(run_job, job)) for job in jobs]
+        records = []
+        for job, future in futures:
+            try:
+                records.append(future.result())
+            except Exception as e:
+                records.append({"line": job["line"], "op": job["op"], "output": job["output"], "error": str(e)})
+    return records, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Task1 signal operations from a JSON-lines manifest")
+    parser.add_argument("manifest")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--report", help="write the per-job timings and totals to this JSON file")
+    args = parser.parse_args(argv)
+
+    records, elapsed = run_manifest(args.manifest, args.workers)
+    done = [r for r in records if "error" not in r]
+    samples = sum(r["samples_in"] for r in done)
+
+    for r in records:
+        if "error" in r:
+            print(f"line {r['line']:>5} {r['op']:>8} FAILED: {r['error']}")
+        else:
+            print(f"line {r['line']:>5} {r['op']:>8} {r['seconds'] * 1e3:9.2f} ms "
+                  f"(load {r['load_s'] * 1e3:.2f}, compute {r['compute_s'] * 1e3:.2f}, "
+                  f"write {r['write_s'] * 1e3:.2f}) -> {r['output']}")
+    print(f"{len(done)}/{len(records)} jobs in {elapsed:.3f} s: "
+          f"{len(done) / elapsed:.1f} jobs/s, {samples / elapsed:.0f} input samples/s")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"wall_seconds": elapsed, "jobs_per_second": len(done) / elapsed,
+                       "samples_per_second": samples / elapsed, "jobs": records}, f, indent=2)
+    return 0 if len(done) == len(records) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
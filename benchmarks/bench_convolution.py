@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convolution import choose_method, convolve_values
+
+
+def best_time(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Direct vs FFT vs overlap-add convolution crossover")
+    parser.add_argument("-n", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="signal lengths")
+    parser.add_argument("--taps", type=int, nargs="+", default=[16, 64, 128, 256, 1024, 4096],
+                        help="kernel lengths (the signal length itself is always added)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>8} {'m':>8} {'direct ms':>10} {'fft ms':>10} {'ola ms':>10}  fastest      auto")
+    for n in args.n:
+        x = rng.standard_normal(n)
+        for m in sorted(set(t for t in args.taps if t <= n) | {n}):
+            h = rng.standard_normal(m)
+            times = {}
+            for method in ("direct", "fft", "overlap-add"):
+                # Direct on two long inputs is quadratic; skip what would take minutes
+                if method == "direct" and n * m > 2e9:
+                    continue
+                times[method] = best_time(convolve_values, x, h, method, repeat=args.repeat)
+            fastest = min(times, key=times.get)
+            auto = choose_method(n, m)
+            cells = " ".join(f"{times[k] * 1e3:10.2f}" if k in times else f"{'-':>10}"
+                             for k in ("direct", "fft", "overlap-add"))
+            mark = "" if auto == fastest else f" ({times[auto] / times[fastest]:.2f}x the fastest)"
+            print(f"{n:>8} {m:>8} {cells}  {fastest:<12} {auto}{mark}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Streamed vs in-memory throughput of the filters stages.
+
+    python benchmarks/bench_filters.py -n 1000000 --chunk 65536
+
+For each stage the whole signal is filtered in one process() call, then
+chunk by chunk through stream_filter. The outputs must match, and the
+ratio shows what the chunking costs. filter_file is also timed end to end
+on a .sigb file.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from filters import FIRFilter, IIRFilter, filter_file, filter_signal, stream_filter
+from signal_io import write_signal_bin
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def chunks_of(indices, values, chunk):
+    for start in range(0, len(values), chunk):
+        yield indices[start:start + chunk], values[start:start + chunk]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamed vs in-memory FIR/IIR filtering")
+    parser.add_argument("-n", type=int, default=1_000_000, help="signal length")
+    parser.add_argument("--chunk", type=int, default=1 << 16, help="samples per streamed chunk")
+    parser.add_argument("--taps", type=int, nargs="+", default=[16, 128, 1024])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    indices = np.arange(args.n, dtype=np.int64)
+    values = rng.standard_normal(args.n)
+
+    stages = [(f"fir {m} ({FIRFilter(np.ones(m)).method})", FIRFilter(rng.standard_normal(m) / m))
+              for m in args.taps]
+    # Two resonant biquads, a typical low-order IIR cascade
+    stages.append(("iir 2 biquads", IIRFilter.from_sos([[0.02, 0.04, 0.02, 1.0, -1.56, 0.64],
+                                                        [0.02, 0.04, 0.02, 1.0, -1.73, 0.82]])))
+
+    print(f"{'stage':>26} {'one call ms':>12} {'streamed ms':>12} {'ratio':>6} {'Msamples/s':>11} {'max diff':>9}")
+    for name, stage in stages:
+        t_one, (_, whole) = best_time(lambda: filter_signal((indices, values), stage), args.repeat)
+        t_stream, parts = best_time(
+            lambda: [v for _, v in stream_filter(chunks_of(indices, values, args.chunk), stage)], args.repeat)
+        diff = np.abs(np.concatenate(parts) - whole).max()
+        print(f"{name:>26} {t_one * 1e3:12.1f} {t_stream * 1e3:12.1f} {t_stream / t_one:6.2f} "
+              f"{args.n / t_stream / 1e6:11.1f} {diff:9.1e}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.sigb")
+        dst = os.path.join(tmp, "out.sigb")
+        write_signal_bin(src, indices, values)
+        stage = FIRFilter(rng.standard_normal(128) / 128)
+        t_file, _ = best_time(lambda: filter_file(src, dst, stage, args.chunk), args.repeat)
+        print(f"filter_file .sigb -> .sigb, fir 128: {t_file * 1e3:.1f} ms ({args.n / t_file / 1e6:.1f} Msamples/s)")
+
+
+if __name__ == "__main__":
+    main()
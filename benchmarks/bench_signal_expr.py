@@ -0,0 +1,96 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Task1 import subtract_signals, multiply_signal, shifting_signal, fold_signal
+from signal_expr import SignalExpr
+from signal_model import Signal
+
+
+def chained_calls(a, b):
+    # fold(shift(a*5 - b, 3)) one helper at a time
+    x = multiply_signal(a[0], a[1], 5)
+    x = subtract_signals(x, b)
+    x = shifting_signal(x[0], x[1], 3, "delay")
+    return fold_signal(x[0], x[1])
+
+
+def lazy_expr(a, b):
+    return (SignalExpr.of(a) * 5 - SignalExpr.of(b)).shift(3, "delay").fold().evaluate()
+
+
+def measure(fn, *args):
+    """Result, wall time and peak traced memory of one untraced-by-lines run."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def count_allocations(fn, array_bytes, *args):
+    """
+    Number of signal-sized arrays fn allocates. Every Python line it runs,
+    NumPy's included, is traced. After each line, tracemalloc's peak minus
+    the memory live before the line gives the bytes that line allocated,
+    which is rounded to a count of array_bytes-sized arrays. Temporaries
+    inside one C call or one expression still count, since they are live
+    together at the line's peak; small buffers round to zero.
+    """
+    count = 0
+    tracemalloc.start()
+    live = tracemalloc.get_traced_memory()[0]
+
+    def tracer(frame, event, arg):
+        nonlocal count, live
+        current, peak = tracemalloc.get_traced_memory()
+        count += round((peak - live) / array_bytes)
+        tracemalloc.reset_peak()
+        live = current
+        return tracer
+
+    sys.settrace(tracer)
+    try:
+        fn(*args)
+    finally:
+        sys.settrace(None)
+        tracer(None, "end", None)
+        tracemalloc.stop()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chained Task1 calls vs SignalExpr")
+    parser.add_argument("-n", type=int, default=1_000_000, help="samples per signal")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    a = (np.arange(-args.n // 2, args.n // 2), rng.standard_normal(args.n))
+    b = (np.arange(args.n), rng.standard_normal(args.n))
+    dense_a, dense_b = Signal.from_arrays(*a), Signal.from_arrays(*b)
+
+    cases = [
+        ("chained Task1 calls", chained_calls, a, b),
+        ("SignalExpr, (indices, values)", lazy_expr, a, b),
+        ("SignalExpr, dense Signal", lazy_expr, dense_a, dense_b),
+    ]
+    reference = None
+    print(f"fold(shift(a*5 - b, 3)) with {args.n} samples per signal")
+    for name, fn, x, y in cases:
+        (indices, values), elapsed, peak = measure(fn, x, y)
+        if reference is None:
+            reference = (indices, values)
+        assert np.array_equal(indices, reference[0]) and np.allclose(values, reference[1])
+        allocations = count_allocations(fn, 8 * args.n, x, y)
+        print(f"{name:>30}: {elapsed * 1e3:9.1f} ms  peak allocated {peak / 1e6:8.1f} MB  "
+              f"{allocations:3d} signal-sized allocations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from signal_generator import SignalSpec, generate, generate_batch, time_grid
+
+
+def random_specs(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        SignalSpec(enabled=True, kind=str(rng.choice(["sine", "cosine"])), A=float(rng.uniform(0.1, 5)),
+                   phase_deg=float(rng.uniform(0, 360)), f_analog=float(rng.uniform(1, 40)),
+                   fs=200.0, duration=1.0, representation="discrete")
+        for _ in range(count)
+    ]
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-spec generation loop vs generate_batch")
+    parser.add_argument("--specs", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    specs = random_specs(args.specs)
+    t = time_grid(specs[0])
+    out32 = np.empty((len(specs), len(t)), dtype=np.float32)
+
+    timings = {
+        "per-spec loop": best_of(lambda: [generate(s) for s in specs], args.repeat),
+        "generate_batch": best_of(lambda: generate_batch(specs), args.repeat),
+        "shared grid, float64": best_of(lambda: generate_batch(specs, t=t), args.repeat),
+        "shared grid, float32 out=": best_of(lambda: generate_batch(specs, t=t, dtype=np.float32, out=out32),
+                                             args.repeat),
+    }
+    print(f"{args.specs} specs x {len(t)} samples")
+    for name, seconds in timings.items():
+        print(f"{name:>26}: {seconds * 1e3:9.1f} ms  ({timings['per-spec loop'] / seconds:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from signal_io import read_signal_file
+
+
+def write_synthetic_signal(path, n):
+    indices = np.arange(n)
+    values = np.random.default_rng(0).standard_normal(n)
+    with open(path, "w") as f:
+        f.write(f"0\n0\n{n}\n")
+        np.savetxt(f, np.column_stack([indices, values]), fmt="%d %.6f")
+
+
+def readline_loop(path):
+    # The per-line reader the test harness used before signal_io
+    indices, samples = [], []
+    with open(path, "r") as f:
+        for _ in range(3):
+            f.readline()
+        line = f.readline()
+        while line:
+            L = line.split(" ")
+            indices.append(int(L[0]))
+            samples.append(float(L[1]))
+            line = f.readline()
+    return indices, samples
+
+
+def time_call(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare signal .txt readers")
+    parser.add_argument("-n", type=int, default=1_000_000, help="number of samples")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "signal.txt")
+        write_synthetic_signal(path, args.n)
+        size_mb = os.path.getsize(path) / 1e6
+
+        timings = {
+            "readline loop": time_call(lambda: readline_loop(path), args.repeat),
+            "np.loadtxt": time_call(lambda: np.loadtxt(path, skiprows=3), args.repeat),
+            "read_signal_file": time_call(lambda: read_signal_file(path), args.repeat),
+        }
+
+    print(f"{args.n} samples, {size_mb:.1f} MB")
+    for name, seconds in timings.items():
+        speedup = seconds / timings["read_signal_file"]
+        print(f"{name:>18}: {seconds:8.3f} s  {size_mb / seconds:8.1f} MB/s  "
+              f"(read_signal_file is {speedup:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
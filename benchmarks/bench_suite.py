@@ -0,0 +1,189 @@
+"""
+Time and peak memory of every signal operation and I/O path, as JSON.
+
+    python benchmarks/bench_suite.py --out results.json
+    python benchmarks/bench_suite.py --sizes 1e3 1e5 1e7 1e8 --out big.json
+    python benchmarks/bench_suite.py --compare old.json results.json
+
+Signals are synthetic. Dense ones have consecutive indices. Sparse ones
+keep a random quarter of the indices in [0, 4n). Each operation is timed
+best-of --repeat, then run once more under tracemalloc for its peak
+allocation (NumPy reports its buffers to tracemalloc). Operations that
+build Python lists per sample are skipped above --list-limit samples.
+
+--compare prints new/old time ratios per (op, layout, n). It exits with
+status 1 when any case is slower by more than --threshold and --min-delta.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from Task1 import (read_signal_from_txt, add_signals, subtract_signals, multiply_signal,
+                   shifting_signal, fold_signal)
+from Task3 import quantize_and_encode
+from signal_generator import SignalSpec, generate
+from signal_io import write_signal_txt
+
+DEFAULT_SIZES = [10 ** k for k in range(3, 7)]
+LAYOUTS = ("dense", "sparse")
+
+
+def make_signal(n, layout, seed):
+    rng = np.random.default_rng(seed)
+    if layout == "dense":
+        indices = np.arange(n, dtype=np.int64)
+    else:
+        indices = np.sort(rng.choice(4 * n, size=n, replace=False)).astype(np.int64)
+    return indices, rng.standard_normal(n)
+
+
+def generate_signal(n):
+    # What task2's generate_signal computes on a cache miss, for an n-sample discrete signal
+    return generate(SignalSpec(kind="sine", f_analog=5.0, fs=float(n), duration=1.0, representation="discrete"))
+
+
+def operations(a, b, txt_path):
+    """(name, callable, builds per-sample Python lists) for one pair of signals."""
+    return [
+        ("read_signal_from_txt", lambda: read_signal_from_txt(txt_path), False),
+        ("add_signals", lambda: add_signals([a, b]), False),
+        ("subtract_signals", lambda: subtract_signals(a, b), False),
+        ("multiply_signal", lambda: multiply_signal(a[0], a[1], 5), False),
+        ("shifting_signal", lambda: shifting_signal(a[0], a[1], 3, "delay"), False),
+        ("fold_signal", lambda: fold_signal(a[0], a[1]), False),
+        ("quantize_and_encode", lambda: quantize_and_encode(a[1], bits=3), True),
+    ]
+
+
+def measure(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat, list_limit, ops=None):
+    results = []
+
+    def record(op, layout, n, fn, builds_lists):
+        if ops and op not in ops:
+            return
+        entry = {"op": op, "layout": layout, "n": n}
+        if builds_lists and n > list_limit:
+            entry["skipped"] = f"builds per-sample lists; n > --list-limit {list_limit}"
+        else:
+            entry["seconds"], entry["peak_bytes"] = measure(fn, repeat)
+        results.append(entry)
+        if "skipped" in entry:
+            print(f"{op:>22} {layout:>6} n={n:<10} skipped")
+        else:
+            print(f"{op:>22} {layout:>6} n={n:<10} {entry['seconds'] * 1e3:10.2f} ms "
+                  f"{entry['peak_bytes'] / 1e6:10.1f} MB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            for layout in LAYOUTS:
+                a = make_signal(n, layout, seed=1)
+                b = make_signal(n, layout, seed=2)
+                txt_path = os.path.join(tmp, f"{layout}_{n}.txt")
+                if not ops or "read_signal_from_txt" in ops:
+                    write_signal_txt(txt_path, *a)
+                for op, fn, builds_lists in operations(a, b, txt_path):
+                    record(op, layout, n, fn, builds_lists)
+                if os.path.exists(txt_path):
+                    os.remove(txt_path)
+            record("generate_signal", "dense", n, lambda: generate_signal(n), False)
+    return results
+
+
+def compare(old_path, new_path, threshold, min_delta=1e-3):
+    with open(old_path) as f:
+        old = {(r["op"], r["layout"], r["n"]): r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'op':>22} {'layout':>6} {'n':>10} {'old ms':>10} {'new ms':>10} {'ratio':>7} {'peak ratio':>10}")
+    for r in new:
+        prev = old.get((r["op"], r["layout"], r["n"]))
+        if prev is None or "seconds" not in r or "seconds" not in prev:
+            continue
+        ratio = r["seconds"] / prev["seconds"] if prev["seconds"] else float("inf")
+        peak_ratio = r["peak_bytes"] / prev["peak_bytes"] if prev["peak_bytes"] else float("nan")
+        # Sub-millisecond cases are dominated by timer noise, so they also need an absolute slowdown
+        flag = "  REGRESSION" if ratio > threshold and r["seconds"] - prev["seconds"] > min_delta else ""
+        regressions += bool(flag)
+        print(f"{r['op']:>22} {r['layout']:>6} {r['n']:>10} {prev['seconds'] * 1e3:10.2f} "
+              f"{r['seconds'] * 1e3:10.2f} {ratio:7.2f} {peak_ratio:10.2f}{flag}")
+    print(f"{regressions} regression(s) above {threshold:.2f}x")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Signal operation benchmark suite")
+    parser.add_argument("--sizes", type=float, nargs="+", help="sample counts (default 1e3..1e6; up to 1e8)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, best is kept")
+    parser.add_argument("--list-limit", type=float, default=1e7,
+                        help="skip operations that build per-sample Python lists above this n")
+    parser.add_argument("--ops", nargs="+", help="only these operations")
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--compare", nargs="+", metavar="JSON",
+                        help="OLD [NEW]: compare two result files (NEW defaults to --out after a run)")
+    parser.add_argument("--threshold", type=float, default=1.2, help="time ratio reported as a regression")
+    parser.add_argument("--min-delta", type=float, default=1e-3,
+                        help="seconds a case must also slow down by to count as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare and len(args.compare) == 2:
+        return compare(args.compare[0], args.compare[1], args.threshold, args.min_delta)
+
+    sizes = [int(s) for s in args.sizes] if args.sizes else DEFAULT_SIZES
+    results = run(sizes, args.repeat, int(args.list_limit), args.ops)
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    out = args.out
+    if args.compare and not out:
+        out = os.path.join(tempfile.gettempdir(), "bench_suite_latest.json")
+    if out:
+        with open(out, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"wrote {out}")
+    if args.compare:
+        return compare(args.compare[0], out, args.threshold, args.min_delta)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
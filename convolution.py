@@ -0,0 +1,155 @@
+"""
+Convolution and cross-correlation of Task1 (indices, values) signals.
+
+    indices, values = convolve_signals((x_idx, x_val), (h_idx, h_val))
+    lags, r = correlate_signals(x, y)
+
+Integer indices are placed on their dense [first, last] range, with
+missing samples taken as zero. Signal objects are used as they are.
+The output runs over every index where the result can be non-zero:
+
+    convolution:  x_first + h_first  ..  x_last + h_last
+    correlation:  lag l = x_first - y_last  ..  x_last - y_first, with
+                  r[l] = sum_n x[n + l] * y[n]
+
+With method="auto", the cheapest method under an operation-count model is
+used:
+  - direct: np.convolve, about N * M multiply-adds; fastest for short
+    kernels.
+  - fft: one real FFT product padded to a 2/3/5-smooth length L, about
+    FFT_COST * L * log2(L).
+  - overlap-add: the FFT method applied block by block to the long input.
+    The transforms stay a few times the size of the short input, which
+    wins when one input is much longer than the other.
+The FFT paths agree with direct to within float64 rounding of the
+transforms, which is about 1e-15 relative to the largest output.
+"""
+import numpy as np
+
+from signal_model import Signal
+
+# Cost of an FFT product per L*log2(L), in direct multiply-adds (see benchmarks/bench_convolution.py)
+FFT_COST = 16.0
+# Kernels at most this long always go direct
+DIRECT_MAX_TAPS = 64
+
+
+def next_fast_len(n):
+    """Smallest 2**a * 3**b * 5**c >= n, a length numpy's FFT handles quickly."""
+    if n <= 6:
+        return max(n, 1)
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            # Smallest power of two lifting p35 to at least n
+            quotient = -(-n // p35)
+            candidate = p35 << (quotient - 1).bit_length()
+            best = min(best, candidate)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _dense(signal):
+    """(first index, dense float64 values) of a signal, zero-filling gaps."""
+    if isinstance(signal, Signal) and signal.is_dense:
+        return signal.start_index, np.asarray(signal.values, dtype=float)
+    indices, values = signal
+    indices = np.asarray(indices)
+    values = np.asarray(values, dtype=float)
+    if len(indices) == 0:
+        raise ValueError("Cannot convolve an empty signal")
+    int_indices = indices.astype(np.int64)
+    if not np.array_equal(int_indices, indices):
+        raise ValueError("Convolution needs integer sample indices")
+    first = int(int_indices.min())
+    if np.all(np.diff(int_indices) == 1):
+        return first, values
+    dense = np.zeros(int(int_indices.max()) - first + 1)
+    np.add.at(dense, int_indices - first, values)
+    return first, dense
+
+
+def choose_method(n, m):
+    """'direct', 'fft' or 'overlap-add' for inputs of n and m samples, whichever the cost model finds cheapest."""
+    short, long_ = min(n, m), max(n, m)
+    if short <= DIRECT_MAX_TAPS:
+        return "direct"
+    nfft = next_fast_len(n + m - 1)
+    block = _block_size(short)
+    block_nfft = next_fast_len(block + short - 1)
+    costs = {
+        "direct": float(short * long_),
+        "fft": FFT_COST * nfft * np.log2(nfft),
+        "overlap-add": FFT_COST * -(-long_ // block) * block_nfft * np.log2(block_nfft),
+    }
+    return min(costs, key=costs.get)
+
+
+def _block_size(taps):
+    # Block of the long input per FFT; the transform is then next_fast_len(block + taps - 1)
+    return next_fast_len(8 * taps) - taps + 1
+
+
+def _fft_convolve(x, h):
+    length = len(x) + len(h) - 1
+    nfft = next_fast_len(length)
+    return np.fft.irfft(np.fft.rfft(x, nfft) * np.fft.rfft(h, nfft), nfft)[:length]
+
+
+def _overlap_add(x, h):
+    # x is the long input; each block's tail overlaps the next block's head
+    if len(x) < len(h):
+        x, h = h, x
+    taps = len(h)
+    block = _block_size(taps)
+    nfft = next_fast_len(block + taps - 1)
+    H = np.fft.rfft(h, nfft)
+    out = np.zeros(len(x) + taps - 1)
+    for start in range(0, len(x), block):
+        segment = x[start:start + block]
+        y = np.fft.irfft(np.fft.rfft(segment, nfft) * H, nfft)[:len(segment) + taps - 1]
+        out[start:start + len(y)] += y
+    return out
+
+
+def convolve_values(x, h, method="auto"):
+    """Full linear convolution of two value arrays, len(x) + len(h) - 1 samples."""
+    x = np.asarray(x, dtype=float)
+    h = np.asarray(h, dtype=float)
+    if method == "auto":
+        method = choose_method(len(x), len(h))
+    if method == "direct":
+        return np.convolve(x, h)
+    if method == "fft":
+        return _fft_convolve(x, h)
+    if method == "overlap-add":
+        return _overlap_add(x, h)
+    raise ValueError("method must be 'auto', 'direct', 'fft' or 'overlap-add'")
+
+
+def convolve_signals(sig1, sig2, method="auto"):
+    """y(n) = sum_k x(k) h(n - k) of two signals, as (indices, values)."""
+    first1, x = _dense(sig1)
+    first2, h = _dense(sig2)
+    values = convolve_values(x, h, method)
+    return np.arange(first1 + first2, first1 + first2 + len(values)), values
+
+
+def correlate_signals(sig1, sig2, method="auto", normalize=False):
+    """
+    Cross-correlation r(l) = sum_n x(n + l) y(n) as (lags, values).
+    normalize=True divides by sqrt(sum x**2 * sum y**2), so r(l) is in [-1, 1].
+    """
+    first1, x = _dense(sig1)
+    first2, y = _dense(sig2)
+    # Correlation is convolution with y folded: y(-n) starts at -(last index of y)
+    values = convolve_values(x, y[::-1], method)
+    start = first1 - (first2 + len(y) - 1)
+    if normalize:
+        norm = np.sqrt(np.dot(x, x) * np.dot(y, y))
+        if norm > 0:
+            values = values / norm
+    return np.arange(start, start + len(values)), values
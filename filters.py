@@ -0,0 +1,230 @@
+"""
+Block-streaming FIR and IIR filter stages that keep their state between chunks.
+
+    stage = FIRFilter(taps)                      # or IIRFilter.from_sos(sos)
+    filter_file("long.txt", "filtered.sigb", stage)
+
+    for indices, values in stream_filter(stream_signal("long.sigb"), stage):
+        ...
+
+A stage sees its input as one continuous sequence of samples fed in
+pieces. process(values) returns as many outputs as it was given, and the
+delay lines carry over, so filtering a signal chunk by chunk gives the
+same result as one call on the whole signal. Filters are causal and start
+from rest, like lfilter with no initial conditions. Indices must be
+integers. Missing indices count as zero samples, as in convolution, so the
+output covers every index from the input's first to its last.
+
+FIR stages pick direct convolution or overlap-save FFT blocks from the
+cost model in convolution. IIR stages are cascades of direct-form II
+transposed sections. They use scipy.signal.lfilter when SciPy is
+installed, since it implements the same recursion with the same state
+layout. Otherwise a plain Python loop runs the recursion.
+"""
+import numpy as np
+
+from convolution import FFT_COST, _block_size, _dense, next_fast_len
+from signal_io import (BINARY_EXTENSION, DEFAULT_CHUNK_SIZE, open_signal_bin, read_signal_header,
+                       stream_signal, write_stream)
+
+try:
+    from scipy.signal import lfilter as _scipy_lfilter
+except ImportError:
+    _scipy_lfilter = None
+
+
+class FIRFilter:
+    """y(n) = sum_k taps[k] * x(n - k), with the last len(taps) - 1 inputs carried between chunks."""
+
+    def __init__(self, taps, method="auto"):
+        self.taps = np.asarray(taps, dtype=float)
+        if self.taps.ndim != 1 or len(self.taps) == 0:
+            raise ValueError("taps must be a non-empty 1-D array")
+        m = len(self.taps)
+        self._block = _block_size(m)
+        self._nfft = next_fast_len(self._block + m - 1)
+        if method == "auto":
+            # Multiply-adds per output sample: m direct, one FFT block shared by _block outputs
+            fft_cost = FFT_COST * self._nfft * np.log2(self._nfft) / self._block
+            method = "direct" if m <= fft_cost else "overlap-save"
+        if method not in ("direct", "overlap-save"):
+            raise ValueError("method must be 'auto', 'direct' or 'overlap-save'")
+        self.method = method
+        self._H = np.fft.rfft(self.taps, self._nfft) if method == "overlap-save" else None
+        self.reset()
+
+    def reset(self):
+        self.state = np.zeros(len(self.taps) - 1)
+
+    def process(self, values):
+        x = np.asarray(values, dtype=float)
+        if len(x) == 0:
+            return x.copy()
+        m = len(self.taps)
+        buf = np.concatenate((self.state, x))
+        self.state = buf[len(buf) - (m - 1):].copy() if m > 1 else self.state
+
+        if self.method == "direct":
+            return np.convolve(buf, self.taps, mode="valid")
+
+        # Overlap-save: each FFT block yields _block outputs, discarding the m - 1 wrapped ones
+        out = np.empty(len(x))
+        for start in range(0, len(x), self._block):
+            count = min(self._block, len(x) - start)
+            segment = buf[start:start + count + m - 1]
+            y = np.fft.irfft(np.fft.rfft(segment, self._nfft) * self._H, self._nfft)
+            out[start:start + count] = y[m - 1:m - 1 + count]
+        return out
+
+
+class IIRSection:
+    """
+    One direct-form II transposed section:
+
+        y(n)     = b0 x(n) + z1(n-1)
+        zi(n)    = b_i x(n) - a_i y(n) + z(i+1)(n-1)
+
+    with len(state) = max(len(b), len(a)) - 1, the zi layout of lfilter.
+    """
+
+    def __init__(self, b, a):
+        b = np.asarray(b, dtype=float)
+        a = np.asarray(a, dtype=float)
+        if a[0] == 0:
+            raise ValueError("a[0] must be non-zero")
+        order = max(len(a), len(b))
+        self.b = np.pad(b, (0, order - len(b))) / a[0]
+        self.a = np.pad(a, (0, order - len(a))) / a[0]
+        self.reset()
+
+    def reset(self):
+        self.state = np.zeros(len(self.a) - 1)
+
+    def process(self, values):
+        x = np.asarray(values, dtype=float)
+        if len(self.state) == 0:
+            return self.b[0] * x
+        if _scipy_lfilter is not None:
+            y, self.state = _scipy_lfilter(self.b, self.a, x, zi=self.state)
+            return y
+        return self._process_python(x)
+
+    def _process_python(self, x):
+        b, a = self.b.tolist(), self.a.tolist()
+        z = self.state.tolist()
+        order = len(z)
+        y = np.empty(len(x))
+        if order == 2:
+            # Second-order sections are the common case; keep the loop body in locals
+            b0, b1, b2 = b
+            a1, a2 = a[1], a[2]
+            z1, z2 = z
+            for n, xn in enumerate(x.tolist()):
+                yn = b0 * xn + z1
+                z1 = b1 * xn - a1 * yn + z2
+                z2 = b2 * xn - a2 * yn
+                y[n] = yn
+            self.state = np.array([z1, z2])
+            return y
+        for n, xn in enumerate(x.tolist()):
+            yn = b[0] * xn + z[0]
+            for i in range(order - 1):
+                z[i] = b[i + 1] * xn - a[i + 1] * yn + z[i + 1]
+            z[order - 1] = b[order] * xn - a[order] * yn
+            y[n] = yn
+        self.state = np.array(z)
+        return y
+
+
+class IIRFilter:
+    """Cascade of IIRSection stages; the output of each feeds the next."""
+
+    def __init__(self, sections):
+        self.sections = list(sections)
+
+    @classmethod
+    def from_ba(cls, b, a):
+        return cls([IIRSection(b, a)])
+
+    @classmethod
+    def from_sos(cls, sos):
+        """From second-order sections, rows of (b0, b1, b2, a0, a1, a2) as scipy.signal designs them."""
+        sos = np.atleast_2d(np.asarray(sos, dtype=float))
+        if sos.shape[1] != 6:
+            raise ValueError("sos must have shape (n_sections, 6)")
+        return cls([IIRSection(row[:3], row[3:]) for row in sos])
+
+    def reset(self):
+        for section in self.sections:
+            section.reset()
+
+    def process(self, values):
+        y = np.asarray(values, dtype=float)
+        for section in self.sections:
+            y = section.process(y)
+        return y
+
+
+def filter_signal(signal, stage):
+    """Filter a whole (indices, values) signal in one call; the stage starts from rest."""
+    stage.reset()
+    if len(signal[0]) == 0:
+        return np.asarray(signal[0]), stage.process(signal[1])
+    first, values = _dense(signal)
+    return np.arange(first, first + len(values)), stage.process(values)
+
+
+def _dense_chunks(chunks, piece=DEFAULT_CHUNK_SIZE):
+    """
+    Zero-fill the index gaps of a stream, within and between its chunks.
+    Chunks that already continue the previous one are passed through.
+    Filled spans are yielded in pieces of at most piece samples, so a
+    long gap does not allocate its whole length at once.
+    """
+    expected = None
+    for indices, values in chunks:
+        if len(indices) == 0:
+            continue
+        int_indices = np.asarray(indices).astype(np.int64)
+        if not np.array_equal(int_indices, indices):
+            raise ValueError("Filtering needs integer sample indices")
+        if np.any(np.diff(int_indices) <= 0) or (expected is not None and int_indices[0] < expected):
+            raise ValueError("Filtering a stream needs strictly increasing sample indices")
+        start = int(int_indices[0]) if expected is None else expected
+        end = int(int_indices[-1]) + 1
+        expected = end
+        if int_indices[0] == start and end - start == len(int_indices):
+            yield int_indices, np.asarray(values, dtype=float)
+            continue
+        values = np.asarray(values, dtype=float)
+        for lo in range(start, end, piece):
+            hi = min(lo + piece, end)
+            a, b = np.searchsorted(int_indices, [lo, hi])
+            dense = np.zeros(hi - lo)
+            dense[int_indices[a:b] - lo] = values[a:b]
+            yield np.arange(lo, hi), dense
+
+
+def stream_filter(chunks, stage):
+    """
+    Filter a stream of (indices, values) chunks in increasing index order,
+    carrying the stage's state across them. Gaps, including those between
+    chunks, are zero-filled like filter_signal does.
+    """
+    stage.reset()
+    for indices, values in _dense_chunks(chunks):
+        yield indices, stage.process(values)
+
+
+def filter_file(in_path, out_path, stage, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Filter a .txt or .sigb signal file into out_path (.txt or .sigb) with
+    memory bounded by chunk_size. Returns the number of samples written.
+    """
+    if in_path.endswith(BINARY_EXTENSION):
+        header = open_signal_bin(in_path)[0]
+    else:
+        with open(in_path, "r") as f:
+            header = read_signal_header(f)
+    chunks = stream_filter(stream_signal(in_path, chunk_size), stage)
+    return write_stream(out_path, chunks, header.signal_type, header.periodic)
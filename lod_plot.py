@@ -0,0 +1,131 @@
+"""
+Level-of-detail plotting for large signals.
+
+    plot_lod(ax, indices, values, stem=True, label="x(n)")
+
+Only what the axes can show gets drawn. The visible x range is split into
+about one bin per pixel column, and each bin is drawn as a vertical stroke
+from its minimum to its maximum, so peaks are never lost. The envelope is
+recomputed from the full data whenever the x limits change, for example
+when zooming or panning with NavigationToolbar2Tk. Stem markers are only
+drawn once few enough samples are visible for them to be readable.
+"""
+import numpy as np
+
+# Stems are drawn when at most this many samples are visible
+STEM_THRESHOLD = 500
+
+
+def minmax_envelope(x, y, lo, hi, bins):
+    """
+    Reduce the samples of sorted x within [lo, hi] to per-bin min/max pairs.
+    Returns (xs, ys) ready for ax.plot, or the raw visible samples when there
+    are fewer than 2 * bins of them.
+    """
+    first = max(np.searchsorted(x, lo, side="left") - 1, 0)
+    last = min(np.searchsorted(x, hi, side="right") + 1, len(x))
+    xv = x[first:last]
+    yv = y[first:last]
+    if len(xv) <= 2 * bins:
+        return xv, yv
+
+    edges = np.linspace(xv[0], xv[-1], bins + 1)
+    starts = np.unique(np.searchsorted(xv, edges[:-1], side="left"))
+    starts = starts[starts < len(xv)]
+    ys = np.empty(2 * len(starts))
+    ys[0::2] = np.minimum.reduceat(yv, starts)
+    ys[1::2] = np.maximum.reduceat(yv, starts)
+    return np.repeat(xv[starts], 2), ys
+
+
+class LODPlot:
+    """One signal on an axes, redrawn at the resolution of the current view."""
+
+    def __init__(self, ax, x, y, stem=False, label=None, stem_threshold=STEM_THRESHOLD, **line_kw):
+        order = None if len(x) < 2 or np.all(np.diff(x) >= 0) else np.argsort(x, kind="stable")
+        self.x = np.asarray(x, dtype=float) if order is None else np.asarray(x, dtype=float)[order]
+        self.y = np.asarray(y, dtype=float) if order is None else np.asarray(y, dtype=float)[order]
+        self._attach(ax, stem, label, stem_threshold, line_kw)
+
+    def _attach(self, ax, stem, label, stem_threshold, line_kw):
+        self.ax = ax
+        self.stem = stem
+        self.label = label
+        self.stem_threshold = stem_threshold
+        self.line_kw = line_kw
+        self._artist = None
+        self._showing_stems = None
+        self._view = None
+        self._updating = False
+
+        self.update(*self._data_limits())
+        # A closure keeps this object alive as long as the axes' callback registry
+        self._cid = ax.callbacks.connect("xlim_changed", lambda a: self.update(*a.get_xlim()))
+
+    def _data_limits(self):
+        if not len(self.x):
+            return 0.0, 1.0
+        return float(self.x[0]), float(self.x[-1])
+
+    def _visible(self, lo, hi):
+        # [first, last) sample positions inside the x range
+        return np.searchsorted(self.x, lo, side="left"), np.searchsorted(self.x, hi, side="right")
+
+    def _samples(self, first, last):
+        return self.x[first:last], self.y[first:last]
+
+    def _envelope(self, lo, hi, first, last, bins):
+        return minmax_envelope(self.x, self.y, lo, hi, bins)
+
+    def update(self, lo, hi):
+        """
+        Redraw the artists for the x range [lo, hi]. The caller draws the
+        canvas afterwards, as the toolbar does after a zoom or pan.
+        xlim_changed also fires from autoscaling in the middle of a draw.
+        Calling draw_idle, or re-entering, from there would start another
+        draw and recurse on backends that draw synchronously, such as Agg.
+        """
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            self._update(lo, hi)
+        finally:
+            self._updating = False
+
+    def _update(self, lo, hi):
+        first, last = self._visible(lo, hi)
+        show_stems = self.stem and last - first <= self.stem_threshold
+        bins = max(1, int(self.ax.bbox.width))
+        view = (first, last) if show_stems else (lo, hi, bins)
+        if show_stems == self._showing_stems and view == self._view:
+            # Nothing new to show; rebuilding would also re-trigger autoscaling
+            return
+        self._view = view
+
+        if show_stems:
+            # Stem containers cannot be updated in place, so they are rebuilt
+            self._remove()
+            xv, yv = self._samples(first, last)
+            self._artist = self.ax.stem(xv, yv, label=self.label)
+        else:
+            xs, ys = self._envelope(lo, hi, first, last, bins)
+            if self._showing_stems is False:
+                self._artist.set_data(xs, ys)
+            else:
+                self._remove()
+                self._artist, = self.ax.plot(xs, ys, label=self.label, **self.line_kw)
+        self._showing_stems = show_stems
+
+    def _remove(self):
+        if self._artist is not None:
+            self._artist.remove()
+            self._artist = None
+
+    def disconnect(self):
+        self.ax.callbacks.disconnect(self._cid)
+
+
+def plot_lod(ax, x, y, stem=False, label=None, **line_kw):
+    """Plot a signal with level-of-detail envelopes; stem=True for discrete signals."""
+    return LODPlot(ax, x, y, stem=stem, label=label, **line_kw)
@@ -0,0 +1,514 @@
+import math
+import numpy as np
+
+from signal_io import DEFAULT_CHUNK_SIZE, stream_signal
+
+
+def resolve_levels(levels=None, bits=None) -> int:
+    if not levels and not bits:
+        raise ValueError("Specify either number of levels or number of bits.")
+    return 2 ** int(bits) if bits else int(levels)
+
+
+def num_bits_for(L) -> int:
+    return math.ceil(math.log2(L))
+
+
+def encoding_table(L):
+    """Binary code string of every level, e.g. ['00', '01', '10', '11'] for L = 4."""
+    num_bits = num_bits_for(L)
+    return [format(i, f"0{num_bits}b") for i in range(L)]
+
+
+def round3(values):
+    """
+    Python's round(v, 3) of every element. np.round scales by 1000 and
+    rounds, which goes the other way on decimal ties: 3.1975 is stored
+    just below the tie, so round gives 3.197 and np.round 3.198. Away from
+    ties both agree, so only the samples close to one are redone in Python.
+    """
+    x = np.asarray(values, dtype=float)
+    scaled = x * 1000
+    out = np.rint(scaled) / 1000
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 1e-9 * np.maximum(1.0, np.abs(scaled))
+    ties = np.flatnonzero(near_tie)
+    if ties.size:
+        out.flat[ties] = [round(v, 3) for v in x.flat[ties].tolist()]
+    return out
+
+
+def mean_square(errors) -> float:
+    """sum(e ** 2) / n summed left to right, as the original loop did (np.mean sums pairwise)."""
+    errors = np.asarray(errors, dtype=float)
+    if not errors.size:
+        return 0.0
+    return float(np.add.accumulate(errors * errors)[-1] / errors.size)
+
+
+def uniform_mid_points(min_value, delta, L):
+    # Midpoints between running edges min, min + delta, (min + delta) + delta, ...
+    # accumulated in the same order as the original loop, so they round the same way
+    edges = np.cumsum(np.concatenate(([min_value], np.full(L, delta))))
+    return (edges[:-1] + edges[1:]) / 2
+
+
+class UniformQuantizer:
+    """
+    Uniform midpoint quantizer over [min_value, max_value] with L levels.
+
+    The interval edges and midpoints are built once; quantize() then derives
+    every per-sample output from one interval lookup (np.searchsorted on the
+    L edges), so the cost is O(n log L) instead of scanning all levels per
+    sample. Results follow Task3.quantize_and_encode:
+      - a sample on the edge between two intervals is quantized to the lower one
+      - interval_indices are 1-based and computed as int((x - min) / delta)
+      - quantized values and errors are rounded to 3 decimals with Python's
+        round (see round3)
+      - avg_error sums the squared errors left to right
+      - code_index is the midpoint nearest to the rounded quantized value
+    """
+
+    def __init__(self, min_value, max_value, levels=None, bits=None):
+        self.levels = L = resolve_levels(levels, bits)
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self.delta = (self.max_value - self.min_value) / L
+        self.num_bits = num_bits_for(L)
+
+        lower = self.min_value + np.arange(L) * self.delta
+        self.upper = lower + self.delta
+        self.mid_points = uniform_mid_points(self.min_value, self.delta, L)
+        self.rounded_mid_points = np.array([round(m, 3) for m in self.mid_points.tolist()])
+
+    def quantize(self, values):
+        x = np.asarray(values, dtype=float)
+        L = self.levels
+        mid_points = self.mid_points
+
+        # First interval whose upper edge reaches x
+        level_index = np.minimum(np.searchsorted(self.upper, x, side="left"), L - 1)
+        q = mid_points[level_index]
+        # Only L distinct quantized values, so they are rounded once per level
+        quantized = self.rounded_mid_points[level_index]
+        errors = round3(q - x)
+
+        # Nearest midpoint to the rounded value, ties going to the lower level
+        right = np.minimum(np.searchsorted(mid_points, quantized), L - 1)
+        left = np.maximum(right - 1, 0)
+        take_left = np.abs(mid_points[left] - quantized) <= np.abs(mid_points[right] - quantized)
+        code_index = np.where(take_left, left, right)
+
+        if self.delta > 0:
+            interval = np.floor((x - self.min_value) / self.delta).astype(np.int64)
+        else:
+            interval = np.zeros(x.shape, dtype=np.int64)
+        interval_indices = np.clip(interval, 0, L - 1) + 1
+
+        return {
+            "levels": L,
+            "delta": self.delta,
+            "min_value": self.min_value,
+            "mid_points": mid_points,
+            "level_index": level_index,
+            "code_index": code_index,
+            "interval_indices": interval_indices,
+            "quantized": quantized,
+            "errors": errors,
+            "sampled_errors": round3(quantized - x),
+            "avg_error": mean_square(errors),
+            "num_bits": self.num_bits,
+        }
+
+
+def quantize_uniform(values, levels=None, bits=None, min_value=None, max_value=None):
+    """Quantize values in memory; the range defaults to [min(values), max(values)]."""
+    x = np.asarray(values, dtype=float)
+    if x.size == 0:
+        raise ValueError("Values list cannot be empty.")
+    lo = x.min() if min_value is None else min_value
+    hi = x.max() if max_value is None else max_value
+    return UniformQuantizer(lo, hi, levels, bits).quantize(x)
+
+
+# ---- Non-uniform quantizers ----
+# Each is a pair of tables: L upper decision edges (the last is max_value)
+# and L reconstruction levels. TableQuantizer applies any such pair with the
+# same np.searchsorted lookup as UniformQuantizer.
+QUANTIZER_MODES = ("uniform", "mu-law", "a-law", "lloyd-max")
+DEFAULT_MU = 255.0
+DEFAULT_A = 87.6
+LLOYD_MAX_BINS = 4096
+
+
+def _expand(y, law, param):
+    """
+    Inverse compander curve on [-1, 1]: the u whose compressed value is y,
+    where mu-law compresses u to sign(u) ln(1 + mu|u|) / ln(1 + mu), and
+    A-law to sign(u) A|u| / (1 + ln A) below |u| = 1/A, and to
+    sign(u) (1 + ln(A|u|)) / (1 + ln A) above it.
+    """
+    a = np.abs(y)
+    if law == "mu-law":
+        return np.sign(y) * np.expm1(a * np.log1p(param)) / param
+    small = a < 1.0 / (1.0 + np.log(param))
+    return np.sign(y) * np.where(small, a * (1.0 + np.log(param)) / param,
+                                 np.exp(a * (1.0 + np.log(param)) - 1.0) / param)
+
+
+def compander_tables(min_value, max_value, L, law="mu-law", param=None):
+    """
+    Tables of a companded quantizer: L uniform steps of the mu-law or A-law
+    curve over [min_value, max_value], mapped back to the signal's scale.
+    Levels are dense near the middle of the range and sparse at its ends.
+    """
+    if law not in ("mu-law", "a-law"):
+        raise ValueError("law must be 'mu-law' or 'a-law'")
+    param = float(param if param is not None else (DEFAULT_MU if law == "mu-law" else DEFAULT_A))
+    centre = (max_value + min_value) / 2
+    half = (max_value - min_value) / 2
+    steps = np.linspace(-1.0, 1.0, L + 1)
+    upper = centre + half * _expand(steps[1:], law, param)
+    reconstruction = centre + half * _expand((steps[:-1] + steps[1:]) / 2, law, param)
+    upper[-1] = max_value
+    return upper, reconstruction
+
+
+def lloyd_max_tables(values, L, min_value=None, max_value=None, bins=LLOYD_MAX_BINS, max_iter=100, tol=1e-9):
+    """
+    Tables of a Lloyd-Max (minimum mean-square error) quantizer trained on
+    values. The training runs on a histogram of the values: bin centres
+    weighted by their counts. Each iteration is then O(bins), whatever the
+    number of samples. It starts from the uniform quantizer and alternates:
+      - edges at the midpoints between reconstruction levels
+      - each level moved to the centroid of its interval
+    It stops when no level moves by more than tol of the range.
+    """
+    x = np.asarray(values, dtype=float)
+    lo = x.min() if min_value is None else min_value
+    hi = x.max() if max_value is None else max_value
+    reconstruction = uniform_mid_points(lo, (hi - lo) / L, L)
+    if hi <= lo:
+        return np.full(L, float(hi)), reconstruction
+
+    counts, edges = np.histogram(x, bins=bins, range=(lo, hi))
+    centres = (edges[:-1] + edges[1:]) / 2
+    weighted = counts * centres
+    for _ in range(max_iter):
+        upper = (reconstruction[:-1] + reconstruction[1:]) / 2
+        level = np.searchsorted(upper, centres, side="left")
+        mass = np.bincount(level, weights=counts, minlength=L)
+        total = np.bincount(level, weights=weighted, minlength=L)
+        # Intervals with no data keep their level
+        updated = np.where(mass > 0, total / np.where(mass > 0, mass, 1), reconstruction)
+        moved = np.max(np.abs(updated - reconstruction))
+        reconstruction = updated
+        if moved <= tol * (hi - lo):
+            break
+    upper = np.append((reconstruction[:-1] + reconstruction[1:]) / 2, hi)
+    return upper, reconstruction
+
+
+class TableQuantizer:
+    """
+    Quantizer given by L upper decision edges and L reconstruction levels.
+    quantize() returns the same fields as UniformQuantizer.quantize:
+      - a sample on an edge goes to the lower interval
+      - interval_indices are the 1-based level of each sample
+      - quantized values and errors are rounded to 3 decimals
+    For packing, code_index is the level itself. delta is the nominal
+    (max - min) / L; the actual steps vary.
+    """
+
+    def __init__(self, min_value, max_value, upper, reconstruction, mode="table"):
+        self.mode = mode
+        self.min_value = float(min_value)
+        self.max_value = float(max_value)
+        self.upper = np.asarray(upper, dtype=float)
+        self.mid_points = np.asarray(reconstruction, dtype=float)
+        self.rounded_mid_points = np.array([round(m, 3) for m in self.mid_points.tolist()])
+        self.levels = L = len(self.mid_points)
+        self.delta = (self.max_value - self.min_value) / L
+        self.num_bits = num_bits_for(L)
+
+    def quantize(self, values):
+        x = np.asarray(values, dtype=float)
+        L = self.levels
+        level_index = np.minimum(np.searchsorted(self.upper, x, side="left"), L - 1)
+        q = self.mid_points[level_index]
+        quantized = self.rounded_mid_points[level_index]
+        errors = round3(q - x)
+        return {
+            "levels": L,
+            "delta": self.delta,
+            "min_value": self.min_value,
+            "mid_points": self.mid_points,
+            "level_index": level_index,
+            "code_index": level_index,
+            "interval_indices": level_index + 1,
+            "quantized": quantized,
+            "errors": errors,
+            "sampled_errors": round3(quantized - x),
+            "avg_error": mean_square(errors),
+            "num_bits": self.num_bits,
+            "mode": self.mode,
+        }
+
+
+def make_quantizer(values, mode="uniform", levels=None, bits=None, min_value=None, max_value=None, **params):
+    """
+    Quantizer of the given mode for values. The range defaults to
+    [min(values), max(values)]. params are mu / A for the companders, and
+    bins / max_iter for Lloyd-Max.
+    """
+    if mode not in QUANTIZER_MODES:
+        raise ValueError(f"mode must be one of {', '.join(QUANTIZER_MODES)}")
+    x = np.asarray(values, dtype=float)
+    if x.size == 0:
+        raise ValueError("Values list cannot be empty.")
+    lo = float(x.min()) if min_value is None else min_value
+    hi = float(x.max()) if max_value is None else max_value
+    if mode == "uniform":
+        return UniformQuantizer(lo, hi, levels, bits)
+    L = resolve_levels(levels, bits)
+    if mode == "lloyd-max":
+        upper, reconstruction = lloyd_max_tables(x, L, lo, hi, **params)
+    else:
+        param = params.get("mu" if mode == "mu-law" else "A")
+        upper, reconstruction = compander_tables(lo, hi, L, mode, param)
+    return TableQuantizer(lo, hi, upper, reconstruction, mode)
+
+
+def quantize_values(values, mode="uniform", levels=None, bits=None, **params):
+    """Quantize values in memory with any QUANTIZER_MODES quantizer."""
+    return make_quantizer(values, mode, levels, bits, **params).quantize(values)
+
+# ---- Packed bit-stream encoding ----
+# A 48-byte header followed by the level indices, num_bits each, MSB first,
+# packed back to back with np.packbits. Non-uniform quantizers store their
+# reconstruction levels as `table` float64 values between the two, since
+# min_value and delta cannot rebuild them; uniform streams have table = 0.
+PACKED_MAGIC = b"DSPQ"
+PACKED_HEADER_SIZE = 48
+_PACKED_HEADER = np.dtype([
+    ("magic", "S4"),
+    ("num_bits", "<u4"),
+    ("n", "<i8"),
+    ("levels", "<i8"),
+    ("min_value", "<f8"),
+    ("delta", "<f8"),
+    ("table", "<u4"),
+])
+# Samples per packing step; a multiple of 8 keeps every step byte-aligned
+_PACK_CHUNK = 1 << 20
+
+
+def _bit_matrix(code_index, num_bits):
+    shifts = np.arange(num_bits - 1, -1, -1, dtype=np.int64)
+    return ((np.asarray(code_index, dtype=np.int64)[:, None] >> shifts) & 1).astype(np.uint8)
+
+
+def _packed_header_bytes(n, levels, min_value, delta, table=0) -> bytes:
+    header = np.zeros(1, dtype=_PACKED_HEADER)
+    header["magic"] = PACKED_MAGIC
+    header["num_bits"] = num_bits_for(levels)
+    header["n"] = n
+    header["levels"] = levels
+    header["min_value"] = min_value
+    header["delta"] = delta
+    header["table"] = table
+    return header.tobytes().ljust(PACKED_HEADER_SIZE, b"\0")
+
+
+def pack_codes(code_index, levels, min_value=0.0, delta=0.0, table=None) -> bytes:
+    """
+    Pack level indices into a bit stream of num_bits per sample, with a
+    header. table holds the reconstruction levels of a non-uniform quantizer.
+    """
+    code_index = np.asarray(code_index)
+    num_bits = num_bits_for(levels)
+    table = np.empty(0) if table is None else np.asarray(table, dtype="<f8")
+    parts = [_packed_header_bytes(len(code_index), levels, min_value, delta, len(table)), table.tobytes()]
+    if num_bits:
+        for start in range(0, len(code_index), _PACK_CHUNK):
+            bits = _bit_matrix(code_index[start:start + _PACK_CHUNK], num_bits)
+            parts.append(np.packbits(bits.ravel()).tobytes())
+    return b"".join(parts)
+
+
+def pack_result(result) -> bytes:
+    """Packed bit stream of a quantize_uniform or quantize_values result."""
+    table = result["mid_points"] if result.get("mode", "uniform") != "uniform" else None
+    return pack_codes(result["code_index"], result["levels"], result["min_value"], result["delta"], table)
+
+
+def unpack_codes(data):
+    """Inverse of pack_codes: (header, level indices as int64)."""
+    header = np.frombuffer(data, dtype=_PACKED_HEADER, count=1)[0]
+    if header["magic"] != PACKED_MAGIC:
+        raise ValueError("Not a packed quantized signal")
+    n = int(header["n"])
+    num_bits = int(header["num_bits"])
+    if num_bits == 0:
+        return header, np.zeros(n, dtype=np.int64)
+
+    payload = np.frombuffer(data, dtype=np.uint8, offset=PACKED_HEADER_SIZE + 8 * int(header["table"]))
+    weights = 1 << np.arange(num_bits - 1, -1, -1, dtype=np.int64)
+    code_index = np.empty(n, dtype=np.int64)
+    step_bytes = _PACK_CHUNK * num_bits // 8
+    for i, start in enumerate(range(0, n, _PACK_CHUNK)):
+        count = min(_PACK_CHUNK, n - start)
+        chunk = payload[i * step_bytes:i * step_bytes + (count * num_bits + 7) // 8]
+        bits = np.unpackbits(chunk, count=count * num_bits).reshape(count, num_bits)
+        code_index[start:start + count] = bits @ weights
+    return header, code_index
+
+
+def decode_packed(data):
+    """Quantized values (rounded to 3 decimals, as quantize_uniform returns them) from a packed stream."""
+    header, code_index = unpack_codes(data)
+    if header["table"]:
+        mid_points = np.frombuffer(data, dtype="<f8", count=int(header["table"]), offset=PACKED_HEADER_SIZE)
+    else:
+        mid_points = uniform_mid_points(float(header["min_value"]), float(header["delta"]), int(header["levels"]))
+    return np.array([round(m, 3) for m in mid_points.tolist()])[code_index]
+
+
+def code_strings(code_index, num_bits):
+    """
+    '0'/'1' code strings for display or the QuanTest comparisons. Built on
+    demand from the level indices; the packed stream is the compact form.
+    """
+    if num_bits == 0:
+        # format(0, "00b") == "0", as the code table has always produced
+        return ["0"] * len(code_index)
+    chars = _bit_matrix(code_index, num_bits) + ord("0")
+    return chars.view(f"S{num_bits}").ravel().astype(str).tolist()
+
+
+# ---- Streaming quantization ----
+def scan_range(chunks):
+    """Cheap first pass: (min, max) of the values over a stream of (indices, values) chunks."""
+    lo, hi = np.inf, -np.inf
+    for _, values in chunks:
+        if len(values):
+            lo = min(lo, float(np.min(values)))
+            hi = max(hi, float(np.max(values)))
+    if lo > hi:
+        raise ValueError("Values list cannot be empty.")
+    return lo, hi
+
+
+class PackedWriter:
+    """
+    Write level indices to a packed stream file chunk by chunk. Up to 7 codes
+    are carried between writes so every flush is byte-aligned; the sample
+    count in the header is patched on close.
+    """
+
+    def __init__(self, path, quantizer):
+        self.quantizer = quantizer
+        self.n = 0
+        self._carry = np.empty(0, dtype=np.int64)
+        self._file = open(path, "wb")
+        self._file.write(self._header())
+
+    def _header(self):
+        q = self.quantizer
+        return _packed_header_bytes(self.n, q.levels, q.min_value, q.delta)
+
+    def write(self, code_index):
+        self.n += len(code_index)
+        if not self.quantizer.num_bits:
+            return
+        codes = np.concatenate((self._carry, code_index))
+        aligned = len(codes) // 8 * 8
+        if aligned:
+            bits = _bit_matrix(codes[:aligned], self.quantizer.num_bits)
+            self._file.write(np.packbits(bits.ravel()).tobytes())
+        self._carry = codes[aligned:]
+
+    def close(self):
+        if len(self._carry) and self.quantizer.num_bits:
+            bits = _bit_matrix(self._carry, self.quantizer.num_bits)
+            self._file.write(np.packbits(bits.ravel()).tobytes())
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StreamingQuantizer:
+    """
+    Quantize chunk by chunk over a fixed [min_value, max_value] range, keeping
+    running error statistics instead of the per-sample error list. On data
+    whose range matches, every chunk result equals the matching slice of
+    quantize_uniform over the whole signal.
+    """
+
+    def __init__(self, min_value, max_value, levels=None, bits=None):
+        self.quantizer = UniformQuantizer(min_value, max_value, levels, bits)
+        self.count = 0
+        self.sum_sq_error = 0.0
+        self.max_abs_error = 0.0
+
+    def quantize_chunk(self, values):
+        result = self.quantizer.quantize(values)
+        errors = result["errors"]
+        if len(errors):
+            self.count += len(errors)
+            # Continue the left-to-right sum, so the MSE equals the in-memory avg_error exactly
+            self.sum_sq_error = float(np.add.accumulate(np.concatenate(([self.sum_sq_error], errors * errors)))[-1])
+            self.max_abs_error = max(self.max_abs_error, float(np.max(np.abs(errors))))
+        return result
+
+    @property
+    def avg_error(self) -> float:
+        """Running MSE of the (rounded) errors, like quantize_and_encode's avg_error."""
+        return self.sum_sq_error / self.count if self.count else 0.0
+
+
+def quantize_file(path, levels=None, bits=None, min_value=None, max_value=None,
+                  out_path=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Quantize a signal file without loading it. With min_value and max_value
+    given this is a single pass (fixed-range mode); otherwise a first pass
+    scans the file for its range (two-pass mode). The packed codes go to
+    out_path if given. Returns the summary statistics. progress(fraction),
+    if given, is called after every chunk of either pass and may raise to stop.
+    """
+    scan_progress = quantize_progress = progress
+    if progress and (min_value is None or max_value is None):
+        scan_progress = lambda fraction: progress(fraction / 2)
+        quantize_progress = lambda fraction: progress(0.5 + fraction / 2)
+
+    if min_value is None or max_value is None:
+        lo, hi = scan_range(stream_signal(path, chunk_size, progress=scan_progress))
+        min_value = lo if min_value is None else min_value
+        max_value = hi if max_value is None else max_value
+
+    stream = StreamingQuantizer(min_value, max_value, levels, bits)
+    writer = PackedWriter(out_path, stream.quantizer) if out_path else None
+    try:
+        for _, values in stream_signal(path, chunk_size, progress=quantize_progress):
+            result = stream.quantize_chunk(values)
+            if writer:
+                writer.write(result["code_index"])
+    finally:
+        if writer:
+            writer.close()
+
+    q = stream.quantizer
+    return {
+        "levels": q.levels,
+        "delta": q.delta,
+        "min_value": q.min_value,
+        "max_value": q.max_value,
+        "n": stream.count,
+        "avg_error": stream.avg_error,
+        "max_abs_error": stream.max_abs_error,
+    }
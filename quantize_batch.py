@@ -0,0 +1,113 @@
+"""
+Headless batch quantization of a directory of signal files.
+
+    python quantize_batch.py signals/ --bits 4 --out quantized/
+    python quantize_batch.py "Test 2" --levels 4 --verbose --check "Test 2/Quan2_Out.txt"
+    python quantize_batch.py signals/ --bits 4 --mode lloyd-max
+
+Every matching file is quantized in a worker process (one per core by
+default) and written as a packed bit stream (<name>.qbin) that
+quantization.decode_packed reads back. Uniform quantization streams each
+file; the non-uniform modes fit their tables to the whole signal, so they
+load it.
+"""
+import argparse
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from quantization import QUANTIZER_MODES, pack_result, quantize_file, quantize_values
+from signal_io import load_signal
+
+PACKED_EXTENSION = ".qbin"
+
+
+def quantize_one(path, out_path, levels=None, bits=None, verbose=False, test_file=None, mode="uniform"):
+    """Quantize one signal file into out_path and return a summary dict."""
+    start = time.perf_counter()
+    if verbose or test_file or mode != "uniform":
+        # The per-sample lists or the whole signal are needed: quantize in memory
+        _, signal = load_signal(path)
+        values = signal.values
+        if verbose or test_file:
+            # Printing and the QuanTest2 check live in Task3, which also imports the GUI
+            from Task3 import quantize_and_encode
+            result = quantize_and_encode(values, levels=levels, bits=bits, verbose=verbose,
+                                         test_file=test_file, mode=mode)
+            packed = result["packed"]
+        else:
+            result = quantize_values(values, mode, levels=levels, bits=bits)
+            packed = pack_result(result)
+        with open(out_path, "wb") as f:
+            f.write(packed)
+        summary = {"levels": result["levels"], "delta": result["delta"],
+                   "n": len(values), "avg_error": result["avg_error"]}
+    else:
+        summary = quantize_file(path, levels=levels, bits=bits, out_path=out_path)
+    summary.update(path=path, output=out_path, seconds=time.perf_counter() - start)
+    return summary
+
+
+def quantize_directory(input_dir, output_dir=None, levels=None, bits=None, pattern="*.txt",
+                       workers=None, verbose=False, test_file=None, mode="uniform"):
+    """
+    Quantize every file matching pattern in input_dir across a process pool.
+    Returns one summary dict per file, in file name order; a file that fails
+    gets an "error" entry instead of stopping the batch.
+    """
+    if not levels and not bits:
+        raise ValueError("Specify either number of levels or number of bits.")
+    output_dir = output_dir or input_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = sorted(glob.glob(os.path.join(input_dir, pattern)))
+    jobs = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            out_path = os.path.join(output_dir, name + PACKED_EXTENSION)
+            jobs[path] = pool.submit(quantize_one, path, out_path, levels, bits, verbose, test_file, mode)
+
+    summaries = []
+    for path, job in jobs.items():
+        try:
+            summaries.append(job.result())
+        except Exception as e:
+            summaries.append({"path": path, "error": str(e)})
+    return summaries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantize a directory of signal files")
+    parser.add_argument("input_dir")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--levels", type=int)
+    group.add_argument("--bits", type=int)
+    parser.add_argument("--out", dest="output_dir", help="output directory (default: input_dir)")
+    parser.add_argument("--pattern", default="*.txt")
+    parser.add_argument("--mode", choices=QUANTIZER_MODES, default="uniform", help="quantizer (default: uniform)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--verbose", action="store_true", help="print the per-sample lists")
+    parser.add_argument("--check", dest="test_file", help="QuanTest2 expected-output file to compare against")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summaries = quantize_directory(args.input_dir, args.output_dir, args.levels, args.bits,
+                                   args.pattern, args.workers, args.verbose, args.test_file, args.mode)
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    for s in summaries:
+        if "error" in s:
+            failed += 1
+            print(f"FAILED {s['path']}: {s['error']}")
+        else:
+            print(f"{s['path']} -> {s['output']}: n={s['n']} L={s['levels']} "
+                  f"MSE={s['avg_error']:.6f} ({s['seconds']:.3f} s)")
+    print(f"{len(summaries) - failed}/{len(summaries)} files quantized in {elapsed:.3f} s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+"""
+Rational-ratio sample rate conversion with a polyphase anti-aliasing filter.
+
+    up, down = rational_ratio(fs_in=44100, fs_out=48000)      # (160, 147)
+    y = resample_values(x, up, down)
+    indices, values = resample_signal(task1_signal, up, down)
+    resample_file("long.sigb", "long_48k.sigb", up, down)
+
+Conceptually the input is upsampled by inserting up - 1 zeros between
+samples, lowpass filtered, then every down-th sample is kept. The
+polyphase form never builds the upsampled signal. Each output sample is
+one dot product of K input samples with one of the up phases (rows) of
+the filter bank, where K = ceil(len(h) / up).
+
+The filter is a Kaiser-windowed sinc with the same defaults as
+scipy.signal.resample_poly:
+  - cutoff at the lower of the two Nyquist rates
+  - 10 zero crossings on each side at the slower rate
+  - beta = 5
+  - gain up, so a constant input stays constant
+It is symmetric and delay-compensated, so output sample m lies at input
+time m * down / up and the output has ceil(n * up / down) samples. Banks
+are cached per (up, down, zeros, beta).
+
+Resampler keeps its input history between process() calls, so long inputs
+can be converted chunk by chunk. flush() emits the final samples.
+"""
+from fractions import Fraction
+from functools import lru_cache
+
+import numpy as np
+
+from convolution import _dense
+from signal_io import (BINARY_EXTENSION, DEFAULT_CHUNK_SIZE, open_signal_bin, read_signal_header,
+                       stream_signal, write_stream)
+
+DEFAULT_ZEROS = 10
+DEFAULT_BETA = 5.0
+
+
+def rational_ratio(fs_in, fs_out, max_denominator=1000):
+    """(up, down) with up / down == fs_out / fs_in, approximated if needed so that down <= max_denominator."""
+    if fs_in <= 0 or fs_out <= 0:
+        raise ValueError("Sampling rates must be positive")
+    ratio = Fraction(fs_out / fs_in).limit_denominator(max_denominator)
+    return ratio.numerator, ratio.denominator
+
+
+def design_filter(up, down, zeros=DEFAULT_ZEROS, beta=DEFAULT_BETA):
+    """Lowpass taps at the upsampled rate, cut off at the lower Nyquist rate, with DC gain up."""
+    rate = max(up, down)
+    half = zeros * rate
+    n = np.arange(-half, half + 1)
+    h = np.sinc(n / rate) * np.kaiser(len(n), beta)
+    return h * (up / h.sum())
+
+
+@lru_cache(maxsize=32)
+def filter_bank(up, down, zeros=DEFAULT_ZEROS, beta=DEFAULT_BETA):
+    """
+    (bank, delay): bank[p] holds taps p, p + up, p + 2 up, ... reversed so it
+    dots with input samples in time order. delay is the filter's group delay
+    at the upsampled rate. The returned array is shared and read-only.
+    """
+    h = design_filter(up, down, zeros, beta)
+    taps = -(-len(h) // up)
+    padded = np.zeros(taps * up)
+    padded[:len(h)] = h
+    bank = np.ascontiguousarray(padded.reshape(taps, up).T[:, ::-1])
+    bank.flags.writeable = False
+    return bank, (len(h) - 1) // 2
+
+
+class Resampler:
+    """Streaming polyphase resampler by up / down."""
+
+    def __init__(self, up, down, zeros=DEFAULT_ZEROS, beta=DEFAULT_BETA):
+        if up < 1 or down < 1:
+            raise ValueError("up and down must be positive integers")
+        g = np.gcd(up, down)
+        self.up, self.down = up // g, down // g
+        self.bank, self.delay = filter_bank(self.up, self.down, zeros, beta)
+        self.reset()
+
+    def reset(self):
+        taps = self.bank.shape[1]
+        # Input history, left-padded with taps - 1 zeros; _buffer[0] is padded sample _start
+        self._buffer = np.zeros(taps - 1)
+        self._start = 0
+        self._next = 0
+        self.samples_in = 0
+
+    def output_length(self, n):
+        return -(-n * self.up // self.down)
+
+    def process(self, values):
+        """Feed input samples; returns every output sample they complete."""
+        values = np.asarray(values, dtype=float)
+        self._buffer = np.concatenate((self._buffer, values))
+        self.samples_in += len(values)
+        taps = self.bank.shape[1]
+        # Last output whose window ends inside the buffer
+        available = self._start + len(self._buffer)
+        last = ((available - taps + 1) * self.up - 1 - self.delay) // self.down
+        return self._emit(min(last + 1, self.output_length(self.samples_in)))
+
+    def flush(self):
+        """Emit the remaining output samples, treating the input as zero past its end, and reset."""
+        taps = self.bank.shape[1]
+        self._buffer = np.concatenate((self._buffer, np.zeros(taps + self.delay // self.up + 1)))
+        out = self._emit(self.output_length(self.samples_in))
+        self.reset()
+        return out
+
+    def _emit(self, stop):
+        first = self._next
+        if stop <= first:
+            return np.empty(0)
+        taps = self.bank.shape[1]
+        windows = np.lib.stride_tricks.sliding_window_view(self._buffer, taps)
+        out = np.empty(stop - first)
+        # Outputs m, m + up, m + 2 up, ... share a phase and step down input samples apart
+        for offset in range(min(self.up, len(out))):
+            n = (first + offset) * self.down + self.delay
+            count = len(range(offset, len(out), self.up))
+            start = n // self.up - self._start
+            rows = windows[start:start + (count - 1) * self.down + 1:self.down]
+            out[offset::self.up] = rows @ self.bank[n % self.up]
+
+        self._next = stop
+        # Drop input no later output can reach
+        keep_from = (stop * self.down + self.delay) // self.up - self._start
+        if keep_from > 0:
+            self._buffer = self._buffer[keep_from:]
+            self._start += keep_from
+        return out
+
+
+def resample_values(values, up, down, **kwargs):
+    """Resample a whole array by up / down; ceil(len(values) * up / down) samples."""
+    resampler = Resampler(up, down, **kwargs)
+    return np.concatenate((resampler.process(values), resampler.flush()))
+
+
+def resample_signal(signal, up, down, **kwargs):
+    """
+    Resample a Task1 signal (indices, values) by up / down. Missing samples
+    count as zero. The first output sample is the first input sample, and
+    the following ones are numbered on from it at the new rate. That first
+    index is first * up // down, floored. When down does not divide
+    first * up, the label is earlier than the exact position by less than
+    one output sample. For example, first = -3 at 1/2 is labelled -2, not -1.5.
+    """
+    first, values = _dense(signal)
+    out = resample_values(values, up, down, **kwargs)
+    start = first * up // down
+    return np.arange(start, start + len(out)), out
+
+
+def resample_generated(t, y, fs_in, fs_out, max_denominator=1000):
+    """
+    Resample a generated discrete signal (t, y) sampled at fs_in to about
+    fs_out. Returns (t, y, fs), where fs is the exact rate reached.
+    """
+    up, down = rational_ratio(fs_in, fs_out, max_denominator)
+    fs = fs_in * up / down
+    out = resample_values(y, up, down)
+    return t[0] + np.arange(len(out)) / fs, out, fs
+
+
+def stream_resample(chunks, resampler, start_index=0):
+    """Resample a stream of (indices, values) chunks; output indices count on from start_index."""
+    resampler.reset()
+    index = start_index
+    for _, values in chunks:
+        out = resampler.process(values)
+        if len(out):
+            yield np.arange(index, index + len(out)), out
+            index += len(out)
+    out = resampler.flush()
+    if len(out):
+        yield np.arange(index, index + len(out)), out
+
+
+def resample_file(in_path, out_path, up, down, chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """
+    Resample a .txt or .sigb signal file into out_path in bounded memory.
+    The input is taken as consecutive samples from its first index. Returns
+    the number of samples written.
+    """
+    if in_path.endswith(BINARY_EXTENSION):
+        header, sig = open_signal_bin(in_path)
+        first = int(sig[0][0]) if header.n else 0
+    else:
+        with open(in_path, "r") as f:
+            header = read_signal_header(f)
+            line = f.readline().split()
+            first = int(float(line[0])) if line else 0
+    chunks = stream_resample(stream_signal(in_path, chunk_size), Resampler(up, down, **kwargs),
+                             start_index=first * up // down)
+    return write_stream(out_path, chunks, header.signal_type, header.periodic)
@@ -0,0 +1,151 @@
+"""
+Lazy expressions over Task1 signals.
+
+    a, b = SignalExpr.of(sig_a), SignalExpr.of(sig_b)
+    indices, values = (a * 5 - b).shift(3, "delay").fold().evaluate()
+
+Nothing is computed until evaluate(). The graph is then flattened into a sum
+of terms coef * x(sign * n + offset): shifts and folds become index
+arithmetic, scalar multiplies become term coefficients, and all terms are
+combined in a single merge at the end.
+"""
+from collections import namedtuple
+import numpy as np
+
+from Task1 import add_signals
+from signal_model import Signal
+
+# Term: sample i of source, scaled by coef, lands at output index sign * i + offset
+Term = namedtuple("Term", ["coef", "sign", "offset", "source"])
+
+
+class SignalExpr:
+    __slots__ = ()
+
+    @staticmethod
+    def of(signal):
+        """Wrap a Signal or an (indices, values) pair as a leaf expression."""
+        return _Leaf(signal)
+
+    def __add__(self, other):
+        return _Sum([(1.0, self), (1.0, other)])
+
+    def __sub__(self, other):
+        return _Sum([(1.0, self), (-1.0, other)])
+
+    def __mul__(self, constant):
+        return _Sum([(float(constant), self)])
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return _Sum([(-1.0, self)])
+
+    def shift(self, k, method="delay"):
+        """Same convention as Task1.shifting_signal: delay adds k, advance subtracts k."""
+        if method not in ("delay", "advance"):
+            raise ValueError("Method must be 'advance' or 'delay'")
+        return _Shift(self, k if method == "delay" else -k)
+
+    def fold(self):
+        return _Fold(self)
+
+    def terms(self):
+        """Flatten the graph into a list of Terms, merging duplicates of the same source."""
+        merged = {}
+        for term in self._terms(1.0, 1, 0):
+            key = (id(term.source), term.sign, term.offset)
+            if key in merged:
+                prev = merged[key]
+                merged[key] = prev._replace(coef=prev.coef + term.coef)
+            else:
+                merged[key] = term
+        # Zero-coefficient terms are kept: their indices still belong to the result
+        return list(merged.values())
+
+    def evaluate(self):
+        """Compute the expression as (indices, values) with sorted indices."""
+        terms = self.terms()
+        if all(isinstance(t.source, Signal) and t.source.is_dense for t in terms):
+            return _evaluate_dense(terms)
+
+        parts = []
+        for coef, sign, offset, source in terms:
+            indices, values = source
+            parts.append((sign * np.asarray(indices) + offset, coef * np.asarray(values, dtype=float)))
+        return add_signals(parts)
+
+
+class _Leaf(SignalExpr):
+    __slots__ = ("signal",)
+
+    def __init__(self, signal):
+        self.signal = signal
+
+    def _terms(self, coef, sign, offset):
+        return [Term(coef, sign, offset, self.signal)]
+
+
+class _Sum(SignalExpr):
+    __slots__ = ("children",)
+
+    def __init__(self, children):
+        self.children = children
+
+    def _terms(self, coef, sign, offset):
+        out = []
+        for child_coef, child in self.children:
+            out.extend(child._terms(coef * child_coef, sign, offset))
+        return out
+
+
+class _Shift(SignalExpr):
+    __slots__ = ("child", "k")
+
+    def __init__(self, child, k):
+        self.child = child
+        self.k = k
+
+    def _terms(self, coef, sign, offset):
+        # y(n) = x(n - k) seen through the outer map n -> sign * n + offset
+        return self.child._terms(coef, sign, offset + sign * self.k)
+
+
+class _Fold(SignalExpr):
+    __slots__ = ("child",)
+
+    def __init__(self, child):
+        self.child = child
+
+    def _terms(self, coef, sign, offset):
+        # Outer map applied to -n
+        return self.child._terms(coef, -sign, offset)
+
+
+def _evaluate_dense(terms):
+    # Every source is a contiguous Signal: add reversed/offset views into one buffer
+    spans = []
+    for coef, sign, offset, source in terms:
+        if sign == 1:
+            lo = source.start_index + offset
+        else:
+            lo = -(source.end_index - 1) + offset
+        spans.append((lo, lo + source.size))
+
+    lo = min(s[0] for s in spans)
+    hi = max(s[1] for s in spans)
+    out = np.zeros(hi - lo)
+    covered = np.zeros(hi - lo, dtype=bool)
+    for (coef, sign, _, source), (start, end) in zip(terms, spans):
+        view = source.values if sign == 1 else source.values[::-1]
+        target = out[start - lo:end - lo]
+        if coef == 1.0:
+            target += view
+        else:
+            target += coef * view
+        covered[start - lo:end - lo] = True
+
+    if covered.all():
+        return np.arange(lo, hi), out
+    positions = np.flatnonzero(covered)
+    return positions + lo, out[positions]
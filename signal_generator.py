@@ -0,0 +1,201 @@
+from dataclasses import dataclass
+import numpy as np
+import math
+
+
+@dataclass
+class SignalSpec:
+    enabled: bool = False
+    kind: str = "sine"
+    A: float = 1.0
+    phase_deg: float = 0.0
+    f_analog: float = 5.0
+    fs: float = 100.0
+    duration: float = 1.0
+    representation: str = "continuous"
+    label: str = "Signal"
+
+    def phase_rad(self) -> float:
+        return math.radians(self.phase_deg)
+
+    def frozen(self) -> "FrozenSpec":
+        return FrozenSpec.from_spec(self)
+
+
+@dataclass(frozen=True)
+class FrozenSpec:
+    """Hashable snapshot of the parameters that determine a waveform."""
+    kind: str
+    A: float
+    phase_deg: float
+    f_analog: float
+    fs: float
+    duration: float
+    representation: str
+
+    @classmethod
+    def from_spec(cls, spec: SignalSpec):
+        # fs does not affect the continuous display grid, so it is left out of the key
+        fs = spec.fs if spec.representation != 'continuous' else None
+        return cls(spec.kind, float(spec.A), float(spec.phase_deg), float(spec.f_analog),
+                   fs, float(spec.duration), spec.representation)
+
+    def phase_rad(self) -> float:
+        return math.radians(self.phase_deg)
+
+
+# Upper bound on elements evaluated per broadcast step, to cap temporaries
+_BLOCK_ELEMENTS = 1 << 22
+
+
+def time_grid(spec: SignalSpec):
+    """Sample times of a spec: a dense grid for continuous display, n / fs for discrete."""
+    if spec.representation == 'continuous':
+        num_pts = max(1000, int(2000 * spec.duration))
+        return np.linspace(0, spec.duration, num_pts)
+    if spec.fs <= 0:
+        raise ValueError(f'Sampling frequency fs must be positive for discrete representation. Current value: {spec.fs} Hz')
+    return np.arange(0, spec.duration, 1.0 / spec.fs)
+
+
+def _grid_key(spec: SignalSpec):
+    if spec.representation == 'continuous':
+        return ('continuous', spec.duration)
+    return ('discrete', spec.duration, spec.fs)
+
+
+def evaluate_on_grid(specs, t, dtype=np.float64, out=None):
+    """
+    Evaluate A * trig(2*pi*f*t + phase) for every spec on one shared time grid,
+    as a (len(specs), len(t)) array. Rows are computed with broadcasted NumPy
+    calls, one for the sines and one for the cosines, in blocks that keep the
+    float64 temporaries bounded. Results can be written into a preallocated
+    out= buffer and/or returned as float32.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if out is None:
+        out = np.empty((len(specs), len(t)), dtype=dtype)
+    elif out.shape != (len(specs), len(t)):
+        raise ValueError(f"out must have shape {(len(specs), len(t))}, got {out.shape}")
+
+    amplitude = np.array([s.A for s in specs], dtype=np.float64)
+    omega = np.array([2 * np.pi * s.f_analog for s in specs], dtype=np.float64)
+    phase = np.array([s.phase_rad() for s in specs], dtype=np.float64)
+    is_sine = np.array([s.kind == 'sine' for s in specs], dtype=bool)
+
+    rows_per_block = max(1, _BLOCK_ELEMENTS // max(1, len(t)))
+    for trig, rows in ((np.sin, np.flatnonzero(is_sine)), (np.cos, np.flatnonzero(~is_sine))):
+        for start in range(0, len(rows), rows_per_block):
+            block = rows[start:start + rows_per_block]
+            # Same operation order as the per-spec path: (2*pi*f) * t + phase
+            arg = np.multiply.outer(omega[block], t)
+            arg += phase[block, None]
+            trig(arg, out=arg)
+            arg *= amplitude[block, None]
+            out[block] = arg
+    return out
+
+
+def generate_batch(specs, t=None, dtype=np.float64, out=None):
+    """
+    Generate many signals at once.
+
+    With a shared grid t, returns the (len(specs), len(t)) array from
+    evaluate_on_grid. Without one, each spec uses its own time_grid(); specs
+    sharing a grid are evaluated together, and a list of (t, y, discrete)
+    tuples is returned in spec order.
+    """
+    if t is not None:
+        return evaluate_on_grid(specs, t, dtype=dtype, out=out)
+    if out is not None:
+        raise ValueError("out= needs a shared time grid t")
+
+    groups = {}
+    for i, spec in enumerate(specs):
+        groups.setdefault(_grid_key(spec), []).append(i)
+
+    results = [None] * len(specs)
+    for key, members in groups.items():
+        grid = time_grid(specs[members[0]])
+        block = evaluate_on_grid([specs[i] for i in members], grid, dtype=dtype)
+        discrete = key[0] == 'discrete'
+        for row, i in enumerate(members):
+            results[i] = (grid, block[row], discrete)
+    return results
+
+
+def generate(spec: SignalSpec, dtype=np.float64):
+    """One signal as (t, y, discrete), as task2.SignalApp.generate_signal returns it."""
+    t = time_grid(spec)
+    y = evaluate_on_grid([spec], t, dtype=dtype)[0]
+    return t, y, spec.representation != 'continuous'
+
+
+def _num_samples(spec: SignalSpec) -> int:
+    # Length np.arange(0, duration, 1 / fs) would have
+    if spec.fs <= 0:
+        raise ValueError(f'Sampling frequency fs must be positive for discrete representation. Current value: {spec.fs} Hz')
+    return max(0, math.ceil(spec.duration / (1.0 / spec.fs)))
+
+
+def iter_signal_blocks(spec: SignalSpec, block_size=1 << 16, method="phasor"):
+    """
+    Lazily yield a discrete signal as (t, y) blocks of block_size samples,
+    without materializing the full time axis.
+
+    method="phasor" avoids a transcendental call per sample. A rotation table
+    sin/cos(w*m/fs), m < block_size, is computed once. Each block then
+    re-anchors at its exact first sample n0 and combines the table with the
+    anchor angle theta0 = 2*pi*f*t[n0] + phase by angle addition:
+
+        A*sin(theta0 + w*m/fs) = (A*cos theta0)*sin(w*m/fs) + (A*sin theta0)*cos(w*m/fs)
+
+    Since every block restarts from an exactly computed anchor, no error
+    accumulates across blocks. Take u = 2**-53 and theta_max as the largest
+    phase 2*pi*f*t + phase reached. Against an exact evaluation of
+    A*sin(w*n/fs + phase), with the same float64 w and 1/fs, every sample is
+    within |A| * (2*theta_max + w*block_size/fs + 4) * u. The direct np.sin
+    path has the same order of error, because rounding its argument costs
+    about theta_max * u. Both grow with the phase, not with the number of
+    blocks.
+
+    method="direct" evaluates np.sin/np.cos per block, for comparison.
+    """
+    n = _num_samples(spec)
+    step = 1.0 / spec.fs
+    omega = 2 * np.pi * spec.f_analog
+    phase = spec.phase_rad()
+    is_sine = spec.kind == 'sine'
+
+    if method == "phasor":
+        table_arg = omega * (np.arange(min(block_size, n)) * step)
+        table_sin = np.sin(table_arg)
+        table_cos = np.cos(table_arg)
+    elif method != "direct":
+        raise ValueError("method must be 'phasor' or 'direct'")
+
+    for n0 in range(0, n, block_size):
+        count = min(block_size, n - n0)
+        t = np.arange(n0, n0 + count) * step
+        if method == "direct":
+            arg = omega * t + phase
+            y = spec.A * (np.sin(arg) if is_sine else np.cos(arg))
+        else:
+            theta0 = omega * (n0 * step) + phase
+            c = spec.A * math.cos(theta0)
+            s = spec.A * math.sin(theta0)
+            if is_sine:
+                y = c * table_sin[:count] + s * table_cos[:count]
+            else:
+                y = c * table_cos[:count] - s * table_sin[:count]
+        yield t, y
+
+
+def sample_range(spec: SignalSpec, first, last):
+    """Samples first..last-1 of a discrete signal, equal to generate(spec)[1][first:last]."""
+    # arange(0, duration, step)[n] is n * step, so the same float64 operations are repeated here
+    t = np.arange(first, last) * (1.0 / spec.fs)
+    arg = (2 * np.pi * spec.f_analog) * t
+    arg += spec.phase_rad()
+    trig = np.sin if spec.kind == 'sine' else np.cos
+    return spec.A * trig(arg)
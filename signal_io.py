@@ -0,0 +1,389 @@
+from collections import namedtuple
+import os
+import shutil
+import tempfile
+import numpy as np
+from signal_model import Signal
+
+
+# Signal .txt files start with 3 header lines: signal type, periodic flag, N
+SIGNAL_HEADER_LINES = 3
+
+SignalHeader = namedtuple("SignalHeader", ["signal_type", "periodic", "n"])
+
+
+def read_signal_header(f) -> SignalHeader:
+    """Read the 3-line header from an open signal file, leaving f at the first sample."""
+    fields = []
+    for _ in range(SIGNAL_HEADER_LINES):
+        line = f.readline()
+        if not line:
+            raise ValueError("Signal file is missing its 3-line header")
+        fields.append(int(float(line.strip())))
+    return SignalHeader(*fields)
+
+
+def read_signal_file(path):
+    """
+    Read a signal .txt file into (header, indices, values).
+
+    The sample count from the header bounds the parse, and the whole body is
+    handed to NumPy's C parser in one np.loadtxt call (given the path rather
+    than an open handle, which is measurably faster). Nothing is
+    preallocated from N. Chunked parses into preallocated arrays, and
+    np.fromstring on the body, both measured 1.5-2x slower than this single
+    call. Integer index columns come back as int64 and both columns are
+    returned as contiguous arrays.
+    """
+    with open(path, "r") as f:
+        header = read_signal_header(f)
+
+    if header.n <= 0:
+        return header, np.empty(0, dtype=np.int64), np.empty(0)
+
+    block = np.loadtxt(path, skiprows=SIGNAL_HEADER_LINES, max_rows=header.n, ndmin=2)
+    indices = np.ascontiguousarray(block[:, 0])
+    values = np.ascontiguousarray(block[:, 1])
+
+    int_indices = indices.astype(np.int64)
+    if np.array_equal(int_indices, indices):
+        indices = int_indices
+    return header, indices, values
+
+
+# ---- Binary companion format (.sigb) ----
+# A fixed 64-byte header, then either the float64 samples alone (dense signals,
+# indices are start_index + arange(n)) or n indices followed by n float64 samples.
+BINARY_EXTENSION = ".sigb"
+BINARY_MAGIC = b"DSPSIGB1"
+BINARY_HEADER_SIZE = 64
+
+INDEX_DENSE = 0
+INDEX_INT64 = 1
+INDEX_FLOAT64 = 2
+
+_BINARY_HEADER = np.dtype([
+    ("magic", "S8"),
+    ("signal_type", "<i4"),
+    ("periodic", "<i4"),
+    ("n", "<i8"),
+    ("index_kind", "<i4"),
+    ("reserved", "<i4"),
+    ("start_index", "<i8"),
+])
+
+
+def binary_path_for(path):
+    """Companion binary file name for a signal .txt file."""
+    return os.path.splitext(path)[0] + BINARY_EXTENSION
+
+
+def binary_header_bytes(signal_type, periodic, n, index_kind, start_index=0) -> bytes:
+    header = np.zeros(1, dtype=_BINARY_HEADER)
+    header["magic"] = BINARY_MAGIC
+    header["signal_type"] = signal_type
+    header["periodic"] = periodic
+    header["n"] = n
+    header["index_kind"] = index_kind
+    header["start_index"] = start_index
+    return header.tobytes().ljust(BINARY_HEADER_SIZE, b"\0")
+
+
+def write_signal_bin(path, indices, values, signal_type=0, periodic=0):
+    indices = np.asarray(indices)
+    values = np.asarray(values, dtype="<f8")
+    n = len(values)
+
+    int_indices = indices.astype(np.int64)
+    if np.array_equal(int_indices, indices):
+        if n and np.all(np.diff(int_indices) == 1):
+            index_kind, start_index, index_data = INDEX_DENSE, int(int_indices[0]), None
+        else:
+            index_kind, start_index, index_data = INDEX_INT64, 0, int_indices.astype("<i8")
+    else:
+        index_kind, start_index, index_data = INDEX_FLOAT64, 0, indices.astype("<f8")
+
+    with open(path, "wb") as f:
+        f.write(binary_header_bytes(signal_type, periodic, n, index_kind, start_index))
+        if index_data is not None:
+            f.write(index_data.tobytes())
+        f.write(values.tobytes())
+
+
+def open_signal_bin(path):
+    """
+    Open a .sigb file as (header, Signal) without reading the samples: the
+    values (and indices of sparse signals) are read-only np.memmap views that
+    page in lazily.
+    """
+    raw = np.fromfile(path, dtype=_BINARY_HEADER, count=1)
+    if len(raw) == 0 or raw["magic"][0] != BINARY_MAGIC:
+        raise ValueError(f"{os.path.basename(path)} is not a signal binary file")
+    raw = raw[0]
+    header = SignalHeader(int(raw["signal_type"]), int(raw["periodic"]), int(raw["n"]))
+    n = header.n
+    index_kind = int(raw["index_kind"])
+
+    if n == 0:
+        return header, Signal(np.empty(0), start_index=int(raw["start_index"]))
+
+    if index_kind == INDEX_DENSE:
+        values = np.memmap(path, dtype="<f8", mode="r", offset=BINARY_HEADER_SIZE, shape=(n,))
+        return header, Signal(values, start_index=int(raw["start_index"]))
+
+    index_dtype = "<i8" if index_kind == INDEX_INT64 else "<f8"
+    indices = np.memmap(path, dtype=index_dtype, mode="r", offset=BINARY_HEADER_SIZE, shape=(n,))
+    values = np.memmap(path, dtype="<f8", mode="r", offset=BINARY_HEADER_SIZE + 8 * n, shape=(n,))
+    return header, Signal(values, indices=indices)
+
+
+def read_signal_bin(path):
+    """Same return value as read_signal_file, from a .sigb file."""
+    header, signal = open_signal_bin(path)
+    return header, signal.indices, signal.values
+
+
+def txt_to_bin(txt_path, bin_path=None):
+    bin_path = bin_path or binary_path_for(txt_path)
+    header, indices, values = read_signal_file(txt_path)
+    write_signal_bin(bin_path, indices, values, header.signal_type, header.periodic)
+    return bin_path
+
+
+def write_signal_txt(path, indices, values, signal_type=0, periodic=0):
+    indices = np.asarray(indices)
+    index_fmt = "%d" if np.issubdtype(indices.dtype, np.integer) else "%.10g"
+    with open(path, "w") as f:
+        f.write(f"{signal_type}\n{periodic}\n{len(values)}\n")
+        np.savetxt(f, np.column_stack([indices, values]), fmt=[index_fmt, "%.10g"])
+
+
+def bin_to_txt(bin_path, txt_path):
+    header, indices, values = read_signal_bin(bin_path)
+    write_signal_txt(txt_path, indices, values, header.signal_type, header.periodic)
+    return txt_path
+
+
+def fresh_binary_path(txt_path):
+    """The companion .sigb of txt_path if it exists and is at least as new, else None."""
+    bin_path = binary_path_for(txt_path)
+    if not os.path.exists(bin_path):
+        return None
+    if os.path.exists(txt_path) and os.path.getmtime(bin_path) < os.path.getmtime(txt_path):
+        return None
+    return bin_path
+
+
+def load_signal(path, progress=None, through=None):
+    """
+    Load a signal file as (header, Signal). A .sigb path, or a .txt with a
+    fresh companion .sigb, is memory-mapped instead of parsed. Given a
+    progress(fraction) callback, a .txt is parsed in chunks and progress is
+    called after each one; it may raise to abandon the load. Given
+    through(chunks, path, n), the parsed chunks are passed through the
+    stream it returns, e.g. PyramidBuilder.feed.
+    """
+    if not path.endswith(BINARY_EXTENSION):
+        path = fresh_binary_path(path) or path
+    if path.endswith(BINARY_EXTENSION):
+        return open_signal_bin(path)
+    if progress is None and through is None:
+        header, indices, values = read_signal_file(path)
+    else:
+        header = signal_file_header(path)
+        chunks = _txt_chunks(path, DEFAULT_CHUNK_SIZE, progress)
+        if through is not None:
+            chunks = through(chunks, path, header.n)
+        indices, values = collect_stream(chunks)
+        indices = _index_array(indices)
+    return header, Signal.from_arrays(indices, values)
+
+
+def signal_file_header(path) -> SignalHeader:
+    """Header of a .txt or .sigb signal file, without reading its samples."""
+    if path.endswith(BINARY_EXTENSION):
+        return open_signal_bin(path)[0]
+    with open(path, "r") as f:
+        return read_signal_header(f)
+
+
+# ---- Chunked reading and writing ----
+# Streams are generators of (indices, values) chunks in file order; signal_stream
+# builds the Task1 operations on top of them. Readers take an optional
+# progress(fraction) callback, called after each chunk; raising from it (as
+# TaskHandle.report does once cancelled) stops the read.
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def _index_array(column):
+    int_column = column.astype(np.int64)
+    return int_column if np.array_equal(int_column, column) else column
+
+
+def _binary_chunks(path, chunk_size, reverse, progress=None):
+    _, signal = open_signal_bin(path)
+    n = signal.size
+    starts = range(0, n, chunk_size)
+    if reverse:
+        starts = reversed(starts)
+    for lo in starts:
+        hi = min(lo + chunk_size, n)
+        if signal.is_dense:
+            indices = np.arange(signal.start_index + lo, signal.start_index + hi)
+        else:
+            indices = np.array(signal.indices[lo:hi])
+        values = np.array(signal.values[lo:hi])
+        if reverse:
+            indices, values = indices[::-1], values[::-1]
+        if progress:
+            progress((n - lo if reverse else hi) / n)
+        yield indices, values
+
+
+def _txt_chunks(path, chunk_size, progress=None):
+    with open(path, "r") as f:
+        n = read_signal_header(f).n
+        pos = 0
+        while pos < n:
+            block = np.loadtxt(f, max_rows=min(chunk_size, n - pos), ndmin=2)
+            if len(block) == 0:
+                break
+            pos += len(block)
+            if progress:
+                progress(pos / n)
+            yield _index_array(block[:, 0]), block[:, 1].copy()
+
+
+def _txt_chunks_reversed(path, chunk_size, progress=None):
+    # Roughly chunk_size lines per block; each block is parsed after the
+    # partial line at its front is carried over to the next (earlier) block.
+    block_bytes = max(chunk_size * 24, 1 << 12)
+    with open(path, "rb") as f:
+        read_signal_header(f)
+        body_start = f.tell()
+        pos = end = f.seek(0, os.SEEK_END)
+        carry = b""
+        while pos > body_start:
+            size = min(block_bytes, pos - body_start)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + carry).split(b"\n")
+            carry = lines.pop(0) if pos > body_start else b""
+            lines = [line.decode() for line in lines if line.strip()]
+            if progress:
+                progress((end - pos) / (end - body_start))
+            if lines:
+                block = np.loadtxt(lines, ndmin=2)[::-1]
+                yield _index_array(block[:, 0]), block[:, 1].copy()
+
+
+def stream_signal(path, chunk_size=DEFAULT_CHUNK_SIZE, reverse=False, progress=None):
+    """
+    Yield a signal file as (indices, values) chunks. A .sigb path, or a .txt
+    with a fresh .sigb companion, is read through np.memmap. With reverse=True
+    chunks come from the end of the file with decreasing indices. progress,
+    if given, is called with the fraction of the file read before each chunk
+    is yielded.
+    """
+    if not path.endswith(BINARY_EXTENSION):
+        path = fresh_binary_path(path) or path
+    if path.endswith(BINARY_EXTENSION):
+        return _binary_chunks(path, chunk_size, reverse, progress)
+    if reverse:
+        return _txt_chunks_reversed(path, chunk_size, progress)
+    return _txt_chunks(path, chunk_size, progress)
+
+
+def collect_stream(chunks):
+    """Concatenate a stream into one (indices, values) pair."""
+    chunks = list(chunks)
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    return (np.concatenate([indices for indices, _ in chunks]),
+            np.concatenate([values for _, values in chunks]))
+
+
+def write_stream(path, chunks, signal_type=0, periodic=0):
+    """
+    Write a stream to a .txt or .sigb file incrementally and return the
+    number of samples written. Nothing but the current chunk is held in memory.
+    """
+    if path.endswith(BINARY_EXTENSION):
+        return _write_stream_bin(path, chunks, signal_type, periodic)
+
+    n = 0
+    with open(path, "w") as f:
+        f.write(f"{signal_type}\n{periodic}\n")
+        count_pos = f.tell()
+        # N is only known at the end: reserve a fixed-width field and patch it
+        f.write(" " * 20 + "\n")
+        for indices, values in chunks:
+            index_fmt = "%d" if np.issubdtype(indices.dtype, np.integer) else "%.10g"
+            np.savetxt(f, np.column_stack([indices, values]), fmt=[index_fmt, "%.10g"])
+            n += len(values)
+        f.seek(count_pos)
+        f.write(f"{n:<20d}")
+    return n
+
+
+def _write_stream_bin(path, chunks, signal_type, periodic):
+    # Indices and values go to separate spill files, since the .sigb layout
+    # puts every index before the first sample and density is only known at the end.
+    n = 0
+    start_index = None
+    expected_next = None
+    index_dtype = None
+    dense = True
+    with tempfile.TemporaryDirectory(prefix="dsp_write_") as tmp_dir:
+        idx_path = os.path.join(tmp_dir, "indices")
+        val_path = os.path.join(tmp_dir, "values")
+        with open(idx_path, "wb") as idx_file, open(val_path, "wb") as val_file:
+            for indices, values in chunks:
+                if len(values) == 0:
+                    continue
+                if index_dtype is None:
+                    index_dtype = "<i8" if np.issubdtype(indices.dtype, np.integer) else "<f8"
+                    start_index = indices[0]
+                elif index_dtype == "<i8" and not np.issubdtype(indices.dtype, np.integer):
+                    # Fractional indices after integer ones: widen what was spilled so far
+                    idx_file.flush()
+                    spilled = np.fromfile(idx_path, dtype="<i8").astype("<f8")
+                    idx_file.seek(0)
+                    idx_file.write(spilled.tobytes())
+                    index_dtype = "<f8"
+                indices = np.asarray(indices, dtype=index_dtype)
+                if dense:
+                    dense = (index_dtype == "<i8"
+                             and (expected_next is None or indices[0] == expected_next)
+                             and bool(np.all(np.diff(indices) == 1)))
+                expected_next = indices[-1] + 1
+                idx_file.write(indices.tobytes())
+                val_file.write(np.asarray(values, dtype="<f8").tobytes())
+                n += len(values)
+
+        dense = dense and n > 0
+        if dense:
+            index_kind = INDEX_DENSE
+        else:
+            index_kind = INDEX_FLOAT64 if index_dtype == "<f8" else INDEX_INT64
+
+        with open(path, "wb") as out:
+            out.write(binary_header_bytes(signal_type, periodic, n, index_kind,
+                                          int(start_index) if dense else 0))
+            if not dense:
+                with open(idx_path, "rb") as src:
+                    shutil.copyfileobj(src, out)
+            with open(val_path, "rb") as src:
+                shutil.copyfileobj(src, out)
+    return n
+
+
+if __name__ == "__main__":
+    # python signal_io.py Signal1.txt [more.txt ...]  -> writes Signal1.sigb, ...
+    # python signal_io.py Signal1.sigb                -> writes Signal1.txt
+    import sys
+    for name in sys.argv[1:]:
+        if name.endswith(BINARY_EXTENSION):
+            print(bin_to_txt(name, os.path.splitext(name)[0] + ".txt"))
+        else:
+            print(txt_to_bin(name))
@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class Signal:
+    """
+    Compact discrete signal x(n).
+
+    Signals with consecutive integer indices (the usual case) are stored as a
+    start index plus one contiguous float array; the per-sample index array is
+    only kept when the indices have gaps. A Signal still unpacks like the
+    (indices, values) pairs used everywhere else:
+
+        indices, values = sig
+    """
+
+    __slots__ = ("start_index", "values", "_indices")
+
+    def __init__(self, values, start_index=0, indices=None):
+        self.values = np.asarray(values, dtype=float)
+        self.start_index = int(start_index)
+        self._indices = None if indices is None else np.asarray(indices)
+
+    @classmethod
+    def from_arrays(cls, indices, values):
+        """Build a Signal from (indices, values), using dense storage when possible."""
+        indices = np.asarray(indices)
+        values = np.asarray(values, dtype=float)
+        if len(indices) != len(values):
+            raise ValueError("indices and values must have the same length")
+
+        if len(indices) > 1 and np.any(indices[1:] < indices[:-1]):
+            order = np.argsort(indices, kind="stable")
+            indices = indices[order]
+            values = values[order]
+
+        if len(indices) == 0:
+            return cls(values)
+
+        int_indices = indices.astype(np.int64)
+        if np.all(int_indices == indices) and np.all(np.diff(int_indices) == 1):
+            return cls(values, start_index=int_indices[0])
+        return cls(values, indices=indices)
+
+    @property
+    def is_dense(self) -> bool:
+        return self._indices is None
+
+    @property
+    def size(self) -> int:
+        return len(self.values)
+
+    @property
+    def end_index(self) -> int:
+        """One past the last index of a dense signal."""
+        return self.start_index + len(self.values)
+
+    @property
+    def indices(self):
+        if self._indices is None:
+            return np.arange(self.start_index, self.end_index)
+        return self._indices
+
+    @property
+    def nbytes(self) -> int:
+        extra = 0 if self._indices is None else self._indices.nbytes
+        return self.values.nbytes + extra
+
+    def __iter__(self):
+        yield self.indices
+        yield self.values
+
+    def __getitem__(self, item):
+        return (self.indices, self.values)[item]
+
+    def __repr__(self):
+        if self.is_dense:
+            return f"Signal(dense, start_index={self.start_index}, size={self.size})"
+        return f"Signal(sparse, size={self.size})"
+
+    def shift(self, k):
+        """x(n - k): positive k delays (indices increase), negative k advances. O(1) when dense."""
+        if self.is_dense:
+            return Signal(self.values, start_index=self.start_index + k)
+        return Signal(self.values, indices=self._indices + k)
+
+    def fold(self):
+        """x(-n). Dense signals return a reversed view, no copy."""
+        if self.is_dense:
+            return Signal(self.values[::-1], start_index=-(self.end_index - 1))
+        return Signal(self.values[::-1], indices=-self._indices[::-1])
+
+    def scale(self, constant):
+        return Signal(self.values * constant, start_index=self.start_index, indices=self._indices)
+
+    @staticmethod
+    def sum(signals):
+        """
+        Add dense signals by aligned slice addition over their common span.
+        Sparse inputs are not handled here; callers fall back to the index merge.
+        """
+        if not signals:
+            raise ValueError("At least one signal is required")
+        if not all(s.is_dense for s in signals):
+            raise ValueError("Signal.sum only handles dense signals")
+
+        lo = min(s.start_index for s in signals)
+        hi = max(s.end_index for s in signals)
+        out = np.zeros(hi - lo)
+        covered = np.zeros(hi - lo, dtype=bool)
+        for s in signals:
+            out[s.start_index - lo:s.end_index - lo] += s.values
+            covered[s.start_index - lo:s.end_index - lo] = True
+
+        if covered.all():
+            return Signal(out, start_index=lo)
+        # Inputs leave a gap in the union of indices: only keep indices some input has
+        positions = np.flatnonzero(covered)
+        return Signal(out[positions], indices=positions + lo)
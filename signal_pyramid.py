@@ -0,0 +1,374 @@
+"""
+On-disk min/max/mean pyramid of a signal, for viewing very long recordings.
+
+Level k summarises the samples in buckets of 2**k consecutive positions,
+one (min, max, mean) row per bucket. Levels go from base_level up to the
+one with a single row. A view spanning P samples over W pixels reads the
+coarsest level whose buckets still fit in a pixel, which is between W and
+2W rows. The cost is therefore O(pixels) whatever the zoom, and the
+memory-mapped file is only paged in where it is read.
+
+The pyramid is stored next to its source as <name>.pyr, e.g. Signal1.pyr
+for Signal1.txt, and is reused while it is at least as new as the source.
+Generated task2 signals are keyed by their parameters in a temporary
+directory instead, capped at GENERATED_CACHE_BYTES by evicting the least
+recently used. The 64-byte header is written last, so an interrupted
+build is never mistaken for a complete one.
+"""
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+from lod_plot import LODPlot, minmax_envelope, STEM_THRESHOLD
+from signal_generator import FrozenSpec, _num_samples, iter_signal_blocks
+from signal_io import DEFAULT_CHUNK_SIZE, signal_file_header, stream_signal
+
+
+PYRAMID_EXTENSION = ".pyr"
+PYRAMID_MAGIC = b"DSPPYR01"
+PYRAMID_HEADER_SIZE = 64
+# Finest level: buckets of 2**4 = 16 samples, about 3 bytes of pyramid per sample
+DEFAULT_BASE_LEVEL = 4
+# Signals shorter than this are drawn straight from their samples
+PYRAMID_MIN_SAMPLES = 1 << 20
+# Pyramids of generated signals are evicted, least recently used first, beyond this total size
+GENERATED_CACHE_BYTES = 1 << 30
+
+_PYRAMID_HEADER = np.dtype([
+    ("magic", "S8"),
+    ("n", "<i8"),
+    ("base_level", "<i4"),
+    ("num_levels", "<i4"),
+])
+
+
+def pyramid_path_for(path):
+    return os.path.splitext(path)[0] + PYRAMID_EXTENSION
+
+
+def _level_rows(n, base_level):
+    # Row count of every level, finest first, down to a single row
+    rows = []
+    k = base_level
+    while True:
+        rows.append(max(1, -(-n // (1 << k))))
+        if rows[-1] == 1:
+            return rows
+        k += 1
+
+
+class PyramidBuilder:
+    """
+    Build a pyramid file from values fed chunk by chunk with add(). The total
+    sample count n must be known upfront, e.g. from the signal file header.
+    Each level is written as soon as its buckets complete. Only a partial
+    bucket per level is carried between chunks.
+    """
+
+    def __init__(self, path, n, base_level=DEFAULT_BASE_LEVEL):
+        self.path = path
+        self.n = n
+        self.base_level = base_level
+        self.rows = _level_rows(n, base_level)
+        self.count = 0
+        self._written = [0] * len(self.rows)
+        # Per level, at most one (min, max, sum, count) row waiting for its pair
+        self._carry = [np.empty((0, 4)) for _ in self.rows]
+        self._raw_carry = np.empty(0)
+
+        with open(path, "wb") as f:
+            f.write(b"\0" * PYRAMID_HEADER_SIZE)
+            f.truncate(PYRAMID_HEADER_SIZE + 24 * sum(self.rows))
+        self._data = np.memmap(path, dtype="<f8", mode="r+", offset=PYRAMID_HEADER_SIZE,
+                               shape=(sum(self.rows), 3))
+        self._offsets = np.concatenate(([0], np.cumsum(self.rows)))
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float)
+        self.count += len(values)
+        if len(self._raw_carry):
+            values = np.concatenate((self._raw_carry, values))
+        size = 1 << self.base_level
+        full = len(values) // size * size
+        if full:
+            buckets = values[:full].reshape(-1, size)
+            rows = np.column_stack((buckets.min(axis=1), buckets.max(axis=1),
+                                    buckets.sum(axis=1), np.full(len(buckets), float(size))))
+            self._push(0, rows)
+        self._raw_carry = values[full:].copy()
+
+    def _push(self, level, rows):
+        start = self._offsets[level] + self._written[level]
+        self._data[start:start + len(rows)] = np.column_stack((rows[:, 0], rows[:, 1], rows[:, 2] / rows[:, 3]))
+        self._written[level] += len(rows)
+        if level + 1 == len(self.rows):
+            return
+
+        if len(self._carry[level]):
+            rows = np.concatenate((self._carry[level], rows))
+        pairs = len(rows) // 2 * 2
+        if pairs:
+            a, b = rows[0:pairs:2], rows[1:pairs:2]
+            self._carry[level] = rows[pairs:]
+            self._push(level + 1, np.column_stack((np.minimum(a[:, 0], b[:, 0]), np.maximum(a[:, 1], b[:, 1]),
+                                                   a[:, 2] + b[:, 2], a[:, 3] + b[:, 3])))
+        else:
+            self._carry[level] = rows
+
+    def feed(self, chunks):
+        """
+        Pass a stream of (indices, values) chunks through unchanged, adding
+        their values on the way, so one read of a file also builds its
+        pyramid. Call close() once the stream is exhausted. If the stream is
+        abandoned or fails, the partial file is discarded.
+        """
+        try:
+            for chunk in chunks:
+                self.add(chunk[1])
+                yield chunk
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self):
+        """Remove the unfinished file."""
+        self._data = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def close(self):
+        if self.count != self.n:
+            raise ValueError(f"Expected {self.n} samples, got {self.count}")
+        if len(self._raw_carry):
+            v = self._raw_carry
+            self._raw_carry = np.empty(0)
+            self._push(0, np.array([[v.min(), v.max(), v.sum(), float(len(v))]]))
+        # Flush the unpaired trailing bucket of each level upwards, finest first
+        for level in range(len(self.rows) - 1):
+            if len(self._carry[level]):
+                rows, self._carry[level] = self._carry[level], np.empty((0, 4))
+                self._push(level + 1, rows)
+        if self.n == 0:
+            self._data[:] = 0.0
+        self._data.flush()
+        del self._data
+
+        header = np.zeros(1, dtype=_PYRAMID_HEADER)
+        header["magic"] = PYRAMID_MAGIC
+        header["n"] = self.n
+        header["base_level"] = self.base_level
+        header["num_levels"] = len(self.rows)
+        with open(self.path, "r+b") as f:
+            f.write(header.tobytes().ljust(PYRAMID_HEADER_SIZE, b"\0"))
+        return Pyramid(self.path)
+
+
+class Pyramid:
+    """A pyramid file opened read-only with np.memmap."""
+
+    def __init__(self, path):
+        raw = np.fromfile(path, dtype=_PYRAMID_HEADER, count=1)
+        if len(raw) == 0 or raw["magic"][0] != PYRAMID_MAGIC:
+            raise ValueError(f"{os.path.basename(path)} is not a complete signal pyramid")
+        self.path = path
+        self.n = int(raw["n"][0])
+        self.base_level = int(raw["base_level"][0])
+        rows = _level_rows(self.n, self.base_level)
+        data = np.memmap(path, dtype="<f8", mode="r", offset=PYRAMID_HEADER_SIZE, shape=(sum(rows), 3))
+        offsets = np.concatenate(([0], np.cumsum(rows)))
+        # levels[k] is the (rows, 3) min/max/mean view of buckets of 2**k samples
+        self.levels = {self.base_level + i: data[offsets[i]:offsets[i + 1]] for i in range(len(rows))}
+
+    def level_for(self, first, last, bins):
+        """Coarsest level whose buckets are no wider than one of bins, or None if below the base."""
+        per_bin = (last - first) / max(1, bins)
+        if per_bin < (1 << self.base_level):
+            return None
+        return min(int(np.log2(per_bin)), max(self.levels))
+
+    def envelope(self, first, last, bins):
+        """
+        (positions, min, max, mean) of the buckets covering sample positions
+        [first, last), at level_for(first, last, bins). Returns None when the
+        view is too fine for the pyramid and the samples should be read.
+        """
+        k = self.level_for(first, last, bins)
+        if k is None:
+            return None
+        rows = self.levels[k]
+        r0 = max(first >> k, 0)
+        r1 = min(-(-last // (1 << k)), len(rows))
+        block = np.asarray(rows[r0:r1])
+        return np.arange(r0, r1) << k, block[:, 0], block[:, 1], block[:, 2]
+
+
+def fresh_pyramid_path(source_path):
+    """The pyramid of source_path if it exists and is at least as new, else None."""
+    path = pyramid_path_for(source_path)
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(source_path) and os.path.getmtime(path) < os.path.getmtime(source_path):
+        return None
+    return path
+
+
+def build_pyramid(path, chunks, n, base_level=DEFAULT_BASE_LEVEL, progress=None):
+    """
+    Build a pyramid at path from a stream of (indices, values) chunks with n
+    values in total. progress(fraction), if given, is called after each chunk;
+    raising from it removes the partial file.
+    """
+    builder = PyramidBuilder(path, n, base_level)
+    try:
+        for _, values in chunks:
+            builder.add(values)
+            if progress:
+                progress(builder.count / max(n, 1))
+        return builder.close()
+    except BaseException:
+        builder.discard()
+        raise
+
+
+def ensure_pyramid(source_path, values=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    The pyramid of a signal file, reused from disk when fresh and built
+    otherwise. The file is streamed in chunks, unless its values are
+    already loaded (for example a memory-mapped Signal's).
+    """
+    path = fresh_pyramid_path(source_path)
+    if path:
+        try:
+            return Pyramid(path)
+        except ValueError:
+            pass
+    if values is not None:
+        chunks = ((None, values[i:i + chunk_size]) for i in range(0, len(values), chunk_size))
+        return build_pyramid(pyramid_path_for(source_path), chunks, len(values), progress=progress)
+
+    n = signal_file_header(source_path).n
+    return build_pyramid(pyramid_path_for(source_path), stream_signal(source_path, chunk_size), n,
+                         progress=progress)
+
+
+def generated_pyramid_path(spec, cache_dir=None):
+    # Generated signals have no source file; they are keyed by their parameters instead
+    key = hashlib.sha1(repr(FrozenSpec.from_spec(spec)).encode()).hexdigest()
+    cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "dsp_pyramids")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, key + PYRAMID_EXTENSION)
+
+
+def pyramid_bytes(n, base_level=DEFAULT_BASE_LEVEL):
+    """Size of the pyramid file of n samples."""
+    return PYRAMID_HEADER_SIZE + 24 * sum(_level_rows(n, base_level))
+
+
+def evict_pyramids(cache_dir, max_bytes, reserve=0):
+    """
+    Delete the least recently used pyramids in cache_dir until they take at
+    most max_bytes - reserve. Files still mapped elsewhere (which Windows
+    refuses to delete) are skipped.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(PYRAMID_EXTENSION):
+            path = os.path.join(cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries) + reserve
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def ensure_generated_pyramid(spec, cache_dir=None, block_size=DEFAULT_CHUNK_SIZE, progress=None,
+                             max_bytes=GENERATED_CACHE_BYTES):
+    """
+    Pyramid of a discrete task2 signal. It is built block by block from
+    iter_signal_blocks, so the full signal is never held in memory. A reused
+    pyramid is touched, and older ones are evicted to keep the cache
+    directory under max_bytes.
+    """
+    path = generated_pyramid_path(spec, cache_dir)
+    if os.path.exists(path):
+        try:
+            pyramid = Pyramid(path)
+            os.utime(path)
+            return pyramid
+        except ValueError:
+            pass
+    n = _num_samples(spec)
+    evict_pyramids(os.path.dirname(path), max_bytes, reserve=pyramid_bytes(n))
+    return build_pyramid(path, iter_signal_blocks(spec, block_size, method="direct"), n, progress=progress)
+
+
+class PyramidPlot(LODPlot):
+    """
+    LODPlot whose envelopes come from a Pyramid. samples(first, last) returns
+    the values at positions [first, last); it is only called for views fine
+    enough to show a few pixels' worth of samples. Positions map to x as
+    indices[pos] when indices is given, otherwise as x0 + pos * dx.
+    """
+
+    def __init__(self, ax, pyramid, samples, x0=0.0, dx=1.0, indices=None, stem=False, label=None,
+                 stem_threshold=STEM_THRESHOLD, **line_kw):
+        self.pyramid = pyramid
+        self.samples = samples
+        self.x0 = x0
+        self.dx = dx
+        self.indices = indices
+        self._attach(ax, stem, label, stem_threshold, line_kw)
+
+    def _x_at(self, positions):
+        if self.indices is not None:
+            return np.asarray(self.indices[positions], dtype=float)
+        return self.x0 + positions * self.dx
+
+    def _data_limits(self):
+        if not self.pyramid.n:
+            return 0.0, 1.0
+        return float(self._x_at(0)), float(self._x_at(self.pyramid.n - 1))
+
+    def _visible(self, lo, hi):
+        if self.indices is not None:
+            return np.searchsorted(self.indices, lo, side="left"), np.searchsorted(self.indices, hi, side="right")
+        n = self.pyramid.n
+        first = min(max(int(np.ceil((lo - self.x0) / self.dx)), 0), n)
+        last = min(max(int(np.floor((hi - self.x0) / self.dx)) + 1, 0), n)
+        return first, last
+
+    def _samples(self, first, last):
+        return self._x_at(np.arange(first, last)), np.asarray(self.samples(first, last), dtype=float)
+
+    def _envelope(self, lo, hi, first, last, bins):
+        # One sample of margin so lines run off the edges of the view
+        first = max(first - 1, 0)
+        last = min(last + 1, self.pyramid.n)
+        env = self.pyramid.envelope(first, last, bins)
+        if env is None:
+            xv, yv = self._samples(first, last)
+            return minmax_envelope(xv, yv, -np.inf, np.inf, bins)
+        positions, mins, maxs, _ = env
+        ys = np.empty(2 * len(positions))
+        ys[0::2] = mins
+        ys[1::2] = maxs
+        return np.repeat(self._x_at(positions), 2), ys
+
+
+def plot_pyramid(ax, signal, pyramid, stem=False, label=None, **line_kw):
+    """PyramidPlot of a signal_model.Signal: dense signals map positions from start_index."""
+    if signal.is_dense:
+        return PyramidPlot(ax, pyramid, lambda a, b: signal.values[a:b], x0=signal.start_index,
+                           stem=stem, label=label, **line_kw)
+    return PyramidPlot(ax, pyramid, lambda a, b: signal.values[a:b], indices=signal.indices,
+                       stem=stem, label=label, **line_kw)
@@ -0,0 +1,93 @@
+"""
+Chunked streaming versions of the Task1 operations.
+
+Every stream is a generator of (indices, values) chunks in increasing index
+order, so arbitrarily long recordings can be combined with flat memory use:
+
+    a = stream_multiply(stream_signal("a.txt"), 5)
+    b = stream_signal("b.sigb")
+    write_stream("out.txt", stream_shift(stream_subtract(a, b), 3, "delay"))
+
+Folding a file source reads it backwards by chunk (stream_fold_file); folding
+an intermediate stream spills it to a temporary .sigb and reads that backwards.
+"""
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# The file readers and writer live in signal_io; they are re-exported here as
+# part of the stream API
+from signal_io import BINARY_EXTENSION, DEFAULT_CHUNK_SIZE, stream_signal, write_stream
+
+
+def stream_multiply(chunks, constant):
+    for indices, values in chunks:
+        yield indices, values * constant
+
+
+def stream_shift(chunks, k, method):
+    """Same convention as Task1.shifting_signal: delay adds k, advance subtracts k."""
+    if method not in ("delay", "advance"):
+        raise ValueError("Method must be 'advance' or 'delay'")
+    offset = k if method == "delay" else -k
+    for indices, values in chunks:
+        yield indices + offset, values
+
+
+def stream_fold_file(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """x(-n) of a signal file, reading it backwards by chunk."""
+    for indices, values in stream_signal(path, chunk_size, reverse=True):
+        yield -indices, values
+
+
+def stream_fold(chunks, chunk_size=DEFAULT_CHUNK_SIZE):
+    """x(-n) of an arbitrary stream: spill it to a temporary .sigb, then read it backwards."""
+    tmp_dir = tempfile.mkdtemp(prefix="dsp_fold_")
+    try:
+        spill = os.path.join(tmp_dir, "spill" + BINARY_EXTENSION)
+        write_stream(spill, chunks)
+        yield from stream_fold_file(spill, chunk_size)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def stream_add(streams):
+    """
+    Index-aligned sum of several sorted streams. Only samples up to the
+    smallest "last index seen" across the still-running inputs are emitted;
+    the rest wait for the next chunk, so memory is bounded by one chunk per input.
+    """
+    # Task1 pulls in tkinter and pyplot; only import it once a sum is taken
+    from Task1 import add_signals
+    streams = [iter(s) for s in streams]
+    buffers = [None] * len(streams)
+    live = [True] * len(streams)
+
+    while True:
+        for i, stream in enumerate(streams):
+            while live[i] and (buffers[i] is None or len(buffers[i][0]) == 0):
+                chunk = next(stream, None)
+                if chunk is None:
+                    live[i] = False
+                else:
+                    buffers[i] = chunk
+
+        pending = [b for b in buffers if b is not None and len(b[0])]
+        if not pending:
+            return
+
+        bounds = [buffers[i][0][-1] for i in range(len(streams)) if live[i]]
+        ready = []
+        for i, buf in enumerate(buffers):
+            if buf is None or len(buf[0]) == 0:
+                continue
+            cut = len(buf[0]) if not bounds else np.searchsorted(buf[0], min(bounds), side="right")
+            if cut:
+                ready.append((buf[0][:cut], buf[1][:cut]))
+                buffers[i] = (buf[0][cut:], buf[1][cut:])
+        yield tuple(add_signals(ready))
+
+
+def stream_subtract(chunks1, chunks2):
+    return stream_add([chunks1, stream_multiply(chunks2, -1)])
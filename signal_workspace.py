@@ -0,0 +1,168 @@
+"""
+Persistent, content-addressed store of parsed signals and computed results.
+
+    ws = Workspace()                    # ~/.dsp_workspace, or $DSP_WORKSPACE
+    key, header, sig = ws.load("Signal1.txt")
+    out_key, out = ws.derive("subtract", [key_a, key_b], {}, lambda: subtract_signals(a, b))
+
+Objects are .sigb files named by a sha256:
+
+    objects/3f/3f9c...e1.sigb
+
+A parsed file is named by the sha256 of the source file's bytes. A
+computed result is named by the sha256 of its own bytes. A load whose
+path, size and mtime match the manifest reuses the object without hashing
+or parsing, and any other copy of the same bytes maps to the same object.
+
+manifest.json records:
+  - sources: path -> (size, mtime, key)
+  - derived: sha256 of [op, input keys, params] -> key of the result
+  - session: the signals open in Task1, restored on the next start
+
+A derived result is therefore computed once, ever, for the same inputs.
+Objects are opened with np.memmap, so even large restored sessions open
+instantly.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+from signal_io import (BINARY_EXTENSION, open_signal_bin, signal_file_header, stream_signal,
+                       write_signal_bin, write_stream)
+
+DEFAULT_WORKSPACE = os.path.join(os.path.expanduser("~"), ".dsp_workspace")
+_HASH_BLOCK = 1 << 20
+
+
+def file_sha256(path, progress=None):
+    h = hashlib.sha256()
+    size = max(os.path.getsize(path), 1)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            h.update(block)
+            if progress:
+                progress(f.tell() / size)
+    return h.hexdigest()
+
+
+def derivation_key(op, input_keys, params):
+    """Stable key of a derived result: the op, its input object keys, and its parameters."""
+    text = json.dumps([op, list(input_keys), params], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class Workspace:
+    def __init__(self, root=None):
+        self.root = root or os.environ.get("DSP_WORKSPACE") or DEFAULT_WORKSPACE
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.manifest_path = os.path.join(self.root, "manifest.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.manifest = {"sources": {}, "derived": {}, "session": []}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r") as f:
+                self.manifest.update(json.load(f))
+
+    def object_path(self, key):
+        return os.path.join(self.objects_dir, key[:2], key + ".sigb")
+
+    def has(self, key):
+        return key is not None and os.path.exists(self.object_path(key))
+
+    def open(self, key):
+        """(header, Signal) of a stored object, memory-mapped."""
+        return open_signal_bin(self.object_path(key))
+
+    def put(self, indices, values, signal_type=0, periodic=0):
+        """Store a signal and return its key. The sha256 of the written bytes dedups identical results."""
+        fd, tmp = tempfile.mkstemp(suffix=".sigb", dir=self.objects_dir)
+        os.close(fd)
+        try:
+            write_signal_bin(tmp, indices, values, signal_type, periodic)
+            key = file_sha256(tmp)
+            path = self.object_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return key
+
+    def load(self, path, progress=None, through=None):
+        """
+        (key, header, Signal) of a signal file. The file is only parsed the
+        first time its contents are seen; later loads open the stored object.
+        It is streamed into the store chunk by chunk. progress(fraction), if
+        given, is called while the file is hashed and parsed, and may raise to
+        abandon the load. through(chunks, object_path, n), if given, wraps the
+        stream of a newly stored file, e.g. to build its pyramid in the same read.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        known = self.manifest["sources"].get(path)
+        if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime and self.has(known["key"]):
+            key = known["key"]
+        else:
+            hash_progress = parse_progress = None
+            if progress:
+                hash_progress = lambda fraction: progress(fraction / 2)
+                parse_progress = lambda fraction: progress(0.5 + fraction / 2)
+            key = file_sha256(path, hash_progress)
+            if not self.has(key):
+                header = signal_file_header(path)
+                staging = self._staging_path(key)
+                chunks = stream_signal(path, progress=parse_progress)
+                if through is not None:
+                    chunks = through(chunks, self.object_path(key), header.n)
+                try:
+                    write_stream(staging, chunks, header.signal_type, header.periodic)
+                    os.replace(staging, self.object_path(key))
+                except BaseException:
+                    if os.path.exists(staging):
+                        os.remove(staging)
+                    raise
+            self.manifest["sources"][path] = {"size": stat.st_size, "mtime": stat.st_mtime, "key": key}
+            self.save()
+        header, sig = self.open(key)
+        return key, header, sig
+
+    def _staging_path(self, key):
+        os.makedirs(os.path.dirname(self.object_path(key)), exist_ok=True)
+        # Keeps the .sigb extension, which write_stream picks the format from
+        return os.path.join(os.path.dirname(self.object_path(key)), key + ".tmp" + BINARY_EXTENSION)
+
+    def derive(self, op, input_keys, params, compute, signal_type=0, periodic=0):
+        """
+        (key, Signal) of op applied to the stored inputs. compute() returns
+        (indices, values) and is only called when this derivation has never
+        been stored.
+        """
+        dkey = derivation_key(op, input_keys, params)
+        key = self.manifest["derived"].get(dkey)
+        if not self.has(key):
+            indices, values = compute()
+            key = self.put(indices, values, signal_type, periodic)
+            self.manifest["derived"][dkey] = key
+            self.save()
+        return key, self.open(key)[1]
+
+    @property
+    def session(self):
+        """[(key, source path)] of the signals open in the last session."""
+        return [(entry["key"], entry["path"]) for entry in self.manifest["session"] if self.has(entry["key"])]
+
+    def add_to_session(self, key, path):
+        self.manifest["session"].append({"key": key, "path": os.path.abspath(path)})
+        self.save()
+
+    def clear_session(self):
+        self.manifest["session"] = []
+        self.save()
+
+    def save(self):
+        # Write then rename, so a crash never leaves a truncated manifest
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, self.manifest_path)
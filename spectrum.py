@@ -0,0 +1,152 @@
+"""
+Amplitude and phase spectra of real signals, and the inverse back to samples.
+
+    spec = signal_spectrum(task1_signal)              # fs = 1: frequency in cycles/sample
+    spec.freqs, spec.amplitude, spec.phase
+    indices, values = inverse_spectrum(spec)          # original indices and samples back
+
+    a, b = spectra([y_a, y_b], fs=200.0)              # one 2-D FFT for equal lengths
+
+Only the one-sided spectrum is kept (np.fft.rfft), since the negative
+frequencies of a real signal mirror the positive ones. amplitude is |X(k)|
+and phase is angle(X(k)) in radians. Phase is set to 0 where the amplitude
+is rounding noise (below PHASE_FLOOR of the peak), so the plot is not
+cluttered by arbitrary angles.
+
+By default an n-sample signal is zero-padded to next_fast_len(n), a
+2/3/5-smooth length that numpy transforms quickly. This gives a finer
+frequency grid over the same spectrum, and inverse_spectrum still returns
+exactly the n original samples. Windows and frequency axes are cached per
+length. Signals of equal length are stacked and transformed in one call.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from convolution import _dense, next_fast_len
+from lod_plot import plot_lod
+
+WINDOWS = {
+    "rect": np.ones,
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+}
+# Bins below this fraction of the peak amplitude get phase 0
+PHASE_FLOOR = 1e-9
+
+
+@lru_cache(maxsize=16)
+def window(name, n):
+    """Shared, read-only window of n samples."""
+    if name not in WINDOWS:
+        raise ValueError(f"window must be one of {', '.join(WINDOWS)}")
+    w = WINDOWS[name](n).astype(float)
+    w.flags.writeable = False
+    return w
+
+
+@lru_cache(maxsize=16)
+def frequency_axis(nfft, fs=1.0):
+    """Shared, read-only frequencies (Hz) of the rfft bins of an nfft-point transform."""
+    freqs = np.fft.rfftfreq(nfft, 1.0 / fs)
+    freqs.flags.writeable = False
+    return freqs
+
+
+@dataclass
+class Spectrum:
+    X: np.ndarray
+    fs: float
+    n: int
+    nfft: int
+    start_index: int = 0
+    window: str = "rect"
+    # Indices of a sparse signal's samples; None when they covered the whole span
+    indices: np.ndarray = None
+
+    @property
+    def freqs(self):
+        return frequency_axis(self.nfft, self.fs)
+
+    @property
+    def amplitude(self):
+        return np.abs(self.X)
+
+    @property
+    def phase(self):
+        amplitude = self.amplitude
+        peak = amplitude.max() if len(amplitude) else 0.0
+        return np.where(amplitude > PHASE_FLOOR * peak, np.angle(self.X), 0.0)
+
+
+def _nfft(n, pad):
+    return next_fast_len(n) if pad else n
+
+
+def spectra(signals, fs=1.0, window_name="rect", pad=True, start_indices=None):
+    """
+    Spectrum of each value array in signals, in order. fs and start_indices
+    may be scalars or per-signal lists. Signals of equal length share one
+    2-D rfft.
+    """
+    signals = [np.asarray(values, dtype=float) for values in signals]
+    count = len(signals)
+    fs_list = list(fs) if np.ndim(fs) else [float(fs)] * count
+    starts = list(start_indices) if start_indices is not None else [0] * count
+
+    groups = {}
+    for i, values in enumerate(signals):
+        if len(values) == 0:
+            raise ValueError("Cannot take the spectrum of an empty signal")
+        groups.setdefault(len(values), []).append(i)
+
+    results = [None] * count
+    for n, members in groups.items():
+        nfft = _nfft(n, pad)
+        batch = np.empty((len(members), n))
+        for row, i in enumerate(members):
+            batch[row] = signals[i]
+        if window_name != "rect":
+            batch *= window(window_name, n)
+        X = np.fft.rfft(batch, nfft, axis=1)
+        for row, i in enumerate(members):
+            results[i] = Spectrum(X[row], float(fs_list[i]), n, nfft, int(starts[i]), window_name)
+    return results
+
+
+def spectrum(values, fs=1.0, window_name="rect", pad=True, start_index=0):
+    return spectra([values], fs, window_name, pad, [start_index])[0]
+
+
+def signal_spectrum(signal, fs=1.0, window_name="rect", pad=True):
+    """
+    Spectrum of a Task1 (indices, values) signal. Missing samples count as
+    zero; the indices that held samples are kept for inverse_spectrum.
+    """
+    first, values = _dense(signal)
+    spec = spectrum(values, fs, window_name, pad, first)
+    if len(values) != len(signal[1]):
+        spec.indices = np.unique(np.asarray(signal[0]).astype(np.int64))
+    return spec
+
+
+def inverse_spectrum(spec: Spectrum):
+    """
+    (indices, values) of the signal the spectrum was taken from: its original
+    indices, without the zeros that filled a sparse signal's gaps. Only rect
+    spectra can be inverted exactly.
+    """
+    if spec.window != "rect":
+        raise ValueError(f"A {spec.window}-windowed spectrum cannot be inverted exactly; use window 'rect'")
+    values = np.fft.irfft(spec.X, spec.nfft)[:spec.n]
+    if spec.indices is not None:
+        return spec.indices, values[spec.indices - spec.start_index]
+    return np.arange(spec.start_index, spec.start_index + spec.n), values
+
+
+def plot_spectrum(amplitude_ax, phase_ax, spec: Spectrum, label=None, **line_kw):
+    """Amplitude and phase against frequency, as level-of-detail plots for long spectra."""
+    plot_lod(amplitude_ax, spec.freqs, spec.amplitude, label=label, **line_kw)
+    plot_lod(phase_ax, spec.freqs, spec.phase, label=label, **line_kw)
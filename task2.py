@@ -1,26 +1,15 @@
+import copy
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from dataclasses import dataclass
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
-import numpy as np
-import math
-
-
-@dataclass
-class SignalSpec:
-    enabled: bool = False
-    kind: str = "sine"
-    A: float = 1.0
-    phase_deg: float = 0.0
-    f_analog: float = 5.0
-    fs: float = 100.0
-    duration: float = 1.0
-    representation: str = "continuous"
-    label: str = "Signal"
-
-    def phase_rad(self) -> float:
-        return math.radians(self.phase_deg)
+from signal_generator import SignalSpec, _num_samples, sample_range
+from waveform_cache import WaveformCache
+from lod_plot import plot_lod
+from signal_pyramid import PYRAMID_MIN_SAMPLES, PyramidPlot, ensure_generated_pyramid
+from tk_executor import Cancelled, TkTaskExecutor, TaskStatusBar
+from resampling import resample_generated
+from spectrum import spectra, plot_spectrum
 
 
 class SignalApp(tk.Tk):
@@ -31,6 +20,11 @@ class SignalApp(tk.Tk):
 
         self.sigA = SignalSpec(enabled=True, label="A")
         self.sigB = SignalSpec(enabled=False, label="B")
+        # Plot / Update and the example regenerate only what changed
+        self.waveforms = WaveformCache()
+        # Single worker, so the cache is only used from one thread
+        self.executor = TkTaskExecutor(self)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Top controls
         top_frame = ttk.Frame(self)
@@ -82,6 +76,9 @@ class SignalApp(tk.Tk):
         ttk.Button(bottom_frame, text="Plot / Update", command=self.plot_all).pack(side=tk.LEFT)
         ttk.Button(bottom_frame, text="Clear", command=self.clear_plot).pack(side=tk.LEFT, padx=8)
         ttk.Button(bottom_frame, text="Example: Add 2 signals", command=self.example_two_signals).pack(side=tk.LEFT, padx=8)
+        ttk.Button(bottom_frame, text="Resample...", command=self.resample_active).pack(side=tk.LEFT, padx=8)
+        ttk.Button(bottom_frame, text="Spectrum", command=self.show_spectrum).pack(side=tk.LEFT, padx=8)
+        TaskStatusBar(bottom_frame, self.executor).pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=8)
 
         self.plot_all()
 
@@ -207,28 +204,19 @@ class SignalApp(tk.Tk):
             return False
 
     def generate_signal(self, spec: SignalSpec):
-        if spec.representation == 'continuous':
-            num_pts = max(1000, int(2000 * spec.duration))
-            t = np.linspace(0, spec.duration, num_pts)
-            
-            if spec.kind == 'sine':
-                y = spec.A * np.sin(2 * np.pi * spec.f_analog * t + spec.phase_rad())
-            else:
-                y = spec.A * np.cos(2 * np.pi * spec.f_analog * t + spec.phase_rad())
-            
-            return t, y, False
-        else:
-            if spec.fs <= 0:
-                raise ValueError(f'Sampling frequency fs must be positive for discrete representation. Current value: {spec.fs} Hz')
-            
-            t = np.arange(0, spec.duration, 1.0 / spec.fs)
-            
-            if spec.kind == 'sine':
-                y = spec.A * np.sin(2 * np.pi * spec.f_analog * t + spec.phase_rad())
-            else:
-                y = spec.A * np.cos(2 * np.pi * spec.f_analog * t + spec.phase_rad())
-            
-            return t, y, True
+        return self.waveforms.get(spec)
+
+    def generated_pyramid(self, spec: SignalSpec, progress=None):
+        """On-disk min/max/mean pyramid for long discrete signals, None for the rest."""
+        if spec.representation == 'continuous' or _num_samples(spec) < PYRAMID_MIN_SAMPLES:
+            return None
+        return ensure_generated_pyramid(spec, progress=progress)
+
+    def plot_generated_pyramid(self, spec: SignalSpec, pyramid, label):
+        # Samples are only computed for views zoomed in far enough to need them
+        frozen = spec.frozen()
+        PyramidPlot(self.ax, pyramid, lambda a, b: sample_range(frozen, a, b),
+                    x0=0.0, dx=1.0 / frozen.fs, stem=True, label=label)
 
     def plot_all(self):
         try:
@@ -253,33 +241,46 @@ class SignalApp(tk.Tk):
                 if not ok:
                     return
 
-        self.ax.clear()
-        plotted_any = False
-
-        if specA.enabled:
+        # Snapshots, so edits made while the worker runs cannot change what it computes
+        specs = [copy.copy(spec) for spec in (specA, specB) if spec.enabled]
+        # Generation runs off the Tk thread; a newer Plot / Update supersedes one still running
+        self.executor.submit(self.generate_signals, specs, key="plot", pass_task=True,
+                             on_done=self.draw_signals, description="Generating signals")
+
+    def generate_signals(self, task, specs):
+        """Worker side of plot_all: (spec, pyramid, (t, y, discrete), error) per enabled spec."""
+        results = []
+        for i, spec in enumerate(specs):
+            step = task.phase(i / len(specs), (i + 1) / len(specs), f"signal {spec.label}")
+            step(0.0)
             try:
-                tA, yA, dA = self.generate_signal(specA)
+                pyramid = self.generated_pyramid(spec, progress=step)
+                data = self.generate_signal(spec) if pyramid is None else None
+                results.append((spec, pyramid, data, None))
+            except Cancelled:
+                raise
             except Exception as e:
-                messagebox.showerror("Error Generating Signal A", f"Failed to generate Signal A:\n{str(e)}\n\nCheck your parameters and try again.")
-                return
-            
-            if dA:
-                self.ax.stem(tA, yA, label=f"Signal A ({specA.kind}) [DISCRETE]")
-            else:
-                self.ax.plot(tA, yA, label=f"Signal A ({specA.kind}) [CONTINUOUS]", linewidth=2)
-            plotted_any = True
+                results.append((spec, None, None, e))
+        return results
 
-        if specB.enabled:
-            try:
-                tB, yB, dB = self.generate_signal(specB)
-            except Exception as e:
-                messagebox.showerror("Error Generating Signal B", f"Failed to generate Signal B:\n{str(e)}\n\nCheck your parameters and try again.")
+    def draw_signals(self, results):
+        for spec, _, _, error in results:
+            if error is not None:
+                messagebox.showerror(f"Error Generating Signal {spec.label}", f"Failed to generate Signal {spec.label}:\n{str(error)}\n\nCheck your parameters and try again.")
                 return
-            
-            if dB:
-                self.ax.stem(tB, yB, label=f"Signal B ({specB.kind}) [DISCRETE]")
+
+        self.ax.clear()
+        plotted_any = False
+
+        for spec, pyramid, data, _ in results:
+            if pyramid is not None:
+                self.plot_generated_pyramid(spec, pyramid, f"Signal {spec.label} ({spec.kind}) [DISCRETE]")
             else:
-                self.ax.plot(tB, yB, label=f"Signal B ({specB.kind}) [CONTINUOUS]", linewidth=2)
+                t, y, discrete = data
+                if discrete:
+                    plot_lod(self.ax, t, y, stem=True, label=f"Signal {spec.label} ({spec.kind}) [DISCRETE]")
+                else:
+                    plot_lod(self.ax, t, y, label=f"Signal {spec.label} ({spec.kind}) [CONTINUOUS]", linewidth=2)
             plotted_any = True
 
         if not plotted_any:
@@ -300,6 +301,110 @@ class SignalApp(tk.Tk):
         
         self.canvas.draw()
 
+    def resample_active(self):
+        """Convert the active discrete signal to a new fs and plot it over the original."""
+        target_vars = self.frameA_vars if self.active_signal_var.get() == 'A' else self.frameB_vars
+        try:
+            spec = copy.copy(self.parse_signal_from_vars(target_vars))
+        except ValueError as e:
+            messagebox.showerror("Invalid Parameters", str(e))
+            return
+        spec.label = self.active_signal_var.get()
+        if spec.representation != 'discrete':
+            messagebox.showinfo("Resample", "Only discrete signals can be resampled.\nSet Display to 'discrete' first.")
+            return
+
+        fs_new = simpledialog.askfloat("Resample", f"New sampling frequency for signal {spec.label} (Hz):",
+                                       initialvalue=spec.fs, minvalue=1e-9, parent=self)
+        if fs_new is None:
+            return
+        # The same check as plotting: below 2f the anti-aliasing filter removes the tone
+        target = copy.copy(spec)
+        target.fs = fs_new
+        if not self.check_sampling_theorem(target):
+            return
+        self.executor.submit(self.resample_signal, spec, target.fs, key="resample",
+                             on_done=self.draw_resampled, description=f"Resampling signal {spec.label}")
+
+    def resample_signal(self, spec: SignalSpec, fs_new):
+        """Worker side of resample_active: (spec, original (t, y), resampled (t, y, fs))."""
+        t, y, _ = self.generate_signal(spec)
+        return spec, (t, y), resample_generated(t, y, spec.fs, fs_new)
+
+    def draw_resampled(self, result):
+        spec, (t, y), (t_new, y_new, fs_new) = result
+        self.ax.clear()
+        plot_lod(self.ax, t, y, stem=True, label=f"Signal {spec.label} at {spec.fs:g} Hz")
+        # Stems would share the original's colour, so the resampled signal is drawn as marked points
+        plot_lod(self.ax, t_new, y_new, label=f"Resampled to {fs_new:g} Hz", color='tab:orange',
+                 linestyle='--', marker='.')
+        self.ax.set_xlabel('Time (s)', fontsize=12)
+        self.ax.set_ylabel('Amplitude', fontsize=12)
+        self.ax.set_title('Polyphase Resampling', fontsize=14, fontweight='bold')
+        self.ax.grid(True, alpha=0.3)
+        self.ax.legend(loc='best')
+        self.canvas.draw()
+
+    def show_spectrum(self):
+        """Amplitude and phase spectra of the enabled signals, in a separate window."""
+        try:
+            specs = []
+            for vars_map, label in ((self.frameA_vars, 'A'), (self.frameB_vars, 'B')):
+                spec = copy.copy(self.parse_signal_from_vars(vars_map))
+                spec.label = label
+                if spec.enabled:
+                    specs.append(spec)
+        except ValueError as e:
+            messagebox.showerror("Invalid Parameters", str(e))
+            return
+        if not specs:
+            messagebox.showinfo("Spectrum", "Enable Signal A or B first.")
+            return
+        self.executor.submit(self.compute_spectra, specs, key="spectrum", pass_task=True,
+                             on_done=self.draw_spectra, description="Computing spectra")
+
+    def compute_spectra(self, task, specs):
+        """Worker side of show_spectrum: (specs, Spectrum per spec), equal lengths in one batched FFT."""
+        values, rates = [], []
+        for i, spec in enumerate(specs):
+            task.report(i / (len(specs) + 1), f"signal {spec.label}")
+            t, y, discrete = self.generate_signal(spec)
+            values.append(y)
+            # Continuous signals are spectra of their dense display grid
+            rates.append(spec.fs if discrete or len(t) < 2 else (len(t) - 1) / (t[-1] - t[0]))
+        task.report(len(specs) / (len(specs) + 1), "FFT")
+        return specs, spectra(values, rates)
+
+    def draw_spectra(self, result):
+        specs, results = result
+        window = tk.Toplevel(self)
+        window.title("Spectrum")
+        fig = Figure(figsize=(7, 6), dpi=100)
+        amp_ax = fig.add_subplot(211)
+        phase_ax = fig.add_subplot(212, sharex=amp_ax)
+        canvas = FigureCanvasTkAgg(fig, master=window)
+        for spec, spectrum in zip(specs, results):
+            plot_spectrum(amp_ax, phase_ax, spectrum, label=f"Signal {spec.label} ({spec.kind})")
+        amp_ax.set_title('Amplitude Spectrum |X(f)|', fontsize=12, fontweight='bold')
+        amp_ax.set_ylabel('Amplitude')
+        phase_ax.set_title('Phase Spectrum', fontsize=12, fontweight='bold')
+        phase_ax.set_xlabel('Frequency (Hz)')
+        phase_ax.set_ylabel('Phase (rad)')
+        for ax in (amp_ax, phase_ax):
+            ax.grid(True, alpha=0.3)
+            ax.legend(loc='best')
+        fig.tight_layout()
+        canvas.draw()
+        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        toolbar = NavigationToolbar2Tk(canvas, window)
+        toolbar.update()
+        toolbar.pack(side=tk.TOP, fill=tk.X)
+
+    def on_close(self):
+        # Cancel running work first, so the worker stops at its next chunk instead of outliving the window
+        self.executor.shutdown()
+        self.destroy()
+
     def clear_plot(self):
         self.ax.clear()
         self.ax.set_title('Signals')
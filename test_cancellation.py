@@ -0,0 +1,96 @@
+"""
+Chunk loops stop within one chunk of a TaskHandle being cancelled.
+
+    python -m pytest test_cancellation.py
+"""
+import os
+
+import numpy as np
+import pytest
+
+from quantization import quantize_file
+from signal_io import load_signal, read_signal_file, stream_signal, write_signal_bin, write_signal_txt
+from signal_pyramid import build_pyramid, ensure_pyramid
+from signal_workspace import Workspace
+from tk_executor import Cancelled, TaskHandle
+
+N = 50_000
+CHUNK = 1000
+
+
+def cancel_after(calls):
+    """A TaskHandle.report-style callback that cancels its task on the given call."""
+    task = TaskHandle("test")
+    seen = []
+
+    def progress(fraction):
+        seen.append(fraction)
+        if len(seen) == calls:
+            task.cancel()
+        task.report(fraction)
+    return progress, seen
+
+
+@pytest.fixture
+def signal_txt(tmp_path):
+    path = str(tmp_path / "signal.txt")
+    write_signal_txt(path, np.arange(N), np.random.default_rng(2).standard_normal(N))
+    return path
+
+
+@pytest.mark.parametrize("extension", [".txt", ".sigb"])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_stream_stops_after_cancel(tmp_path, signal_txt, extension, reverse):
+    path = signal_txt
+    if extension == ".sigb":
+        path = str(tmp_path / "signal.sigb")
+        write_signal_bin(path, *read_signal_file(signal_txt)[1:])
+    progress, seen = cancel_after(3)
+    chunks = []
+    with pytest.raises(Cancelled):
+        for chunk in stream_signal(path, CHUNK, reverse=reverse, progress=progress):
+            chunks.append(chunk)
+    assert len(chunks) == 2 and len(seen) == 3
+    assert all(0 < f <= 1 for f in seen) and seen == sorted(seen)
+
+
+def test_progress_reaches_one_and_load_matches_bulk_parse(signal_txt):
+    seen = []
+    header, sig = load_signal(signal_txt, seen.append)
+    expected_header, indices, values = read_signal_file(signal_txt)
+    assert header == expected_header
+    assert np.array_equal(sig.indices, indices) and np.array_equal(sig.values, values)
+    assert len(seen) == N // 65536 + 1 and seen[-1] == 1.0
+
+
+def test_cancelled_pyramid_build_leaves_no_file(tmp_path):
+    values = np.arange(N, dtype=float)
+    path = str(tmp_path / "signal.pyr")
+    chunks = ((None, values[i:i + CHUNK]) for i in range(0, N, CHUNK))
+    progress, seen = cancel_after(5)
+    with pytest.raises(Cancelled):
+        build_pyramid(path, chunks, N, progress=progress)
+    assert len(seen) == 5 and not os.path.exists(path)
+
+    seen = []
+    pyramid = ensure_pyramid(str(tmp_path / "signal.txt"), values, chunk_size=CHUNK, progress=seen.append)
+    assert pyramid.n == N and seen[-1] == 1.0
+
+
+def test_quantize_file_stops_in_either_pass(signal_txt):
+    for calls in (2, 55):
+        progress, seen = cancel_after(calls)
+        with pytest.raises(Cancelled):
+            quantize_file(signal_txt, bits=3, chunk_size=CHUNK, progress=progress)
+        assert len(seen) == calls
+    assert seen[-1] > 0.5
+
+
+def test_cancelled_workspace_load_stores_nothing(tmp_path, signal_txt):
+    workspace = Workspace(str(tmp_path / "workspace"))
+    progress, _ = cancel_after(2)
+    with pytest.raises(Cancelled):
+        workspace.load(signal_txt, progress)
+    assert workspace.manifest["sources"] == {}
+    key, _, sig = workspace.load(signal_txt)
+    assert sig.size == N and workspace.has(key)
@@ -0,0 +1,112 @@
+"""
+Every convolution method against np.convolve / np.correlate and a
+sample-by-sample sum over the original indices.
+
+    python -m pytest test_convolution.py
+"""
+import numpy as np
+import pytest
+
+from convolution import choose_method, convolve_signals, correlate_signals, next_fast_len
+from signal_model import Signal
+
+METHODS = ["direct", "fft", "overlap-add"]
+
+
+def brute_convolve(sig1, sig2):
+    # y(n) = sum_k x(k) h(n - k) straight from the (index, value) pairs
+    out = {}
+    for i, x in zip(*sig1):
+        for j, h in zip(*sig2):
+            out[int(i + j)] = out.get(int(i + j), 0.0) + x * h
+    return out
+
+
+def brute_correlate(sig1, sig2):
+    # r(l) = sum_n x(n + l) y(n): x at index i pairs with y at j for lag i - j
+    out = {}
+    for i, x in zip(*sig1):
+        for j, y in zip(*sig2):
+            out[int(i - j)] = out.get(int(i - j), 0.0) + x * y
+    return out
+
+
+def assert_matches(indices, values, expected):
+    # Output indices not in expected lie in zero-filled gaps and must be zero
+    lookup = dict(zip(indices.tolist(), values.tolist()))
+    assert set(expected) <= set(lookup)
+    for index, value in lookup.items():
+        assert value == pytest.approx(expected.get(index, 0.0), abs=1e-9)
+
+
+def cases():
+    rng = np.random.default_rng(12)
+    sparse = np.sort(rng.choice(np.arange(-60, 60), 40, replace=False))
+    return {
+        "zero starts": ((np.arange(0, 100), rng.standard_normal(100)), (np.arange(0, 80), rng.standard_normal(80))),
+        "negative starts": ((np.arange(-37, 150), rng.standard_normal(187)),
+                            (np.arange(-90, -5), rng.standard_normal(85))),
+        "positive starts": ((np.arange(12, 300), rng.standard_normal(288)), (np.arange(7, 77), rng.standard_normal(70))),
+        "sparse input": ((sparse, rng.standard_normal(40)), (np.arange(-3, 90), rng.standard_normal(93))),
+        "dense Signal": (Signal(rng.standard_normal(120), start_index=-25),
+                         (np.arange(4, 70), rng.standard_normal(66))),
+    }
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("case", list(cases()))
+def test_convolution_matches_references(case, method):
+    sig1, sig2 = cases()[case]
+    (i1, x), (i2, h) = [(np.asarray(s[0]), np.asarray(s[1])) for s in (sig1, sig2)]
+    indices, values = convolve_signals(sig1, sig2, method)
+    assert indices[0] == i1.min() + i2.min() and indices[-1] == i1.max() + i2.max()
+    assert_matches(indices, values, brute_convolve((i1, x), (i2, h)))
+    if case != "sparse input":
+        np.testing.assert_allclose(values, np.convolve(x, h), atol=1e-10)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("case", list(cases()))
+def test_correlation_matches_references(case, method):
+    sig1, sig2 = cases()[case]
+    (i1, x), (i2, y) = [(np.asarray(s[0]), np.asarray(s[1])) for s in (sig1, sig2)]
+    lags, values = correlate_signals(sig1, sig2, method)
+    assert lags[0] == i1.min() - i2.max() and lags[-1] == i1.max() - i2.min()
+    assert_matches(lags, values, brute_correlate((i1, x), (i2, y)))
+    if case != "sparse input":
+        # np.correlate's lags run from -(len(y) - 1) relative to the two starts
+        np.testing.assert_allclose(values, np.correlate(x, y, "full"), atol=1e-10)
+
+
+def test_normalized_autocorrelation_peaks_at_one():
+    x = (np.arange(-10, 40), np.random.default_rng(13).standard_normal(50))
+    lags, r = correlate_signals(x, x, normalize=True)
+    assert lags[np.argmax(r)] == 0 and r.max() == pytest.approx(1.0)
+    assert np.all(np.abs(r) <= 1 + 1e-12)
+
+
+def test_empty_and_fractional_inputs_raise():
+    x = (np.arange(5), np.ones(5))
+    for method in METHODS:
+        with pytest.raises(ValueError):
+            convolve_signals((np.array([], dtype=np.int64), np.array([])), x, method)
+        with pytest.raises(ValueError):
+            correlate_signals(x, (np.array([], dtype=np.int64), np.array([])), method)
+    with pytest.raises(ValueError):
+        convolve_signals((np.array([0.5, 1.5]), np.ones(2)), x)
+    with pytest.raises(ValueError):
+        convolve_signals(x, x, method="nope")
+
+
+def test_method_choice_and_fast_lengths():
+    assert choose_method(10_000, 32) == "direct"
+    assert choose_method(100_000, 1000) == "overlap-add"
+    assert choose_method(50_000, 50_000) == "fft"
+    for n in (1, 7, 97, 1000, 4097):
+        m = next_fast_len(n)
+        assert m >= n
+        k = m
+        for p in (2, 3, 5):
+            while k % p == 0:
+                k //= p
+        assert k == 1
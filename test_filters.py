@@ -0,0 +1,105 @@
+"""
+FIR and IIR stages against direct references, chunked against one call,
+and zero-filled index gaps.
+
+    python -m pytest test_filters.py
+"""
+import numpy as np
+import pytest
+
+from filters import FIRFilter, IIRFilter, filter_file, filter_signal, stream_filter
+from signal_io import read_signal_file, write_signal_txt
+
+SOS = [[0.02, 0.04, 0.02, 1.0, -1.56, 0.64], [0.02, 0.04, 0.02, 1.0, -1.73, 0.82]]
+
+
+def stages():
+    taps = np.random.default_rng(8).standard_normal(40) / 40
+    return [FIRFilter(taps, "direct"), FIRFilter(taps, "overlap-save"), IIRFilter.from_sos(SOS)]
+
+
+def reference(stage, x):
+    # Textbook difference equations, one sample at a time
+    if isinstance(stage, FIRFilter):
+        return np.convolve(x, stage.taps)[:len(x)]
+    for b0, b1, b2, a0, a1, a2 in SOS:
+        y = np.zeros(len(x))
+        for n in range(len(x)):
+            y[n] = (b0 * x[n] + b1 * (x[n - 1] if n >= 1 else 0) + b2 * (x[n - 2] if n >= 2 else 0)
+                    - a1 * (y[n - 1] if n >= 1 else 0) - a2 * (y[n - 2] if n >= 2 else 0)) / a0
+        x = y
+    return x
+
+
+def split(indices, values, sizes):
+    start = 0
+    for size in sizes:
+        yield indices[start:start + size], values[start:start + size]
+        start += size
+    if start < len(values):
+        yield indices[start:], values[start:]
+
+
+@pytest.mark.parametrize("stage", stages(), ids=["fir direct", "fir overlap-save", "iir"])
+def test_matches_reference_in_one_call_and_in_chunks(stage):
+    rng = np.random.default_rng(1)
+    indices, values = np.arange(-100, 2900), rng.standard_normal(3000)
+    expected = reference(stage, values)
+    out_indices, out = filter_signal((indices, values), stage)
+    assert np.array_equal(out_indices, indices)
+    np.testing.assert_allclose(out, expected, atol=1e-10)
+
+    chunks = list(stream_filter(split(indices, values, rng.integers(1, 500, size=20)), stage))
+    assert np.concatenate([c[0] for c in chunks]).tolist() == indices.tolist()
+    np.testing.assert_allclose(np.concatenate([c[1] for c in chunks]), out, atol=1e-10)
+
+
+@pytest.mark.parametrize("stage", stages(), ids=["fir direct", "fir overlap-save", "iir"])
+def test_gaps_are_zero_filled(stage):
+    rng = np.random.default_rng(2)
+    indices = np.sort(rng.choice(np.arange(5, 4000), 600, replace=False))
+    values = rng.standard_normal(600)
+    dense = np.zeros(indices[-1] - indices[0] + 1)
+    dense[indices - indices[0]] = values
+    expected = reference(stage, dense)
+
+    out_indices, out = filter_signal((indices, values), stage)
+    assert out_indices.tolist() == list(range(indices[0], indices[-1] + 1))
+    np.testing.assert_allclose(out, expected, atol=1e-10)
+
+    # Gaps fall inside chunks and between them
+    chunks = list(stream_filter(split(indices, values, [1, 7, 100, 3, 250]), stage))
+    assert np.concatenate([c[0] for c in chunks]).tolist() == out_indices.tolist()
+    np.testing.assert_allclose(np.concatenate([c[1] for c in chunks]), out, atol=1e-10)
+
+
+def test_long_gap_between_chunks_is_filled_in_pieces():
+    stage = IIRFilter.from_sos(SOS)
+    chunks = [(np.array([0]), np.array([1.0])), (np.array([200_000]), np.array([1.0]))]
+    out = list(stream_filter(iter(chunks), stage))
+    assert max(len(v) for _, v in out) <= 1 << 16
+    indices = np.concatenate([c[0] for c in out])
+    assert indices.tolist() == list(range(200_001))
+    impulse = filter_signal((np.arange(200_001), np.eye(1, 200_001)[0]), stage)[1]
+    np.testing.assert_allclose(np.concatenate([c[1] for c in out])[:100], impulse[:100])
+
+
+def test_file_matches_in_memory(tmp_path):
+    indices = np.array([0, 1, 2, 10, 11, 40])
+    values = np.array([1.0, -2.0, 3.0, 0.5, 0.25, -1.0])
+    src, dst = str(tmp_path / "in.txt"), str(tmp_path / "out.txt")
+    write_signal_txt(src, indices, values)
+    stage = FIRFilter([0.5, 0.25, 0.125])
+    assert filter_file(src, dst, stage, chunk_size=2) == 41
+    _, out_indices, out = read_signal_file(dst)
+    expected_indices, expected = filter_signal((indices, values), stage)
+    assert out_indices.tolist() == expected_indices.tolist()
+    np.testing.assert_allclose(out, expected, atol=1e-9)
+
+
+def test_rejects_fractional_or_unordered_indices():
+    stage = FIRFilter([1.0, 0.5])
+    with pytest.raises(ValueError):
+        filter_signal((np.array([0.0, 0.5]), np.ones(2)), stage)
+    with pytest.raises(ValueError):
+        list(stream_filter([(np.array([0, 1]), np.ones(2)), (np.array([1, 2]), np.ones(2))], stage))
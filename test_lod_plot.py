@@ -0,0 +1,62 @@
+"""
+Level-of-detail plots drawn on the synchronous Agg backend.
+
+    python -m pytest test_lod_plot.py
+"""
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from lod_plot import STEM_THRESHOLD, plot_lod
+
+
+def make_axes():
+    fig = Figure(figsize=(6, 4), dpi=100)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot(111)
+
+
+def ramp(n):
+    x = np.arange(n) / n
+    return x, np.sin(50 * x)
+
+
+CASES = {
+    "big stem + small stem": [(2_000_000, True), (300, True)],
+    "small stem + big stem": [(300, True), (2_000_000, True)],
+    "big stem": [(2_000_000, True)],
+    "small stem": [(300, True)],
+    "line + line": [(5000, False), (70_000, False)],
+    "small stem + small stem": [(300, True), (200, True)],
+    "big line + small stem": [(1_000_000, False), (300, True)],
+}
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_plots_sharing_an_axes_draw(case):
+    fig, ax = make_axes()
+    plots = [plot_lod(ax, *ramp(n), stem=stem, label=f"{n}") for n, stem in CASES[case]]
+    fig.canvas.draw()
+
+    # Zoom in until every plot shows stems, then back out to envelopes
+    ax.set_xlim(0.5, 0.5 + 100 / 2_000_000)
+    fig.canvas.draw()
+    for plot in plots:
+        assert plot._showing_stems == plot.stem
+    ax.set_xlim(0.0, 1.0)
+    fig.canvas.draw()
+    for plot, (n, stem) in zip(plots, CASES[case]):
+        assert plot._showing_stems == (stem and n <= STEM_THRESHOLD)
+
+
+def test_envelope_keeps_peaks_when_zoomed_out():
+    fig, ax = make_axes()
+    x = np.arange(1_000_000, dtype=float)
+    y = np.zeros_like(x)
+    y[123_457] = 5.0
+    plot = plot_lod(ax, x, y)
+    fig.canvas.draw()
+    xs, ys = plot._artist.get_data()
+    assert len(xs) < 10_000
+    assert np.nanmax(ys) == 5.0
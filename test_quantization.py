@@ -0,0 +1,126 @@
+"""
+Task3.quantize_and_encode against the original per-sample loop it replaced.
+
+    python -m pytest test_quantization.py
+"""
+import math
+
+import numpy as np
+import pytest
+
+from Task3 import quantize_and_encode
+from quantization import (StreamingQuantizer, decode_packed, pack_result, quantize_file,
+                          quantize_values, round3)
+from signal_io import write_signal_txt
+
+
+def baseline_quantize_and_encode(values, levels=None, bits=None):
+    # The loop from the baseline Task3.py, without its printing and QuanTest2 call
+    L = 2 ** int(bits) if bits else int(levels)
+    min_value = min(values)
+    max_value = max(values)
+    delta = (max_value - min_value) / L
+
+    mid_points = []
+    z = min_value
+    z_delta = min_value + delta
+    while z_delta <= max_value + 1e-9:
+        mid_points.append((z + z_delta) / 2)
+        z = z_delta
+        z_delta += delta
+
+    quantized = []
+    errors = []
+    for x in values:
+        for i in range(L):
+            lower = min_value + i * delta
+            upper = lower + delta
+            if lower <= x <= upper or (i == L - 1 and x == max_value):
+                q = mid_points[i]
+                quantized.append(round(q, 3))
+                errors.append(round(q - x, 3))
+                break
+    avg_error = sum(e ** 2 for e in errors) / len(errors)
+
+    num_bits = math.ceil(math.log2(L))
+    encoding = [format(i, f"0{num_bits}b") for i in range(L)]
+    encoded_signal = []
+    for q in quantized:
+        idx = mid_points.index(min(mid_points, key=lambda m: abs(m - q)))
+        encoded_signal.append(encoding[idx])
+
+    interval_indices = []
+    sampled_errors = []
+    for i, x in enumerate(values):
+        idx = min(max(int((x - min_value) / delta), 0), L - 1)
+        interval_indices.append(idx + 1)
+        sampled_errors.append(round(quantized[i] - x, 3))
+
+    return {
+        "quantized": quantized,
+        "errors": errors,
+        "avg_error": avg_error,
+        "encoded_signal": encoded_signal,
+        "interval_indices": interval_indices,
+        "sampled_errors": sampled_errors,
+    }
+
+
+def random_cases(count=300):
+    rng = np.random.default_rng(1234)
+    for _ in range(count):
+        n = int(rng.integers(1, 40))
+        # Values on a 4-decimal grid hit the decimal ties where np.round and round disagree
+        values = (rng.integers(-20000, 20000, size=n) / 10000).tolist()
+        if rng.random() < 0.5:
+            yield values, int(rng.integers(2, 17)), None
+        else:
+            yield values, None, int(rng.integers(1, 5))
+
+
+def test_round3_matches_python_round():
+    rng = np.random.default_rng(7)
+    values = np.concatenate(([3.1975, 2.0005, -1.0005, 0.0005, 1e6 + 0.0005],
+                             rng.integers(-10 ** 6, 10 ** 6, size=20000) / 10 ** 4,
+                             rng.standard_normal(20000) * 100))
+    assert round3(values).tolist() == [round(v, 3) for v in values.tolist()]
+
+
+def test_matches_baseline_on_random_inputs():
+    for values, levels, bits in random_cases():
+        if max(values) == min(values):
+            continue
+        expected = baseline_quantize_and_encode(values, levels, bits)
+        result = quantize_and_encode(values, levels=levels, bits=bits)
+        for key, value in expected.items():
+            assert result[key] == value, (key, values, levels, bits)
+
+
+def test_packed_round_trip_returns_quantized_values():
+    for values, levels, bits in random_cases(50):
+        result = quantize_values(values, levels=levels, bits=bits)
+        assert decode_packed(pack_result(result)).tolist() == result["quantized"].tolist()
+
+
+@pytest.mark.parametrize("mode", ["mu-law", "a-law", "lloyd-max"])
+def test_table_modes_round_trip(mode):
+    values = np.random.default_rng(3).laplace(size=5000)
+    result = quantize_values(values, mode, bits=4)
+    assert result["interval_indices"].min() >= 1 and result["interval_indices"].max() <= 16
+    assert decode_packed(pack_result(result)).tolist() == result["quantized"].tolist()
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    rng = np.random.default_rng(5)
+    values = rng.integers(-20000, 20000, size=10000) / 10000
+    path = str(tmp_path / "signal.txt")
+    write_signal_txt(path, np.arange(len(values)), values)
+
+    expected = quantize_values(values, bits=3)
+    summary = quantize_file(path, bits=3, chunk_size=777)
+    assert summary["avg_error"] == expected["avg_error"]
+
+    stream = StreamingQuantizer(values.min(), values.max(), bits=3)
+    chunks = [stream.quantize_chunk(values[i:i + 777]) for i in range(0, len(values), 777)]
+    assert np.concatenate([c["quantized"] for c in chunks]).tolist() == expected["quantized"].tolist()
+    assert stream.avg_error == expected["avg_error"]
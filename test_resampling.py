@@ -0,0 +1,78 @@
+"""
+Polyphase resampling: chunked against one call, and accuracy on sinusoids.
+
+    python -m pytest test_resampling.py
+"""
+import numpy as np
+import pytest
+
+from resampling import Resampler, rational_ratio, resample_file, resample_signal, resample_values
+from signal_io import read_signal_file, write_signal_txt
+
+RATIOS = [(3, 2), (2, 3), (160, 147), (1, 4), (5, 1)]
+
+
+@pytest.mark.parametrize("up, down", RATIOS)
+def test_chunked_matches_one_call(up, down):
+    rng = np.random.default_rng(up * 1000 + down)
+    values = rng.standard_normal(5000)
+    whole = resample_values(values, up, down)
+    assert len(whole) == -(-len(values) * up // down)
+
+    resampler = Resampler(up, down)
+    parts, start = [], 0
+    for size in rng.integers(1, 700, size=40):
+        parts.append(resampler.process(values[start:start + size]))
+        start += size
+    parts.append(resampler.process(values[start:]))
+    parts.append(resampler.flush())
+    np.testing.assert_allclose(np.concatenate(parts), whole, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("up, down", RATIOS)
+def test_sinusoid_error_is_small(up, down):
+    n = 6000
+    # Well inside the passband: 0.01 cycles per sample at the slower of the two rates
+    f = 0.01 * min(1.0, up / down)
+    x = np.sin(2 * np.pi * f * np.arange(n) + 0.3)
+    y = resample_values(x, up, down)
+    # Output sample m lies at input time m * down / up
+    t = np.arange(len(y)) * down / up
+    exact = np.sin(2 * np.pi * f * t + 0.3)
+    # Skip the filter's half-length at both ends, where the input is zero-padded
+    interior = (t > 60) & (t < n - 60)
+    assert interior.sum() > len(y) // 2
+    assert np.max(np.abs(y[interior] - exact[interior])) < 1e-3
+
+
+def test_constant_input_stays_constant():
+    y = resample_values(np.ones(3000), 160, 147)
+    assert np.allclose(y[100:-100], 1.0, atol=1e-3)
+
+
+def test_signal_indices_and_file_path(tmp_path):
+    rng = np.random.default_rng(21)
+    indices, values = np.arange(10, 2010), rng.standard_normal(2000)
+    out_indices, out = resample_signal((indices, values), 3, 2)
+    assert out_indices[0] == 15 and len(out) == 3000
+    np.testing.assert_allclose(out, resample_values(values, 3, 2))
+
+    src, dst = str(tmp_path / "in.txt"), str(tmp_path / "out.txt")
+    write_signal_txt(src, indices, values)
+    resample_file(src, dst, 3, 2, chunk_size=333)
+    _, file_indices, file_values = read_signal_file(dst)
+    assert file_indices.tolist() == out_indices.tolist()
+    np.testing.assert_allclose(file_values, out, atol=1e-8)
+
+
+def test_start_index_is_floored():
+    # -3 * 1 / 2 = -1.5 is labelled -2
+    indices, _ = resample_signal((np.arange(-3, 7), np.ones(10)), 1, 2)
+    assert indices[0] == -2
+    indices, _ = resample_signal((np.arange(-4, 6), np.ones(10)), 1, 2)
+    assert indices[0] == -2
+
+
+def test_rational_ratio():
+    assert rational_ratio(44100, 48000) == (160, 147)
+    assert rational_ratio(1000, 250) == (1, 4)
@@ -0,0 +1,59 @@
+"""
+SignalExpr evaluation against the eager chain of Task1 calls.
+
+    python -m pytest test_signal_expr.py
+"""
+import numpy as np
+import pytest
+
+from Task1 import add_signals, fold_signal, multiply_signal, shifting_signal, subtract_signals
+from signal_expr import SignalExpr
+from signal_model import Signal
+
+
+def eager(a, b):
+    # fold(shift(a*5 - b, 3)) one helper at a time
+    x = multiply_signal(a[0], a[1], 5)
+    x = subtract_signals(x, b)
+    x = shifting_signal(x[0], x[1], 3, "delay")
+    return fold_signal(x[0], x[1])
+
+
+def lazy(a, b):
+    return (SignalExpr.of(a) * 5 - SignalExpr.of(b)).shift(3, "delay").fold().evaluate()
+
+
+def inputs():
+    rng = np.random.default_rng(9)
+    dense_a = (np.arange(-50, 150), rng.standard_normal(200))
+    dense_b = (np.arange(0, 300), rng.standard_normal(300))
+    sparse_a = (np.sort(rng.choice(np.arange(-400, 400), 120, replace=False)), rng.standard_normal(120))
+    sparse_b = (np.sort(rng.choice(np.arange(-100, 600), 90, replace=False)), rng.standard_normal(90))
+    return {
+        "dense pairs": (dense_a, dense_b),
+        "dense Signals": (Signal.from_arrays(*dense_a), Signal.from_arrays(*dense_b)),
+        "sparse pairs": (sparse_a, sparse_b),
+        "sparse and dense": (sparse_a, Signal.from_arrays(*dense_b)),
+        "disjoint": ((np.arange(0, 10), np.ones(10)), (np.arange(1000, 1005), np.ones(5))),
+    }
+
+
+@pytest.mark.parametrize("case", list(inputs()))
+def test_matches_eager_chain(case):
+    a, b = inputs()[case]
+    pair = lambda s: (np.asarray(s[0]), np.asarray(s[1]))
+    expected_indices, expected_values = eager(pair(a), pair(b))
+    indices, values = lazy(a, b)
+    assert np.asarray(indices).tolist() == np.asarray(expected_indices).tolist()
+    np.testing.assert_allclose(values, expected_values, rtol=0, atol=1e-12)
+
+
+def test_repeated_source_is_merged_into_one_term():
+    a = (np.arange(5), np.arange(5.0))
+    x = SignalExpr.of(a)
+    expr = x + x.shift(0) - 2 * x
+    assert len(expr.terms()) == 1
+    indices, values = expr.evaluate()
+    expected = add_signals([a, a, (a[0], -2 * a[1])])
+    assert np.asarray(indices).tolist() == np.asarray(expected[0]).tolist()
+    np.testing.assert_allclose(values, expected[1])
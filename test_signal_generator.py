@@ -0,0 +1,109 @@
+"""
+Batched generation against one spec at a time, float32 and out= buffers,
+and the phasor block generator against its error bound.
+
+    python -m pytest test_signal_generator.py
+"""
+import numpy as np
+import pytest
+
+import signal_generator
+from signal_generator import SignalSpec, _num_samples, generate, generate_batch, iter_signal_blocks, time_grid
+
+
+def specs():
+    return [
+        SignalSpec(True, "sine", 2.0, 30.0, 5.0, 100.0, 1.0, "discrete"),
+        SignalSpec(True, "cosine", 0.5, -45.0, 12.5, 100.0, 1.0, "discrete"),
+        SignalSpec(True, "sine", 1.0, 0.0, 3.0, 44.0, 2.5, "discrete"),
+        SignalSpec(True, "cosine", 3.0, 90.0, 7.0, 100.0, 1.0, "continuous"),
+        SignalSpec(True, "sine", 1.5, 10.0, 1.0, 8000.0, 1.0, "continuous"),
+        SignalSpec(True, "sine", 1.0, 180.0, 41.0, 100.0, 1.0, "discrete"),
+    ]
+
+
+def one_at_a_time(spec, t):
+    # task2's original per-spec expression
+    trig = np.sin if spec.kind == "sine" else np.cos
+    return spec.A * trig(2 * np.pi * spec.f_analog * t + spec.phase_rad())
+
+
+def test_batch_equals_per_spec_loop():
+    batch = generate_batch(specs())
+    for spec, (t, y, discrete) in zip(specs(), batch):
+        np.testing.assert_array_equal(t, time_grid(spec))
+        np.testing.assert_array_equal(y, one_at_a_time(spec, t))
+        assert discrete == (spec.representation != "continuous")
+        single = generate(spec)
+        np.testing.assert_array_equal(single[1], y)
+
+
+def test_shared_grid_in_several_blocks(monkeypatch):
+    # Two rows per block, so sines and cosines each span more than one block
+    monkeypatch.setattr(signal_generator, "_BLOCK_ELEMENTS", 2 * 500)
+    t = np.linspace(0, 1, 500)
+    y = generate_batch(specs(), t)
+    assert y.shape == (len(specs()), len(t))
+    for spec, row in zip(specs(), y):
+        np.testing.assert_array_equal(row, one_at_a_time(spec, t))
+
+
+def test_float32_and_out_buffer():
+    t = np.arange(0, 1, 1 / 100.0)
+    expected = generate_batch(specs(), t)
+
+    y32 = generate_batch(specs(), t, dtype=np.float32)
+    assert y32.dtype == np.float32
+    np.testing.assert_allclose(y32, expected, rtol=0, atol=1e-6)
+    for spec, (_, y, _) in zip(specs(), generate_batch(specs(), dtype=np.float32)):
+        assert y.dtype == np.float32
+
+    out = np.full((len(specs()), len(t)), np.nan)
+    assert generate_batch(specs(), t, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+
+    out32 = np.empty((len(specs()), len(t)), dtype=np.float32)
+    assert generate_batch(specs(), t, out=out32) is out32
+    np.testing.assert_array_equal(out32, y32)
+
+
+def test_bad_out_buffer_raises():
+    t = np.arange(10.0)
+    with pytest.raises(ValueError):
+        generate_batch(specs(), t, out=np.empty((2, 10)))
+    with pytest.raises(ValueError):
+        generate_batch(specs(), out=np.empty((len(specs()), 10)))
+    with pytest.raises(ValueError):
+        generate_batch([SignalSpec(True, fs=0.0, representation="discrete")])
+
+
+@pytest.mark.skipif(np.finfo(np.longdouble).eps >= 1e-18, reason="needs an extended-precision long double")
+@pytest.mark.parametrize("kind", ["sine", "cosine"])
+@pytest.mark.parametrize("block_size", [1000, 1 << 12, 1 << 16])
+def test_phasor_blocks_stay_within_the_documented_bound(kind, block_size):
+    spec = SignalSpec(True, kind, 3.0, 37.0, 1234.5, 10000.0, 20.0, "discrete")
+    n = _num_samples(spec)
+    phasor = list(iter_signal_blocks(spec, block_size))
+    direct = list(iter_signal_blocks(spec, block_size, method="direct"))
+    assert all(len(y) <= block_size for _, y in phasor)
+    t = np.concatenate([b[0] for b in phasor])
+    y = np.concatenate([b[1] for b in phasor])
+    np.testing.assert_array_equal(t, np.concatenate([b[0] for b in direct]))
+    np.testing.assert_array_equal(t, time_grid(spec))
+    assert len(y) == n
+
+    # A*sin(w*n/fs + phase) in extended precision, from the same float64 w and 1/fs
+    omega, step, phase = 2 * np.pi * spec.f_analog, 1.0 / spec.fs, spec.phase_rad()
+    arg = np.longdouble(omega) * (np.arange(n, dtype=np.longdouble) * np.longdouble(step)) + np.longdouble(phase)
+    trig = np.sin if kind == "sine" else np.cos
+    exact = np.longdouble(spec.A) * trig(arg)
+
+    theta_max = float(arg.max())
+    bound = abs(spec.A) * (2 * theta_max + omega * block_size * step + 4) * 2.0 ** -53
+    assert float(np.max(np.abs(y - exact))) <= bound
+    assert float(np.max(np.abs(np.concatenate([b[1] for b in direct]) - exact))) <= bound
+
+
+def test_unknown_block_method_raises():
+    with pytest.raises(ValueError):
+        next(iter_signal_blocks(SignalSpec(True, representation="discrete"), method="taylor"))
@@ -0,0 +1,69 @@
+"""
+Signal .txt and .sigb readers against a plain line-by-line parse.
+
+    python -m pytest test_signal_io.py
+"""
+import os
+
+import numpy as np
+
+from signal_io import (load_signal, read_signal_bin, read_signal_file, txt_to_bin,
+                       write_signal_bin, write_signal_txt)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def readline_parse(path):
+    # How the test harness read signals before signal_io
+    with open(path, "r") as f:
+        header = [int(f.readline()) for _ in range(3)]
+        rows = [line.split() for line in f if line.strip()]
+    rows = rows[:header[2]]
+    return header, [float(r[0]) for r in rows], [float(r[1]) for r in rows]
+
+
+def test_matches_line_parse_of_repo_signals():
+    for name in ("Signal1.txt", "Signal2.txt", "add.txt", "folding.txt"):
+        path = os.path.join(HERE, name)
+        header, indices, values = read_signal_file(path)
+        expected_header, expected_indices, expected_values = readline_parse(path)
+        assert list(header) == expected_header
+        assert indices.tolist() == expected_indices
+        assert values.tolist() == expected_values
+        assert indices.dtype == np.int64
+
+
+def test_header_count_bounds_the_parse(tmp_path):
+    path = tmp_path / "signal.txt"
+    path.write_text("0\n0\n3\n0 1.5\n1 2.5\n2 3.5\n3 99\n4 99\n")
+    header, indices, values = read_signal_file(str(path))
+    assert header.n == 3
+    assert indices.tolist() == [0, 1, 2]
+    assert values.tolist() == [1.5, 2.5, 3.5]
+
+
+def test_non_integer_indices_stay_float(tmp_path):
+    path = tmp_path / "signal.txt"
+    path.write_text("0\n0\n2\n0.5 1\n1.5 2\n")
+    _, indices, _ = read_signal_file(str(path))
+    assert indices.dtype == np.float64 and indices.tolist() == [0.5, 1.5]
+
+
+def test_txt_and_binary_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    for indices in (np.arange(-5, 995), np.sort(rng.choice(10_000, 1000, replace=False))):
+        values = rng.standard_normal(len(indices))
+        txt = str(tmp_path / "signal.txt")
+        write_signal_txt(txt, indices, values, 1, 0)
+        _, txt_indices, txt_values = read_signal_file(txt)
+        assert txt_indices.tolist() == indices.tolist()
+        np.testing.assert_allclose(txt_values, values, atol=1e-6)
+
+        sigb = txt_to_bin(txt)
+        header, bin_indices, bin_values = read_signal_bin(sigb)
+        assert (header.signal_type, header.n) == (1, len(indices))
+        assert np.array_equal(bin_indices, txt_indices) and np.array_equal(bin_values, txt_values)
+
+        write_signal_bin(sigb, indices, values)
+        _, sig = load_signal(sigb)
+        assert np.array_equal(sig[0], indices) and np.array_equal(sig[1], values)
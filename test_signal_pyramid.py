@@ -0,0 +1,79 @@
+"""
+Pyramids built during a file's read, and the generated-pyramid cache cap.
+
+    python -m pytest test_signal_pyramid.py
+"""
+import os
+
+import numpy as np
+import pytest
+
+import Task1
+from signal_generator import SignalSpec, _num_samples
+from signal_io import write_signal_txt
+from signal_pyramid import (build_pyramid, ensure_generated_pyramid, ensure_pyramid,
+                            generated_pyramid_path, pyramid_bytes, pyramid_path_for)
+from signal_workspace import Workspace
+from tk_executor import TaskHandle
+
+N = 200_000
+
+
+@pytest.fixture
+def long_signal(tmp_path, monkeypatch):
+    monkeypatch.setattr(Task1, "PYRAMID_MIN_SAMPLES", 1000)
+    values = np.random.default_rng(4).standard_normal(N)
+    path = str(tmp_path / "long.txt")
+    write_signal_txt(path, np.arange(N), values)
+    return path
+
+
+def reference_pyramid(tmp_path, values):
+    chunks = [(None, values)]
+    return build_pyramid(str(tmp_path / "reference.pyr"), chunks, len(values))
+
+
+def assert_same_levels(a, b):
+    assert a.n == b.n and sorted(a.levels) == sorted(b.levels)
+    for k in a.levels:
+        assert np.array_equal(np.asarray(a.levels[k]), np.asarray(b.levels[k]))
+
+
+@pytest.mark.parametrize("use_workspace", [False, True])
+def test_pyramid_is_built_during_the_read(tmp_path, long_signal, monkeypatch, use_workspace):
+    workspace = Workspace(str(tmp_path / "workspace")) if use_workspace else None
+    # A second pass over the values would go through ensure_pyramid
+    monkeypatch.setattr(Task1, "ensure_pyramid", lambda *a, **k: pytest.fail("pyramid built after the read"))
+    sig, pyramid, key = Task1.load_signal_with_pyramid(TaskHandle(), long_signal, workspace)
+    assert_same_levels(pyramid, reference_pyramid(tmp_path, np.asarray(sig.values)))
+
+    source = workspace.object_path(key) if use_workspace else long_signal
+    assert pyramid.path == pyramid_path_for(source)
+    # Fresh against its source, so the next session reuses it instead of rebuilding
+    mtime = os.path.getmtime(pyramid.path)
+    assert ensure_pyramid(source).path == pyramid.path and os.path.getmtime(pyramid.path) == mtime
+
+
+def test_stored_signal_reuses_its_pyramid(tmp_path, long_signal):
+    workspace = Workspace(str(tmp_path / "workspace"))
+    _, first, key = Task1.load_signal_with_pyramid(TaskHandle(), long_signal, workspace)
+    mtime = os.path.getmtime(first.path)
+    sig, again, same_key = Task1.load_signal_with_pyramid(TaskHandle(), long_signal, workspace)
+    assert same_key == key and again.path == first.path and os.path.getmtime(again.path) == mtime
+    assert sig.size == N
+
+
+def test_generated_cache_evicts_least_recently_used(tmp_path):
+    cache = str(tmp_path / "pyramids")
+    specs = [SignalSpec(enabled=True, label="A", representation="discrete", f_analog=f, fs=1000.0, duration=20.0)
+             for f in (1.0, 2.0, 3.0)]
+    size = pyramid_bytes(_num_samples(specs[0]))
+    paths = []
+    for age, spec in enumerate(specs[:2]):
+        paths.append(ensure_generated_pyramid(spec, cache, max_bytes=2 * size).path)
+        os.utime(paths[-1], (age, age))
+    # Reusing the older one makes the other the least recently used
+    assert ensure_generated_pyramid(specs[0], cache, max_bytes=2 * size).path == paths[0]
+    third = ensure_generated_pyramid(specs[2], cache, max_bytes=2 * size)
+    assert os.path.exists(paths[0]) and not os.path.exists(paths[1])
+    assert third.path == generated_pyramid_path(specs[2], cache) and third.n == _num_samples(specs[2])
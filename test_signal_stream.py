@@ -0,0 +1,95 @@
+"""
+Chunked stream operations against the in-memory Task1 functions.
+
+    python -m pytest test_signal_stream.py
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from Task1 import add_signals, fold_signal, multiply_signal, shifting_signal, subtract_signals
+from signal_io import stream_signal, write_signal_bin, write_signal_txt, write_stream
+from signal_stream import (stream_add, stream_fold, stream_fold_file, stream_multiply, stream_shift,
+                           stream_subtract)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CHUNK = 97
+
+
+def collect(chunks):
+    chunks = list(chunks)
+    return (np.concatenate([c[0] for c in chunks]), np.concatenate([c[1] for c in chunks]))
+
+
+def signals():
+    rng = np.random.default_rng(11)
+    dense = (np.arange(-300, 700), rng.standard_normal(1000))
+    sparse = (np.sort(rng.choice(np.arange(-500, 1500), 800, replace=False)), rng.standard_normal(800))
+    return dense, sparse
+
+
+@pytest.fixture(params=[".txt", ".sigb"])
+def files(request, tmp_path):
+    paths = []
+    for i, (indices, values) in enumerate(signals()):
+        path = str(tmp_path / f"signal{i}{request.param}")
+        writer = write_signal_txt if request.param == ".txt" else write_signal_bin
+        writer(path, indices, values)
+        paths.append(path)
+    return paths
+
+
+def test_reading_matches_whole_file(files):
+    for path, (expected_indices, expected_values) in zip(files, signals()):
+        indices, values = collect(stream_signal(path, CHUNK))
+        assert indices.tolist() == expected_indices.tolist()
+        np.testing.assert_allclose(values, expected_values, atol=1e-9)
+        reverse_indices, reverse_values = collect(stream_signal(path, CHUNK, reverse=True))
+        assert np.array_equal(reverse_indices, indices[::-1]) and np.array_equal(reverse_values, values[::-1])
+
+
+def test_operations_match_task1(files):
+    (a_idx, a_val), (b_idx, b_val) = (collect(stream_signal(p)) for p in files)
+    cases = [
+        (stream_multiply(stream_signal(files[0], CHUNK), 5), multiply_signal(a_idx, a_val, 5)),
+        (stream_shift(stream_signal(files[1], CHUNK), 3, "delay"), shifting_signal(b_idx, b_val, 3, "delay")),
+        (stream_add([stream_signal(files[0], CHUNK), stream_signal(files[1], 61)]),
+         add_signals([(a_idx, a_val), (b_idx, b_val)])),
+        (stream_subtract(stream_signal(files[0], CHUNK), stream_signal(files[1], 61)),
+         subtract_signals((a_idx, a_val), (b_idx, b_val))),
+        (stream_fold_file(files[1], CHUNK), fold_signal(b_idx, b_val)),
+        (stream_fold(stream_multiply(stream_signal(files[0], CHUNK), 2), CHUNK), fold_signal(a_idx, a_val * 2)),
+    ]
+    for stream, (expected_indices, expected_values) in cases:
+        indices, values = collect(stream)
+        assert indices.tolist() == np.asarray(expected_indices).tolist()
+        np.testing.assert_allclose(values, expected_values, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("extension", [".txt", ".sigb"])
+def test_write_stream_round_trip(tmp_path, extension):
+    for indices, values in signals():
+        path = str(tmp_path / ("out" + extension))
+        chunks = ((indices[i:i + CHUNK], values[i:i + CHUNK]) for i in range(0, len(values), CHUNK))
+        assert write_stream(path, chunks) == len(values)
+        out_indices, out_values = collect(stream_signal(path))
+        assert out_indices.tolist() == indices.tolist()
+        np.testing.assert_allclose(out_values, values, atol=1e-9)
+
+
+def test_headless_modules_do_not_import_the_gui():
+    code = ("import sys, filters, quantization, quantize_batch, resampling, signal_pyramid, signal_stream; "
+            "print(sorted(m for m in ('tkinter', 'matplotlib.pyplot', 'Task1', 'Task3') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=HERE)
+    assert out.stdout.strip() == "[]"
+
+
+def test_write_stream_widens_to_fractional_indices(tmp_path):
+    path = str(tmp_path / "out.sigb")
+    chunks = [(np.arange(3), np.ones(3)), (np.array([3.5, 4.5]), np.full(2, 2.0))]
+    assert write_stream(path, iter(chunks)) == 5
+    indices, values = collect(stream_signal(path))
+    assert indices.tolist() == [0.0, 1.0, 2.0, 3.5, 4.5] and values.tolist() == [1, 1, 1, 2, 2]
@@ -0,0 +1,115 @@
+"""
+Workspace derivations computed once, and source files re-parsed only when
+their size or mtime changes.
+
+    python -m pytest test_signal_workspace.py
+"""
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+import signal_workspace
+from signal_io import write_signal_txt
+from signal_workspace import Workspace
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    # Count the times a source file is streamed, i.e. parsed
+    calls = []
+    stream_signal = signal_workspace.stream_signal
+
+    def counting(path, *args, **kwargs):
+        calls.append(path)
+        return stream_signal(path, *args, **kwargs)
+
+    monkeypatch.setattr(signal_workspace, "stream_signal", counting)
+    return calls
+
+
+def test_derive_computes_once_for_the_same_inputs(tmp_path):
+    root = str(tmp_path / "workspace")
+    ws = Workspace(root)
+    a = ws.put(np.arange(5), np.arange(5.0))
+    b = ws.put(np.arange(2, 8), np.ones(6))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(3), np.array([1.0, 2.0, 3.0])
+
+    key, sig = ws.derive("add", [a, b], {"scale": 2}, compute)
+    again_key, again = ws.derive("add", [a, b], {"scale": 2}, compute)
+    assert len(calls) == 1 and again_key == key
+    np.testing.assert_array_equal(np.asarray(again.values), [1.0, 2.0, 3.0])
+
+    # The manifest keeps it across sessions
+    assert Workspace(root).derive("add", [a, b], {"scale": 2}, compute)[0] == key
+    assert len(calls) == 1
+
+    # Any other op, input order or parameter is a new derivation, deduped by content
+    for op, inputs, params in (("subtract", [a, b], {"scale": 2}), ("add", [b, a], {"scale": 2}),
+                               ("add", [a, b], {"scale": 3})):
+        assert ws.derive(op, inputs, params, compute)[0] == key
+    assert len(calls) == 4
+
+
+def test_derive_recomputes_a_missing_object(tmp_path):
+    ws = Workspace(str(tmp_path / "workspace"))
+    calls = []
+    compute = lambda: calls.append(1) or (np.arange(2), np.ones(2))
+    key, _ = ws.derive("ones", [], {}, compute)
+    os.remove(ws.object_path(key))
+    assert ws.derive("ones", [], {}, compute)[0] == key and len(calls) == 2
+
+
+def test_unchanged_source_is_not_parsed_again(tmp_path, parses, monkeypatch):
+    root = str(tmp_path / "workspace")
+    path = str(tmp_path / "a.txt")
+    write_signal_txt(path, np.arange(-3, 7), np.arange(10.0))
+    key, header, sig = Workspace(root).load(path)
+    assert len(parses) == 1 and header.n == 10
+    np.testing.assert_array_equal(sig.indices, np.arange(-3, 7))
+
+    # Matching size and mtime skip the hash as well as the parse
+    monkeypatch.setattr(signal_workspace, "file_sha256", lambda *a, **k: pytest.fail("source hashed again"))
+    assert Workspace(root).load(path)[0] == key and len(parses) == 1
+
+
+def test_modified_source_is_parsed_again(tmp_path, parses):
+    ws = Workspace(str(tmp_path / "workspace"))
+    path = str(tmp_path / "a.txt")
+    write_signal_txt(path, np.arange(4), np.array([1.0, 2.0, 3.0, 4.0]))
+    key, _, _ = ws.load(path)
+
+    # Size changes
+    write_signal_txt(path, np.arange(5), np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+    grown_key, _, sig = ws.load(path)
+    assert grown_key != key and len(parses) == 2
+    np.testing.assert_array_equal(np.asarray(sig.values), [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    # Same size, new mtime
+    write_signal_txt(path, np.arange(5), np.array([9.0, 2.0, 3.0, 4.0, 5.0]))
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    edited_key, _, sig = ws.load(path)
+    assert edited_key not in (key, grown_key) and len(parses) == 3
+    np.testing.assert_array_equal(np.asarray(sig.values), [9.0, 2.0, 3.0, 4.0, 5.0])
+    assert ws.manifest["sources"][os.path.abspath(path)]["key"] == edited_key
+
+
+def test_same_bytes_elsewhere_reuse_the_object(tmp_path, parses):
+    ws = Workspace(str(tmp_path / "workspace"))
+    path = str(tmp_path / "a.txt")
+    write_signal_txt(path, np.arange(6), np.arange(6.0))
+    key, _, _ = ws.load(path)
+    copy = str(tmp_path / "copy.txt")
+    shutil.copy(path, copy)
+    # Hashed, since the path is new, but not parsed
+    assert ws.load(copy)[0] == key and len(parses) == 1
+
+    # A touch without an edit is re-hashed and still maps to the same object
+    os.utime(path, (0, 0))
+    assert ws.load(path)[0] == key and len(parses) == 1
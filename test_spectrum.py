@@ -0,0 +1,55 @@
+"""
+Spectra against np.fft, and inverse_spectrum back to the original samples.
+
+    python -m pytest test_spectrum.py
+"""
+import numpy as np
+import pytest
+
+from signal_model import Signal
+from spectrum import inverse_spectrum, signal_spectrum, spectra, spectrum
+
+
+def test_matches_rfft_of_the_samples():
+    values = np.random.default_rng(3).standard_normal(100)
+    spec = spectrum(values, fs=50.0, pad=False)
+    np.testing.assert_allclose(spec.X, np.fft.rfft(values))
+    np.testing.assert_allclose(spec.freqs, np.fft.rfftfreq(100, 1 / 50.0))
+
+
+def test_batched_spectra_equal_one_at_a_time():
+    rng = np.random.default_rng(4)
+    signals = [rng.standard_normal(n) for n in (64, 100, 64, 37)]
+    for values, spec in zip(signals, spectra(signals, window_name="hann")):
+        np.testing.assert_allclose(spec.X, spectrum(values, window_name="hann").X)
+
+
+@pytest.mark.parametrize("pad", [True, False])
+def test_dense_signal_round_trips(pad):
+    indices, values = np.arange(-20, 81), np.random.default_rng(5).standard_normal(101)
+    for signal in ((indices, values), Signal(values, start_index=-20)):
+        out_indices, out_values = inverse_spectrum(signal_spectrum(signal, pad=pad))
+        assert out_indices.tolist() == indices.tolist()
+        np.testing.assert_allclose(out_values, values, atol=1e-12)
+
+
+def test_sparse_signal_round_trips_to_its_own_indices():
+    indices, values = np.array([0, 3, 7]), np.array([1.0, 2.0, 3.0])
+    spec = signal_spectrum((indices, values))
+    # The spectrum is that of the zero-filled span
+    np.testing.assert_allclose(spec.X, np.fft.rfft([1, 0, 0, 2, 0, 0, 0, 3], spec.nfft))
+    out_indices, out_values = inverse_spectrum(spec)
+    assert out_indices.tolist() == [0, 3, 7]
+    np.testing.assert_allclose(out_values, values, atol=1e-12)
+
+    rng = np.random.default_rng(6)
+    indices = np.sort(rng.choice(np.arange(-500, 500), 200, replace=False))
+    values = rng.standard_normal(200)
+    out_indices, out_values = inverse_spectrum(signal_spectrum((indices, values)))
+    assert out_indices.tolist() == indices.tolist()
+    np.testing.assert_allclose(out_values, values, atol=1e-12)
+
+
+def test_windowed_spectrum_cannot_be_inverted():
+    with pytest.raises(ValueError):
+        inverse_spectrum(spectrum(np.ones(8), window_name="hann"))
@@ -0,0 +1,93 @@
+"""
+WaveformCache hits, prefix and quadrature-derived hits against a fresh
+generate(), and LRU eviction by bytes.
+
+    python -m pytest test_waveform_cache.py
+"""
+import numpy as np
+import pytest
+
+from signal_generator import SignalSpec, generate
+from waveform_cache import WaveformCache
+
+
+def discrete(kind="sine", A=1.0, phase=0.0, f=5.0, fs=100.0, duration=1.0):
+    return SignalSpec(True, kind, A, phase, f, fs, duration, "discrete")
+
+
+def assert_fresh(entry, spec, atol=0.0):
+    t, y, is_discrete = generate(spec)
+    np.testing.assert_array_equal(entry[0], t)
+    np.testing.assert_allclose(entry[1], y, rtol=0, atol=atol)
+    assert entry[2] == is_discrete
+
+
+def test_repeat_is_a_hit_on_read_only_arrays():
+    cache = WaveformCache()
+    spec = discrete()
+    first = cache.get(spec)
+    again = cache.get(spec.frozen())
+    assert again[1] is first[1] and cache.stats()["hits"] == 1 and cache.misses == 1
+    assert not first[1].flags.writeable
+    with pytest.raises(ValueError):
+        first[1][0] = 1.0
+    assert_fresh(again, spec)
+
+
+@pytest.mark.parametrize("duration", [0.5, 1.37, 2.99])
+def test_shorter_duration_is_a_prefix_slice(duration):
+    cache = WaveformCache()
+    cache.get(discrete(duration=3.0))
+    spec = discrete(duration=duration)
+    entry = cache.get(spec)
+    assert cache.derived_hits == 1 and cache.misses == 1
+    assert_fresh(entry, spec)
+
+
+def test_continuous_is_not_served_as_a_prefix():
+    cache = WaveformCache()
+    cache.get(SignalSpec(True, duration=2.0, representation="continuous"))
+    spec = SignalSpec(True, duration=1.0, representation="continuous")
+    assert_fresh(cache.get(spec), spec)
+    assert cache.misses == 2
+
+
+def test_amplitude_phase_and_kind_come_from_the_quadrature_basis():
+    cache = WaveformCache()
+    cache.get(discrete(f=7.0, duration=4.0))
+    variants = [discrete("sine", 2.5, 30.0, 7.0, duration=4.0), discrete("cosine", 0.5, -120.0, 7.0, duration=4.0),
+                discrete("cosine", 1.0, 0.0, 7.0, duration=4.0), discrete("sine", 3.0, 90.0, 7.0, duration=4.0)]
+    for spec in variants:
+        assert_fresh(cache.get(spec), spec, atol=abs(spec.A) * 1e-12)
+    assert cache.derived_hits == len(variants) and cache.misses == 1
+
+    # A shorter variant of the basis is sliced from it
+    spec = discrete("cosine", 1.5, 45.0, 7.0, duration=1.5)
+    assert_fresh(cache.get(spec), spec, atol=1e-12)
+    assert cache.derived_hits == len(variants) + 1 and cache.misses == 1
+
+
+def test_lru_byte_budget_evicts_the_oldest():
+    entry_bytes = sum(a.nbytes for a in generate(discrete())[:2])
+    cache = WaveformCache(max_bytes=2 * entry_bytes + entry_bytes // 2)
+    a, b, c = discrete(f=1.0), discrete(f=2.0), discrete(f=3.0)
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)
+    cache.get(c)
+    assert cache.nbytes <= cache.max_bytes and cache.stats()["entries"] == 2
+
+    # b was least recently used, so it went and a stayed
+    cache.get(a)
+    assert cache.hits == 2
+    assert_fresh(cache.get(b), b)
+    assert cache.misses == 4
+
+
+def test_entry_larger_than_the_budget_is_returned_but_not_kept():
+    cache = WaveformCache(max_bytes=100)
+    spec = discrete()
+    assert_fresh(cache.get(spec), spec)
+    assert cache.nbytes == 0 and cache.stats()["entries"] == 0
+    cache.get(spec)
+    assert cache.misses == 2
@@ -0,0 +1,184 @@
+"""
+Run slow work off the Tk main thread.
+
+    executor = TkTaskExecutor(root)
+    executor.submit(load_signal, path, on_done=show, description="Loading")
+
+Work runs on a worker thread (NumPy releases the GIL for the heavy parts).
+Tk is not thread-safe, so workers never touch widgets. The main loop polls
+with root.after() and calls on_done / on_error / on_progress there.
+
+A task submitted with a key supersedes the pending task with the same key:
+the old one is cancelled and its result is never delivered. Cancellation
+is cooperative. A task started with pass_task=True receives its TaskHandle
+as first argument and calls task.report(fraction) between steps, which
+raises Cancelled once the task has been cancelled. Chunked readers and
+builders take a progress(fraction) callback; pass task.report or
+task.phase(start, end) so they stop within one chunk of a cancel.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import tkinter as tk
+
+POLL_MS = 50
+
+
+class Cancelled(Exception):
+    pass
+
+
+class TaskHandle:
+    def __init__(self, description="", key=None):
+        self.description = description
+        self.key = key
+        self.progress = None
+        self.message = ""
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        """Raise Cancelled if the task was cancelled; call from the worker between steps."""
+        if self._cancel.is_set():
+            raise Cancelled(self.description)
+
+    def report(self, fraction, message=""):
+        """Record progress (0..1) for the UI, and stop here if the task was cancelled."""
+        self.progress = fraction
+        self.message = message
+        self.check()
+
+    def phase(self, start, end, message=""):
+        """progress(fraction) callback for a step covering [start, end] of the task, for chunk loops."""
+        return lambda fraction: self.report(start + (end - start) * fraction, message)
+
+
+class TkTaskExecutor:
+    """
+    Thread pool whose results come back on the Tk main loop. One worker by
+    default, so caches shared with the UI (e.g. task2's WaveformCache) are
+    only ever used by one thread at a time.
+    """
+
+    def __init__(self, root, max_workers=1, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._tasks = []
+        self._by_key = {}
+        self._polling = False
+        self._listeners = []
+
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None,
+               key=None, description="", pass_task=False, **kwargs):
+        task = TaskHandle(description, key)
+        if key is not None and key in self._by_key:
+            self._by_key[key].cancel()
+        if key is not None:
+            self._by_key[key] = task
+
+        call_args = (task,) + args if pass_task else args
+        task.future = self._pool.submit(fn, *call_args, **kwargs)
+        self._tasks.append((task, on_done, on_error, on_progress, [None]))
+        self._notify()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return task
+
+    @property
+    def running(self):
+        return [task for task, *_ in self._tasks if not task.cancelled]
+
+    def cancel_all(self):
+        for task, *_ in self._tasks:
+            task.cancel()
+        self._notify()
+
+    def add_listener(self, callback):
+        """callback(running tasks) on the main loop whenever tasks start, progress or finish."""
+        self._listeners.append(callback)
+
+    def shutdown(self):
+        self.cancel_all()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _notify(self):
+        running = self.running
+        for callback in self._listeners:
+            callback(running)
+
+    def _poll(self):
+        pending = []
+        changed = False
+        for entry in self._tasks:
+            task, on_done, on_error, on_progress, last_progress = entry
+            if not task.future.done():
+                if task.progress != last_progress[0] and not task.cancelled:
+                    last_progress[0] = task.progress
+                    changed = True
+                    if on_progress:
+                        on_progress(task.progress, task.message)
+                pending.append(entry)
+                continue
+
+            changed = True
+            if self._by_key.get(task.key) is task:
+                del self._by_key[task.key]
+            if task.cancelled or task.future.cancelled():
+                continue
+            error = task.future.exception()
+            if error is None:
+                if on_done:
+                    on_done(task.future.result())
+            elif isinstance(error, Cancelled):
+                continue
+            elif on_error:
+                on_error(error)
+            else:
+                self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+        self._tasks = pending
+        if changed:
+            self._notify()
+        if self._tasks:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+
+class TaskStatusBar(tk.Frame):
+    """One-line status of an executor's running tasks, with a Cancel button."""
+
+    def __init__(self, master, executor, **kwargs):
+        super().__init__(master, **kwargs)
+        self.executor = executor
+        self.label = tk.Label(self, text="Ready", anchor="w", bg=kwargs.get("bg"))
+        self.label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.cancel_button = tk.Button(self, text="Cancel", command=executor.cancel_all, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT)
+        executor.add_listener(self.update_status)
+
+    def update_status(self, running):
+        if not running:
+            self.label.config(text="Ready")
+            self.cancel_button.config(state=tk.DISABLED)
+            return
+        task = running[-1]
+        text = task.description or "Working"
+        if task.progress is not None:
+            text += f" {task.progress:.0%}"
+        if task.message:
+            text += f" ({task.message})"
+        if len(running) > 1:
+            text += f"  [+{len(running) - 1} queued]"
+        self.label.config(text=text)
+        self.cancel_button.config(state=tk.NORMAL)
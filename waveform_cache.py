@@ -0,0 +1,144 @@
+"""
+LRU cache of generated task2 waveforms, keyed by FrozenSpec.
+
+    cache = WaveformCache(max_bytes=64 << 20)
+    t, y, discrete = cache.get(spec)
+
+A repeated request with the same parameters is served from the cache. Some
+derived requests are also served without evaluating a sinusoid per sample:
+
+  - A discrete signal shorter than a cached one with the same fs is a prefix
+    of it, because sample n is at n / fs either way. It is served as a
+    slice of the cached arrays.
+  - A change of amplitude, phase or sine/cosine on a grid already seen at
+    the same frequency is built from the quadrature basis sin(w*t), cos(w*t)
+    by angle addition. The basis is computed the first time this happens.
+    Such values can differ from generate() in the last few bits.
+
+Returned arrays are read-only views into the cache.
+"""
+from collections import OrderedDict
+import numpy as np
+
+from signal_generator import FrozenSpec, _grid_key, _num_samples, generate, time_grid
+
+
+class WaveformCache:
+    def __init__(self, max_bytes=64 << 20):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.derived_hits = 0
+        self.misses = 0
+        # key -> (t, y, discrete) for waveforms, ('basis', grid key, f) -> (t, sin, cos)
+        self._entries = OrderedDict()
+
+    def get(self, spec):
+        """(t, y, discrete) for a SignalSpec or FrozenSpec, as signal_generator.generate returns it."""
+        key = spec if isinstance(spec, FrozenSpec) else FrozenSpec.from_spec(spec)
+        discrete = key.representation != 'continuous'
+
+        entry = self._lookup(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        prefix = self._find_prefix(key)
+        if prefix is not None:
+            self.derived_hits += 1
+            return prefix
+
+        basis_key = ('basis', _grid_key(key), key.f_analog)
+        basis = self._lookup(basis_key)
+        if basis is None:
+            t = self._cached_grid(key)
+            # Same grid and frequency as a cached waveform: amplitude/phase/kind is being tuned
+            if t is not None and 3 * t.nbytes <= self.max_bytes:
+                basis = self._build_basis(key, basis_key)
+        if basis is not None:
+            self.derived_hits += 1
+            t, sin_wt, cos_wt = basis
+            y = _combine(key, sin_wt, cos_wt)
+            return self._store(key, (t, y, discrete))
+
+        self.misses += 1
+        t, y, discrete = generate(key)
+        return self._store(key, (t, y, discrete))
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "derived_hits": self.derived_hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "nbytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _cached_grid(self, key):
+        grid = _grid_key(key)
+        for k, entry in self._entries.items():
+            if isinstance(k, FrozenSpec) and k.f_analog == key.f_analog and _grid_key(k) == grid:
+                return entry[0]
+        return None
+
+    def _find_prefix(self, key):
+        if key.representation == 'continuous':
+            return None
+        n = _num_samples(key)
+        for k, entry in self._entries.items():
+            if (isinstance(k, FrozenSpec) and k.duration > key.duration
+                    and k == _with_duration(key, k.duration)):
+                t, y, discrete = entry
+                self._entries.move_to_end(k)
+                return t[:n], y[:n], discrete
+        for k, entry in self._entries.items():
+            if (isinstance(k, tuple) and k[1][0] == 'discrete' and k[1][2] == key.fs
+                    and k[2] == key.f_analog and k[1][1] > key.duration):
+                t, sin_wt, cos_wt = entry
+                self._entries.move_to_end(k)
+                return t[:n], _combine(key, sin_wt[:n], cos_wt[:n]), True
+        return None
+
+    def _build_basis(self, key, basis_key):
+        t = time_grid(key)
+        arg = (2 * np.pi * key.f_analog) * t
+        return self._store(basis_key, (t, np.sin(arg), np.cos(arg)))
+
+    def _store(self, key, entry):
+        for a in entry:
+            if isinstance(a, np.ndarray):
+                a.flags.writeable = False
+        size = sum(a.nbytes for a in entry if isinstance(a, np.ndarray))
+        if size > self.max_bytes:
+            return entry
+        self._entries[key] = entry
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.nbytes -= sum(a.nbytes for a in old if isinstance(a, np.ndarray))
+        return entry
+
+
+def _with_duration(key, duration):
+    return FrozenSpec(key.kind, key.A, key.phase_deg, key.f_analog, key.fs, duration, key.representation)
+
+
+def _combine(key, sin_wt, cos_wt):
+    # A*sin(wt + p) = A*cos(p)*sin(wt) + A*sin(p)*cos(wt); cosine likewise
+    phase = key.phase_rad()
+    c = key.A * np.cos(phase)
+    s = key.A * np.sin(phase)
+    if key.kind == 'sine':
+        return c * sin_wt + s * cos_wt
+    return c * cos_wt - s * sin_wt